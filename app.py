@@ -4,9 +4,13 @@ Recibe solicitudes HTTP y las delega a los casos de uso a través del contenedor
 """
 from flask import (
     Flask, request, render_template, redirect, url_for,
-    flash, send_file, session, jsonify
+    flash, send_file, session, jsonify, Response, stream_with_context
 )
+import gzip
+import json
 import os
+import threading
+import time
 import tempfile
 import functools
 from werkzeug.utils import secure_filename
@@ -19,10 +23,15 @@ load_dotenv()
 
 from src.infrastructure.database.migrate_db import migrate_db
 from src.infrastructure.database.db import init_db
+from src.domain.entities.job import EVENT_JOB_FINISHED
+from src.domain.entities.report_row import ReportQuery
+from src.services.report_files import content_etag, gzip_variant
 from src.container import (
-    build_process_files_use_case,
+    get_report_store,
     build_generate_report_use_case,
     build_import_csv_use_case,
+    build_query_report_use_case,
+    build_submit_processing_job_use_case,
 )
 
 app = Flask(__name__)
@@ -57,6 +66,13 @@ limiter = Limiter(
 init_db()
 migrate_db()
 
+# Trabajos que quedaron en la cola de un worker que ya no existe (reinicio,
+# caída): se retoman desde su bitácora en este proceso
+try:
+    build_submit_processing_job_use_case().recover_orphaned_jobs()
+except Exception as e:
+    print(f"[WARN] No se pudieron retomar los trabajos interrumpidos: {e}")
+
 
 # ── Cabeceras de seguridad (A02) ──────────────────────────────────────────────
 @app.after_request
@@ -171,22 +187,15 @@ def index():
                 filename = secure_filename(file.filename)
                 file.save(os.path.join(upload_dir, filename))
 
-        try:
-            process_use_case = build_process_files_use_case()
-            process_use_case.execute(upload_dir, facultad=facultad, carrera_default=carrera)
-
-            report_use_case = build_generate_report_use_case()
-            csv_path = report_use_case.execute()
-
-            flash('¡Procesamiento completado exitosamente!')
-            if csv_path and os.path.exists(csv_path):
-                session['show_options'] = True
-                session['download_link'] = url_for('download_csv')
-                show_options = True
-                download_link = url_for('download_csv')
-        except Exception as e:
-            flash(f'Error durante el procesamiento: {str(e)}')
+        # El procesamiento corre en la cola de trabajos: la solicitud retorna de inmediato
+        job = build_submit_processing_job_use_case().execute(
+            upload_dir, facultad=facultad, carrera=carrera
+        )
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'job_id': job.id, 'status_url': url_for('job_status', job_id=job.id)}), 202
 
+        flash(f'Trabajo #{job.id} en cola. El avance se muestra abajo.')
+        session['job_id'] = job.id
         return redirect(url_for('index'))
 
     # Verificar sesión para opciones persistentes
@@ -196,18 +205,191 @@ def index():
         session.pop('show_options', None)
         session.pop('download_link', None)
 
-    return render_template('index.html', download_link=download_link, show_options=show_options)
+    return render_template('index.html', download_link=download_link, show_options=show_options,
+                           job_id=session.get('job_id'))
+
+
+@app.route('/jobs/<int:job_id>')
+@login_required
+def job_status(job_id):
+    """Estado de un trabajo de procesamiento en segundo plano (JSON)."""
+    estado = build_submit_processing_job_use_case().get_status(job_id)
+    if estado is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    if estado['report_ready']:
+        estado['download_url'] = url_for('job_report', job_id=job_id)
+    return jsonify(estado)
+
+
+@app.route('/jobs/<int:job_id>/report')
+@login_required
+def job_report(job_id):
+    """Reporte generado al terminar el trabajo (tal como quedó, sin regenerarlo)."""
+    ruta = build_submit_processing_job_use_case().get_report_path(job_id)
+    if ruta is None:
+        return jsonify({'error': 'El trabajo no tiene reporte disponible'}), 404
+    return _send_report(ruta, f'reporte_bibliografia_trabajo_{job_id}.csv')
+
+
+# Vida máxima de una conexión SSE: al cerrarla el navegador se reconecta solo
+# (con Last-Event-ID), lo que libera el worker de gunicorn de forma periódica.
+SSE_MAX_SECONDS = float(os.environ.get('SSE_MAX_SECONDS', '55'))
+SSE_POLL_SECONDS = 1.0
+SSE_HEARTBEAT_SECONDS = 15.0
+# Cada flujo ocupa un hilo de gunicorn mientras dura: como máximo
+# SSE_MAX_STREAMS por worker, el resto de los navegadores consulta /jobs/<id>
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', '2'))
+_sse_slots = threading.BoundedSemaphore(max(1, SSE_MAX_STREAMS))
+
+
+@app.route('/jobs/<int:job_id>/events')
+@login_required
+def job_events(job_id):
+    """
+    Progreso en vivo de un trabajo (Server-Sent Events).
+
+    Cada evento lleva su id; al reconectarse, el navegador envía Last-Event-ID
+    y el flujo continúa desde ahí. El flujo termina con el evento 'job_finished'.
+    Si el worker ya atiende SSE_MAX_STREAMS flujos responde 503 y el navegador
+    consulta el estado del trabajo periódicamente.
+    """
+    use_case = build_submit_processing_job_use_case()
+    if use_case.get_status(job_id) is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    if not _sse_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Demasiados flujos de progreso abiertos',
+                            'poll_url': url_for('job_status', job_id=job_id)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '2'
+        return response
+    try:
+        ultimo_id = int(request.headers.get('Last-Event-ID')
+                        or request.args.get('last_event_id') or 0)
+    except ValueError:
+        ultimo_id = 0
+
+    def generar():
+        nonlocal ultimo_id
+        yield f"retry: {int(SSE_POLL_SECONDS * 2000)}\n\n"
+        inicio = latido = time.monotonic()
+        while time.monotonic() - inicio < SSE_MAX_SECONDS:
+            eventos = use_case.get_events(job_id, ultimo_id)
+            for evento in eventos:
+                ultimo_id = evento.id
+                datos = dict(evento.data, file_name=evento.file_name)
+                yield (f"id: {evento.id}\nevent: {evento.kind}\n"
+                       f"data: {json.dumps(datos, ensure_ascii=False)}\n\n")
+                if evento.kind == EVENT_JOB_FINISHED:
+                    return
+            if not eventos:
+                # Trabajos terminados sin evento de cierre (p.ej. anteriores a los eventos)
+                estado = use_case.get_status(job_id)
+                if estado['finished'] and (estado['report_ready'] or estado['error']):
+                    datos = {k: estado[k] for k in ('status', 'report_ready', 'error')}
+                    yield f"event: {EVENT_JOB_FINISHED}\ndata: {json.dumps(datos, ensure_ascii=False)}\n\n"
+                    return
+            if time.monotonic() - latido >= SSE_HEARTBEAT_SECONDS:
+                latido = time.monotonic()
+                yield ": latido\n\n"
+            time.sleep(SSE_POLL_SECONDS)
+
+    response = Response(stream_with_context(generar()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx: no acumular el flujo
+    })
+    # Se libera al terminar el flujo o al desconectarse el navegador
+    response.call_on_close(_sse_slots.release)
+    return response
+
+
+# ── Descargas versionadas: ETag por contenido, 304 y variantes gzip ──────────
+def _accepts_gzip() -> bool:
+    return 'gzip' in request.accept_encodings
+
+
+def _private_revalidate(response):
+    """El navegador guarda la respuesta pero revalida con ETag en cada uso."""
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _send_report(csv_path: str, download_name: str):
+    """Entrega un reporte generado con ETag, respuestas 304/206 y su variante gzip."""
+    etag = content_etag(csv_path)
+    comprimido = gzip_variant(csv_path) if _accepts_gzip() else None
+    response = send_file(
+        comprimido or csv_path, mimetype='text/csv', as_attachment=True,
+        download_name=download_name,
+        etag=etag + ('-gz' if comprimido else ''),
+        last_modified=os.path.getmtime(csv_path),
+        conditional=True,
+    )
+    if comprimido:
+        response.headers['Content-Encoding'] = 'gzip'
+    return _private_revalidate(response)
+
+
+# CSV único de versiones anteriores (antes de REPORTS_DIR)
+LEGACY_REPORT_PATH = 'reporte_bibliografia.csv'
+
+
+def _current_report_path():
+    """Último reporte completo; si aún no hay ninguno, el CSV heredado."""
+    ruta = get_report_store().latest_full()
+    if ruta is None and os.path.exists(LEGACY_REPORT_PATH):
+        ruta = LEGACY_REPORT_PATH
+    return ruta
+
+
+def _report_query_from_args(args) -> ReportQuery:
+    """
+    Consulta del reporte desde los parámetros de la URL.
+
+    Raises:
+        ValueError: Si algún parámetro no es válido
+    """
+    query = ReportQuery(
+        page=int(args.get('page', 1)),
+        page_size=int(args.get('page_size', 25)),
+        sort=args.get('sort') or None,
+        descending=args.get('order', 'asc').lower() == 'desc',
+        facultad=args.get('facultad') or None,
+        carrera=args.get('carrera') or None,
+        asignatura=args.get('asignatura') or None,
+        disponibilidad=args.get('disponibilidad') or None,
+        texto=(args.get('q') or '').strip() or None,
+    )
+    query.validate()
+    return query
 
 
 @app.route('/download_csv')
 @login_required
 def download_csv():
-    csv_path = 'reporte_bibliografia.csv'
-    if os.path.exists(csv_path):
-        return send_file(csv_path, as_attachment=True, download_name='reporte_bibliografia.csv')
-    else:
-        flash('No se encontró el archivo CSV')
-        return redirect(url_for('index'))
+    """
+    Descarga el último reporte completo. Con filtros (facultad, carrera,
+    asignatura, disponibilidad, q) entrega la versión de ese alcance y solo la
+    genera si no existe o si hubo un procesamiento posterior.
+    """
+    try:
+        query = _report_query_from_args(request.args)
+    except ValueError as e:
+        flash(f'Filtros inválidos: {e}')
+        return redirect(url_for('reporte'))
+    if not query.is_filtered():
+        ruta = _current_report_path()
+        if ruta is None:
+            flash('No se encontró el archivo CSV')
+            return redirect(url_for('index'))
+        return _send_report(ruta, 'reporte_bibliografia.csv')
+
+    store = get_report_store()
+    ruta = store.latest(query.scope())
+    if ruta is None or not store.is_current(ruta):
+        ruta = build_generate_report_use_case().execute(query)
+    return _send_report(ruta, f"reporte_bibliografia_{query.scope().rsplit('-', 1)[0]}.csv")
 
 
 @app.route('/clear_session', methods=['POST'])
@@ -215,6 +397,7 @@ def download_csv():
 def clear_session():
     session.pop('show_options', None)
     session.pop('download_link', None)
+    session.pop('job_id', None)
     return '', 204
 
 
@@ -225,42 +408,94 @@ def reporte():
     return render_template('reporte.html')
 
 
-@app.route('/api/csv')
+@app.route('/api/report')
 @login_required
-def api_csv():
-    """Retorna el contenido del reporte CSV como JSON para visualización en el frontend."""
+def api_report():
+    """
+    Página del reporte desde la base de datos (JSON).
+
+    Parámetros: page, page_size, sort, order (asc|desc), facultad, carrera,
+    asignatura, disponibilidad (impreso|digital|disponible|no_disponible) y q.
+    Con careers=1 se incluyen además las carreras por facultad para los filtros.
+    """
+    args = request.args
+    try:
+        query = _report_query_from_args(args)
+        use_case = build_query_report_use_case()
+        resultado = use_case.execute(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if args.get('careers') == '1':
+        resultado['careers'] = use_case.list_careers()
+    return jsonify(resultado)
+
+
+# JSON de /api/csv por versión del CSV: (etag, cuerpo, cuerpo gzip)
+_api_csv_cache = None
+_api_csv_lock = threading.Lock()
+
+
+def _read_csv_preview(csv_path: str) -> dict:
+    """Lee hasta 500 filas del CSV detectando el delimitador."""
     import csv as csv_module
-    from flask import jsonify
-    csv_path = 'reporte_bibliografia.csv'
-    if not os.path.exists(csv_path):
-        return jsonify({'exists': False, 'rows': [], 'headers': []})
     rows = []
     headers = []
-    try:
-        with open(csv_path, newline='', encoding='utf-8-sig') as f:
-            # Detectar delimitador automáticamente (coma, punto y coma, tabulador, etc.)
-            sample = f.read(4096)
-            f.seek(0)
-            try:
-                dialect = csv_module.Sniffer().sniff(sample, delimiters=';,\t|')
-            except csv_module.Error:
-                dialect = csv_module.excel  # fallback: coma
-            reader = csv_module.DictReader(f, dialect=dialect)
-            # Sanear cabeceras: None → string vacío y quitar espacios sobrantes
-            raw_headers = list(reader.fieldnames or [])
-            headers = [(h.strip() if h is not None else '') for h in raw_headers]
-            for i, row in enumerate(reader):
-                if i >= 500:
-                    break
-                # Sanear valores y claves: None → ''
-                clean_row = {
-                    (k.strip() if k is not None else ''): (v.strip() if v is not None else '')
-                    for k, v in row.items()
-                }
-                rows.append(clean_row)
-    except Exception as e:
-        return jsonify({'exists': True, 'error': str(e), 'rows': [], 'headers': []})
-    return jsonify({'exists': True, 'headers': headers, 'rows': rows})
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        # Detectar delimitador automáticamente (coma, punto y coma, tabulador, etc.)
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv_module.Sniffer().sniff(sample, delimiters=';,\t|')
+        except csv_module.Error:
+            dialect = csv_module.excel  # fallback: coma
+        reader = csv_module.DictReader(f, dialect=dialect)
+        # Sanear cabeceras: None → string vacío y quitar espacios sobrantes
+        raw_headers = list(reader.fieldnames or [])
+        headers = [(h.strip() if h is not None else '') for h in raw_headers]
+        for i, row in enumerate(reader):
+            if i >= 500:
+                break
+            # Sanear valores y claves: None → ''
+            clean_row = {
+                (k.strip() if k is not None else ''): (v.strip() if v is not None else '')
+                for k, v in row.items()
+            }
+            rows.append(clean_row)
+    return {'exists': True, 'headers': headers, 'rows': rows}
+
+
+@app.route('/api/csv')
+@login_required
+def api_csv():
+    """
+    Retorna el contenido del reporte CSV como JSON para visualización en el frontend.
+
+    El JSON se arma una vez por versión del CSV (ETag = hash del contenido):
+    las consultas siguientes lo reutilizan y, si el cliente ya lo tiene, reciben 304.
+    """
+    global _api_csv_cache
+    csv_path = _current_report_path()
+    if csv_path is None:
+        return jsonify({'exists': False, 'rows': [], 'headers': []})
+    etag = content_etag(csv_path) + '-api'
+    with _api_csv_lock:
+        cache = _api_csv_cache
+    if cache is None or cache[0] != etag:
+        try:
+            datos = _read_csv_preview(csv_path)
+        except Exception as e:
+            return jsonify({'exists': True, 'error': str(e), 'rows': [], 'headers': []})
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        cache = (etag, cuerpo, gzip.compress(cuerpo, compresslevel=6, mtime=0))
+        with _api_csv_lock:
+            _api_csv_cache = cache
+    comprimir = _accepts_gzip()
+    response = Response(cache[2] if comprimir else cache[1], mimetype='application/json')
+    response.set_etag(etag + ('-gz' if comprimir else ''))
+    response.last_modified = os.path.getmtime(csv_path)
+    if comprimir:
+        response.headers['Content-Encoding'] = 'gzip'
+    return _private_revalidate(response.make_conditional(request))
 
 
 if __name__ == "__main__":
@@ -1 +1,2 @@
 from .config import OpenAIConfig
+from .env import env_float, env_int
@@ -32,6 +32,7 @@ Versión: 2.0
 import os
 from dotenv import load_dotenv
 from typing import Optional
+from .env import env_float, env_int
 
 
 class OpenAIConfig:
@@ -115,8 +116,8 @@ class OpenAIConfig:
         
         # Configuración por defecto
         self.model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
-        self.max_tokens_default = int(os.getenv('OPENAI_MAX_TOKENS', '2000'))
-        self.temperature = float(os.getenv('OPENAI_TEMPERATURE', '0.7'))
+        self.max_tokens_default = env_int('OPENAI_MAX_TOKENS', 2000)
+        self.temperature = env_float('OPENAI_TEMPERATURE', 0.7)
         
         # Marcar como inicializado
         OpenAIConfig._initialized = True
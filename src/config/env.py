@@ -0,0 +1,31 @@
+"""
+Lectura tolerante de variables de entorno numéricas.
+
+Un valor mal escrito en .env (p.ej. CACHE_MAX_MB=200MB) no debe impedir que la
+aplicación arranque: se avisa y se usa el valor por defecto.
+"""
+import os
+from typing import Callable, TypeVar
+
+T = TypeVar('T', int, float)
+
+
+def _env_number(name: str, default: T, parse: Callable[[str], T]) -> T:
+    valor = os.getenv(name)
+    if valor is None or not valor.strip():
+        return default
+    try:
+        return parse(valor.strip())
+    except ValueError:
+        print(f"[WARN] {name}={valor!r} no es válido; se usa {default}")
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """Entero de la variable ``name``, o ``default`` si falta o no es válida."""
+    return _env_number(name, default, int)
+
+
+def env_float(name: str, default: float) -> float:
+    """Número real de la variable ``name``, o ``default`` si falta o no es válida."""
+    return _env_number(name, default, float)
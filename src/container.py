@@ -3,22 +3,56 @@ Contenedor de dependencias (Composition Root).
 Aquí se ensamblan todos los adaptadores con los casos de uso.
 Es el único lugar donde se conocen todas las implementaciones concretas.
 """
+import atexit
+import os
+import threading
+
 from src.infrastructure.database.db import Sesion
 from src.infrastructure.database.sqlalchemy_repositories import (
     SQLAlchemyCarreraRepository,
     SQLAlchemyAsignaturaRepository,
     SQLAlchemyTituloRepository,
     SQLAlchemyAdquisicionRepository,
+    SQLAlchemyProcessedFileRepository,
+    SQLAlchemyJobRepository,
+    SQLAlchemyJobEventRepository,
+    SQLAlchemyReportRepository,
 )
 from src.infrastructure.ai.ai_provider_adapter import AIProviderAdapter
+from src.infrastructure.ai.async_ai_provider_adapter import AsyncAIProviderAdapter
+from src.infrastructure.ai.cached_ai_provider_adapter import (
+    CachedAIProviderAdapter,
+    CachedAsyncAIProviderAdapter,
+)
+from src.infrastructure.cache.sqlite_cache_store import SQLiteCacheStore
 from src.infrastructure.catalog.primo_catalog_adapter import PrimoCatalogAdapter
+from src.infrastructure.catalog.primo_http_catalog_adapter import PrimoHttpCatalogAdapter
+from src.infrastructure.catalog.rate_limited_catalog_adapter import RateLimitedCatalogAdapter
+from src.infrastructure.catalog.cached_catalog_adapter import CachedCatalogAdapter
+from src.infrastructure.catalog.async_catalog_adapter import AsyncCatalogAdapter
+from src.config import env_float, env_int
+from src.services.ai_providers import AIProviderFactory
+from src.services.chrome_driver_pool import ChromeDriverPool
+from src.services.extraction_pool import ExtractionProcessPool
+from src.services.provider_health import ProviderHealthTracker
+from src.services.rate_limiter import TokenBucket
+from src.services.primo_http_client import PrimoHttpClient, DEFAULT_BASE_URL, DEFAULT_VID
 from src.infrastructure.file_extractor.file_extractor_adapter import FileExtractorAdapter
+from src.infrastructure.file_extractor.cached_file_extractor_adapter import CachedFileExtractorAdapter
 from src.infrastructure.report.csv_report_adapter import CsvReportAdapter
+from src.infrastructure.report.report_artifact_store import ReportArtifactStore
+from src.infrastructure.jobs.thread_pool_job_queue import ThreadPoolJobQueue
+from src.infrastructure.jobs.worker_identity import current_worker_id, is_worker_alive
 
-from src.domain.use_cases.process_files_use_case import ProcessFilesUseCase
+from src.domain.use_cases.process_files_use_case import (
+    ProcessFilesUseCase,
+    DEFAULT_STAGE_WORKERS,
+)
 from src.domain.use_cases.generate_report_use_case import GenerateReportUseCase
+from src.domain.use_cases.query_report_use_case import QueryReportUseCase
 from src.domain.use_cases.notify_careers_use_case import NotifyCareersUseCase
 from src.domain.use_cases.import_csv_use_case import ImportCsvUseCase
+from src.domain.use_cases.submit_processing_job_use_case import SubmitProcessingJobUseCase
 
 
 def _create_shared_session():
@@ -26,31 +60,379 @@ def _create_shared_session():
     return Sesion()
 
 
-def build_process_files_use_case() -> ProcessFilesUseCase:
-    """Construye y retorna el caso de uso ProcessFilesUseCase con sus dependencias."""
+_cache_store = None
+_cache_store_lock = threading.Lock()
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+_primo_client = None
+_primo_client_lock = threading.Lock()
+_catalog_limiter = None
+_catalog_limiter_lock = threading.Lock()
+_job_queue = None
+_job_queue_lock = threading.Lock()
+_report_store = None
+_report_store_lock = threading.Lock()
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+_ai_factory = None
+_ai_factory_lock = threading.Lock()
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Lee una variable de entorno booleana ('1', 'true', 'yes')."""
+    valor = os.getenv(name)
+    if valor is None:
+        return default
+    return valor.strip().lower() in ('1', 'true', 'yes')
+
+
+def _shared_cache_store() -> SQLiteCacheStore:
+    """
+    Caché persistente compartida por todo el proceso.
+
+    CACHE_DB_PATH define el archivo y CACHE_MAX_MB su tamaño máximo; al
+    superarlo se eliminan las entradas usadas hace más tiempo.
+    """
+    global _cache_store
+    with _cache_store_lock:
+        if _cache_store is None:
+            _cache_store = SQLiteCacheStore(
+                max_bytes=env_int('CACHE_MAX_MB', 200) * 1024 * 1024
+            )
+        return _cache_store
+
+
+def _shared_ai_factory() -> AIProviderFactory:
+    """
+    Proveedores de IA compartidos por todo el proceso.
+
+    Crear los clientes (y abrir sus conexiones TLS) en cada subida descartaba
+    las conexiones ya abiertas; con una sola instancia cada llamada reutiliza
+    las de sus sesiones HTTP (AI_HTTP_POOL_SIZE conexiones por sesión).
+
+    El orden de fallback sigue la salud de cada proveedor: AI_HEALTH_WINDOW
+    llamadas recientes; tras AI_CIRCUIT_FAILURES fallos seguidos el proveedor
+    sale de la rotación AI_CIRCUIT_COOLDOWN_SECONDS (la espera se duplica
+    tras cada prueba fallida, hasta AI_CIRCUIT_MAX_COOLDOWN_SECONDS).
+    """
+    global _ai_factory
+    with _ai_factory_lock:
+        if _ai_factory is None:
+            health = ProviderHealthTracker(
+                window=env_int('AI_HEALTH_WINDOW', 50),
+                failure_threshold=env_int('AI_CIRCUIT_FAILURES', 3),
+                cooldown=env_float('AI_CIRCUIT_COOLDOWN_SECONDS', 30),
+                max_cooldown=env_float('AI_CIRCUIT_MAX_COOLDOWN_SECONDS', 300),
+            )
+            _ai_factory = AIProviderFactory(load_balance=True, health=health)
+            atexit.register(_ai_factory.close)
+        return _ai_factory
+
+
+def _ai_cache_options(factory: AIProviderFactory) -> dict:
+    """Argumentos comunes de los adaptadores de IA con caché (AI_CACHE_TTL_DAYS)."""
+    return {
+        'store': _shared_cache_store(),
+        'model_names': {
+            nombre: getattr(proveedor, 'model_name', nombre)
+            for nombre, proveedor in factory.providers.items()
+        },
+        'ttl': env_float('AI_CACHE_TTL_DAYS', 30) * 24 * 3600,
+    }
+
+
+def _build_ai_provider(factory: AIProviderFactory = None):
+    """AIProviderAdapter, envuelto en la caché de respuestas salvo AI_CACHE_ENABLED=0."""
+    factory = factory or _shared_ai_factory()
+    adapter = AIProviderAdapter(factory)
+    if not _env_flag('AI_CACHE_ENABLED', True):
+        return adapter
+    return CachedAIProviderAdapter(adapter, **_ai_cache_options(factory))
+
+
+def _build_async_ai_provider(factory: AIProviderFactory):
+    """Versión asíncrona de _build_ai_provider."""
+    adapter = AsyncAIProviderAdapter(factory)
+    if not _env_flag('AI_CACHE_ENABLED', True):
+        return adapter
+    return CachedAsyncAIProviderAdapter(adapter, **_ai_cache_options(factory))
+
+
+def _shared_driver_pool():
+    """
+    Pool de navegadores Chrome compartido por todo el proceso.
+
+    CHROME_POOL_SIZE define cuántos navegadores viven a la vez (0 desactiva el
+    pool: un Chrome por búsqueda) y CHROME_MAX_USES tras cuántas búsquedas se
+    reinicia cada uno.
+    """
+    global _driver_pool
+    size = env_int('CHROME_POOL_SIZE', 2)
+    if size <= 0:
+        return None
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = ChromeDriverPool(
+                size=size, max_uses=env_int('CHROME_MAX_USES', 50)
+            )
+            atexit.register(_driver_pool.close)
+        return _driver_pool
+
+
+def _shared_primo_client() -> PrimoHttpClient:
+    """
+    Cliente HTTP de Primo compartido por todo el proceso (una sola sesión con
+    conexiones reutilizables). PRIMO_BASE_URL, PRIMO_VID y PRIMO_SCOPE
+    permiten apuntarlo a otra institución o a un servidor de pruebas.
+    """
+    global _primo_client
+    with _primo_client_lock:
+        if _primo_client is None:
+            _primo_client = PrimoHttpClient(
+                base_url=os.getenv('PRIMO_BASE_URL', DEFAULT_BASE_URL),
+                vid=os.getenv('PRIMO_VID', DEFAULT_VID),
+                scope=os.getenv('PRIMO_SCOPE', 'MyInst_and_CI'),
+            )
+            atexit.register(_primo_client.close)
+        return _primo_client
+
+
+def _shared_catalog_limiter():
+    """
+    Limitador de búsquedas en Primo compartido por todos los workers.
+
+    CATALOG_REQUESTS_PER_MINUTE define la tasa acordada (0 desactiva el
+    límite) y CATALOG_BURST cuántas búsquedas seguidas se permiten sin esperar.
+    """
+    global _catalog_limiter
+    por_minuto = env_float('CATALOG_REQUESTS_PER_MINUTE', 20)
+    if por_minuto <= 0:
+        return None
+    with _catalog_limiter_lock:
+        if _catalog_limiter is None:
+            _catalog_limiter = TokenBucket(
+                rate=por_minuto / 60, capacity=env_float('CATALOG_BURST', 2)
+            )
+        return _catalog_limiter
+
+
+def _build_catalog():
+    """
+    Adaptador del catálogo Primo según CATALOG_BACKEND: 'selenium' (por
+    defecto, navegador sobre el pool compartido) o 'http' (endpoints JSON de
+    Primo, sin navegador), con el limitador de tasa compartido.
+
+    Salvo CATALOG_CACHE_ENABLED=0, los resultados se guardan en la caché
+    persistente: CATALOG_CACHE_TTL_DAYS para libros encontrados y
+    CATALOG_CACHE_NEGATIVE_TTL_HOURS para búsquedas sin resultado. Los
+    aciertos de caché no consumen cuota del limitador.
+    """
+    if os.getenv('CATALOG_BACKEND', 'selenium').lower() == 'http':
+        catalog = PrimoHttpCatalogAdapter(_shared_primo_client())
+    else:
+        catalog = PrimoCatalogAdapter(driver_pool=_shared_driver_pool())
+    limiter = _shared_catalog_limiter()
+    if limiter:
+        catalog = RateLimitedCatalogAdapter(catalog, limiter)
+    if not _env_flag('CATALOG_CACHE_ENABLED', True):
+        return catalog
+    return CachedCatalogAdapter(
+        catalog, _shared_cache_store(),
+        ttl=env_float('CATALOG_CACHE_TTL_DAYS', 7) * 24 * 3600,
+        negative_ttl=env_float('CATALOG_CACHE_NEGATIVE_TTL_HOURS', 24) * 3600,
+    )
+
+
+def _process_max_workers() -> int:
+    """Número de archivos procesados en paralelo (PROCESS_MAX_WORKERS, por defecto 1)."""
+    return max(1, env_int('PROCESS_MAX_WORKERS', 1))
+
+
+def _pipeline_options() -> dict:
+    """
+    Opciones del modo pipeline del caso de uso (PROCESS_MODE=pipeline).
+
+    PIPELINE_STAGE_WORKERS define los hilos por etapa, p.ej.
+    "extract=2,ai=4,catalog=2,store=1"; PIPELINE_QUEUE_SIZE la capacidad
+    de cada cola entre etapas.
+    """
+    if os.getenv('PROCESS_MODE', 'files').lower() != 'pipeline':
+        return {}
+    stage_workers = {}
+    for par in os.getenv('PIPELINE_STAGE_WORKERS', '').split(','):
+        nombre, _, valor = par.partition('=')
+        if nombre.strip() and valor.strip().isdigit():
+            stage_workers[nombre.strip()] = max(1, int(valor))
+    return {
+        'stage_workers': stage_workers or DEFAULT_STAGE_WORKERS,
+        'queue_size': env_int('PIPELINE_QUEUE_SIZE', 8),
+    }
+
+
+def _async_options(factory: AIProviderFactory, catalog) -> dict:
+    """
+    Opciones del modo asíncrono del caso de uso (PROCESS_MODE=async).
+
+    Los adaptadores asíncronos comparten el AIProviderFactory y el catálogo
+    del adaptador síncrono. ASYNC_MAX_FILES limita los archivos en vuelo y
+    CATALOG_MAX_CONCURRENCY las búsquedas simultáneas en Primo.
+    """
+    if os.getenv('PROCESS_MODE', 'files').lower() != 'async':
+        return {}
+    return {
+        'async_ai_provider': _build_async_ai_provider(factory),
+        'async_catalog': AsyncCatalogAdapter(
+            catalog, max_concurrency=env_int('CATALOG_MAX_CONCURRENCY', 2)
+        ),
+        'max_concurrent_files': env_int('ASYNC_MAX_FILES', 16),
+    }
+
+
+def _extraction_processes() -> int:
+    """
+    Procesos del pool de extracción según EXTRACTION_PROCESSES: -1 para
+    'auto' (uno por núcleo) y 0 (pool desactivado) si el valor no es válido.
+    """
+    if os.getenv('EXTRACTION_PROCESSES', '').strip().lower() == 'auto':
+        return -1
+    return max(0, env_int('EXTRACTION_PROCESSES', 0))
+
+
+def _shared_extraction_pool():
+    """
+    Pool de procesos extractores compartido por todo el proceso.
+
+    EXTRACTION_PROCESSES define cuántos procesos extraen texto a la vez
+    ('auto' = uno por núcleo; 0 desactiva el pool: se extrae en el hilo que
+    procesa el archivo). EXTRACTION_TIMEOUT_SECONDS y EXTRACTION_MAX_MEMORY_MB
+    limitan cada extracción (el proceso que los excede se mata y se reemplaza)
+    y EXTRACTION_MAX_TASKS indica tras cuántos archivos se reinicia un proceso.
+    """
+    global _extraction_pool
+    procesos = _extraction_processes()
+    if procesos == 0:
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ExtractionProcessPool(
+                size=None if procesos < 0 else procesos,
+                timeout=env_float('EXTRACTION_TIMEOUT_SECONDS', 120),
+                max_memory_mb=env_int('EXTRACTION_MAX_MEMORY_MB', 1024),
+                max_tasks=env_int('EXTRACTION_MAX_TASKS', 50),
+            )
+            _extraction_pool.warm()
+            atexit.register(_extraction_pool.close)
+            print(f"[OK] Pool de extracción iniciado ({_extraction_pool.size} procesos)")
+        return _extraction_pool
+
+
+def _build_file_extractor():
+    """
+    Extractor de texto según PDF_FAST_EXTRACTION y el pool de extracción.
+
+    Salvo EXTRACT_CACHE_ENABLED=0, el texto de cada archivo se guarda en la
+    caché persistente por contenido y versión del extractor durante
+    EXTRACT_CACHE_TTL_DAYS: reprocesar un lote no vuelve a convertir los
+    archivos sin cambios.
+    """
+    extractor = FileExtractorAdapter(pdf_fast=_env_flag('PDF_FAST_EXTRACTION'),
+                                     pool=_shared_extraction_pool())
+    if not _env_flag('EXTRACT_CACHE_ENABLED', True):
+        return extractor
+    return CachedFileExtractorAdapter(
+        extractor, _shared_cache_store(),
+        ttl=env_float('EXTRACT_CACHE_TTL_DAYS', 90) * 24 * 3600,
+    )
+
+
+def _build_process_files_worker(**options) -> ProcessFilesUseCase:
+    """Construye una instancia del caso de uso con su propia sesión de BD."""
+    session = _create_shared_session()
+    return ProcessFilesUseCase(
+        file_extractor=_build_file_extractor(),
+        ai_provider=_build_ai_provider(),
+        catalog=_build_catalog(),
+        carrera_repo=SQLAlchemyCarreraRepository(session),
+        asignatura_repo=SQLAlchemyAsignaturaRepository(session),
+        titulo_repo=SQLAlchemyTituloRepository(session),
+        adquisicion_repo=SQLAlchemyAdquisicionRepository(session),
+        processed_repo=SQLAlchemyProcessedFileRepository(session),
+        job_repo=SQLAlchemyJobRepository(session),
+        event_repo=SQLAlchemyJobEventRepository(),
+        **options,
+    )
+
+
+def build_process_files_use_case(max_workers: int = None) -> ProcessFilesUseCase:
+    """
+    Construye y retorna el caso de uso ProcessFilesUseCase con sus dependencias.
+
+    Si max_workers (o PROCESS_MAX_WORKERS) es mayor que 1, el caso de uso procesa
+    varios archivos en paralelo; cada worker se construye con
+    _build_process_files_worker() y obtiene su propia sesión de base de datos.
+    Con PROCESS_MODE=pipeline se usa en cambio el pipeline por etapas y con
+    PROCESS_MODE=async un único event loop (ver _async_options).
+
+    Los archivos ya procesados con el mismo contenido y versión del pipeline se
+    omiten; PROCESS_FORCE=1 fuerza su reprocesamiento. Cada ejecución queda en la
+    bitácora de trabajos y una ejecución interrumpida se reanuda en la siguiente.
+    Las respuestas de IA se guardan en la caché persistente (ver _build_ai_provider).
+    """
     session = _create_shared_session()
-    ai_provider = AIProviderAdapter()
+    factory = _shared_ai_factory()
+    catalog = _build_catalog()
     return ProcessFilesUseCase(
-        file_extractor=FileExtractorAdapter(),
-        ai_provider=ai_provider,
-        catalog=PrimoCatalogAdapter(),
+        file_extractor=_build_file_extractor(),
+        ai_provider=_build_ai_provider(factory),
+        catalog=catalog,
         carrera_repo=SQLAlchemyCarreraRepository(session),
         asignatura_repo=SQLAlchemyAsignaturaRepository(session),
         titulo_repo=SQLAlchemyTituloRepository(session),
         adquisicion_repo=SQLAlchemyAdquisicionRepository(session),
+        processed_repo=SQLAlchemyProcessedFileRepository(session),
+        job_repo=SQLAlchemyJobRepository(session),
+        event_repo=SQLAlchemyJobEventRepository(),
+        force=_env_flag('PROCESS_FORCE'),
+        worker_factory=_build_process_files_worker,
+        max_workers=max_workers or _process_max_workers(),
+        **_pipeline_options(),
+        **_async_options(factory, catalog),
     )
 
 
+def get_report_store() -> ReportArtifactStore:
+    """
+    Directorio de reportes generados, compartido por el proceso.
+
+    REPORTS_DIR define la carpeta (por defecto ./reportes); se conservan las
+    REPORTS_KEEP_PER_SCOPE versiones más recientes de cada alcance con menos
+    de REPORTS_RETENTION_DAYS días.
+    """
+    global _report_store
+    with _report_store_lock:
+        if _report_store is None:
+            _report_store = ReportArtifactStore(
+                directory=os.getenv('REPORTS_DIR', 'reportes'),
+                retention_days=env_float('REPORTS_RETENTION_DAYS', 30),
+                keep_per_scope=env_int('REPORTS_KEEP_PER_SCOPE', 3),
+            )
+        return _report_store
+
+
 def build_generate_report_use_case() -> GenerateReportUseCase:
     """Construye y retorna el caso de uso GenerateReportUseCase con sus dependencias."""
     session = _create_shared_session()
     return GenerateReportUseCase(
-        carrera_repo=SQLAlchemyCarreraRepository(session),
-        adquisicion_repo=SQLAlchemyAdquisicionRepository(session),
-        report_port=CsvReportAdapter(),
+        report_repo=SQLAlchemyReportRepository(session),
+        report_port=CsvReportAdapter(store=get_report_store()),
     )
 
 
+def build_query_report_use_case() -> QueryReportUseCase:
+    """Construye el caso de uso de consulta paginada del reporte (API web)."""
+    return QueryReportUseCase(report_repo=SQLAlchemyReportRepository(_create_shared_session()))
+
+
 def build_notify_careers_use_case() -> NotifyCareersUseCase:
     """Construye y retorna el caso de uso NotifyCareersUseCase con sus dependencias."""
     session = _create_shared_session()
@@ -62,3 +444,36 @@ def build_notify_careers_use_case() -> NotifyCareersUseCase:
 def build_import_csv_use_case() -> ImportCsvUseCase:
     """Construye y retorna el caso de uso ImportCsvUseCase."""
     return ImportCsvUseCase()
+
+
+def _shared_job_queue() -> ThreadPoolJobQueue:
+    """
+    Cola de trabajos en segundo plano del proceso web.
+
+    JOB_WORKERS define cuántos trabajos corren a la vez (por defecto 1: los
+    trabajos de distintas subidas se procesan en orden de llegada).
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = ThreadPoolJobQueue(max_workers=env_int('JOB_WORKERS', 1))
+            atexit.register(_job_queue.shutdown, False)
+        return _job_queue
+
+
+def build_submit_processing_job_use_case() -> SubmitProcessingJobUseCase:
+    """
+    Construye el caso de uso que encola el procesamiento de una subida web.
+    Cada trabajo construye sus casos de uso (y sesiones) en el hilo de la cola,
+    queda asignado a este proceso y borra su directorio temporal al terminar.
+    """
+    return SubmitProcessingJobUseCase(
+        job_repo_factory=lambda: SQLAlchemyJobRepository(_create_shared_session()),
+        job_queue=_shared_job_queue(),
+        process_factory=build_process_files_use_case,
+        report_factory=build_generate_report_use_case,
+        event_repo=SQLAlchemyJobEventRepository(),
+        worker_id=current_worker_id(),
+        worker_alive=is_worker_alive,
+        remove_directory=True,
+    )
@@ -4,3 +4,6 @@ from .title import Title
 from .subject import Subject
 from .career import Career
 from .acquisition import Acquisition
+from .processed_file import ProcessedFile
+from .job import Job, JobFile, JobEvent
+from .report_row import ReportRow, ReportQuery, ReportPage
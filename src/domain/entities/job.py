@@ -0,0 +1,79 @@
+"""
+Entidades de dominio puras: Job (Trabajo de procesamiento) y JobFile
+No depende de ninguna tecnología de infraestructura.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+# Estados del trabajo
+JOB_QUEUED = 'en cola'
+JOB_RUNNING = 'en curso'
+JOB_DONE = 'completado'
+JOB_FAILED = 'con errores'
+
+# Etapas completadas de un archivo, en orden (bitácora del trabajo)
+JOURNAL_EXTRACTED = 'extracted'
+JOURNAL_SUBJECT = 'subject'
+JOURNAL_BIBLIOGRAPHY = 'bibliography'
+JOURNAL_CATALOG = 'catalog'
+JOURNAL_STORED = 'stored'
+
+# Eventos de progreso de un trabajo (JobEvent.kind)
+EVENT_FILE_STARTED = 'file_started'
+EVENT_SUBJECT = 'subject'
+EVENT_ENTRIES = 'entries'
+EVENT_CATALOG = 'catalog'
+EVENT_STORED = 'stored'
+EVENT_FILE_FINISHED = 'file_finished'
+EVENT_JOB_FINISHED = 'job_finished'
+
+
+@dataclass
+class Job:
+    """Un trabajo de procesamiento de un directorio de syllabus."""
+    directory: str
+    facultad: str
+    carrera: str
+    status: str = JOB_RUNNING
+    created_at: datetime = None
+    updated_at: datetime = None
+    error: Optional[str] = None        # error que detuvo el trabajo completo
+    report_path: Optional[str] = None  # reporte generado al terminar (trabajos web)
+    worker: Optional[str] = None       # proceso cuya cola tiene el trabajo (trabajos web)
+    id: int = None
+
+
+@dataclass
+class JobFile:
+    """
+    Estado de un archivo dentro de un trabajo.
+
+    ``payload`` guarda los resultados de las etapas ya completadas
+    (asignatura, entradas bibliográficas, resultados de catálogo) para
+    reanudar sin repetir llamadas a la IA ni al catálogo.
+    """
+    job_id: int
+    file_name: str
+    content_hash: Optional[str] = None
+    stage: Optional[str] = None
+    status: str = JOB_RUNNING
+    payload: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    updated_at: datetime = None
+    id: int = None
+
+
+@dataclass
+class JobEvent:
+    """
+    Evento de progreso de un trabajo (archivo iniciado, asignatura detectada,
+    entradas extraídas, resultado de catálogo, almacenado...). ``id`` es
+    creciente dentro de la bitácora y permite retomar la lectura.
+    """
+    job_id: int
+    kind: str
+    file_name: Optional[str] = None
+    data: dict = field(default_factory=dict)
+    created_at: datetime = None
+    id: int = None
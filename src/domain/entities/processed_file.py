@@ -0,0 +1,24 @@
+"""
+Entidades de dominio puras: ProcessedFile (Archivo procesado)
+No depende de ninguna tecnología de infraestructura.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class ProcessedFile:
+    """
+    Registro de un syllabus ya ingerido.
+
+    Un archivo se considera sin cambios si existe un registro con el mismo
+    hash de contenido, versión del pipeline, facultad y carrera.
+    """
+    file_name: str
+    content_hash: str
+    pipeline_version: str
+    facultad: str
+    carrera: str
+    status: str = 'ok'
+    processed_at: datetime = None
+    id: int = None
@@ -0,0 +1,118 @@
+"""
+Entidades de dominio puras: ReportRow (fila del reporte consolidado),
+ReportQuery (página, orden y filtros de una consulta) y ReportPage.
+No depende de ninguna tecnología de infraestructura.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from src.domain.normalization import fold_text
+
+from src.domain.entities.title import Title
+
+
+@dataclass
+class ReportRow:
+    """Un título en una asignatura, con su adquisición y sus conteos de uso."""
+    facultad: str
+    carrera: str
+    asignatura: str
+    plan: str
+    semestre: str
+    titulo: Title
+    available_printed: bool = False
+    available_digital: bool = False
+    conteo_carrera: int = 0   # asignaturas de la misma carrera que usan el título
+    conteo_global: int = 0    # asignaturas (de todas las carreras) que usan el título
+
+
+# Alcances de los reportes generados: el completo y el de cada trabajo web
+REPORT_SCOPE_FULL = 'general'
+JOB_REPORT_SCOPE_PREFIX = 'trabajo-'
+
+
+def job_report_scope(job_id: int) -> str:
+    """Alcance del reporte completo generado al terminar un trabajo."""
+    return f"{JOB_REPORT_SCOPE_PREFIX}{job_id}"
+
+
+# Claves de orden aceptadas por la consulta paginada del reporte
+REPORT_SORT_KEYS = (
+    'facultad', 'carrera', 'asignatura', 'plan', 'semestre', 'autor', 'titulo', 'anio',
+    'conteo_carrera', 'conteo_global',
+)
+
+# Filtros de disponibilidad en el catálogo
+AVAILABILITY_PRINTED = 'impreso'
+AVAILABILITY_DIGITAL = 'digital'
+AVAILABILITY_ANY = 'disponible'         # impreso o digital
+AVAILABILITY_NONE = 'no_disponible'     # ni impreso ni digital (o sin adquisición)
+AVAILABILITY_FILTERS = (AVAILABILITY_PRINTED, AVAILABILITY_DIGITAL, AVAILABILITY_ANY,
+                        AVAILABILITY_NONE)
+
+MAX_REPORT_PAGE_SIZE = 500
+
+
+@dataclass
+class ReportQuery:
+    """Página, orden y filtros de una consulta del reporte (filtros vacíos = sin filtrar)."""
+    page: int = 1
+    page_size: int = 25
+    sort: Optional[str] = None        # una de REPORT_SORT_KEYS; None = orden del CSV
+    descending: bool = False
+    facultad: Optional[str] = None
+    carrera: Optional[str] = None
+    asignatura: Optional[str] = None  # coincidencia parcial
+    disponibilidad: Optional[str] = None  # una de AVAILABILITY_FILTERS
+    texto: Optional[str] = None       # búsqueda parcial en autor, título y asignatura
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.page_size
+
+    def validate(self) -> None:
+        """
+        Raises:
+            ValueError: Si la página, el orden o el filtro de disponibilidad no son válidos
+        """
+        if self.page < 1:
+            raise ValueError('page debe ser mayor o igual a 1')
+        if not 1 <= self.page_size <= MAX_REPORT_PAGE_SIZE:
+            raise ValueError(f'page_size debe estar entre 1 y {MAX_REPORT_PAGE_SIZE}')
+        if self.sort is not None and self.sort not in REPORT_SORT_KEYS:
+            raise ValueError(f'sort debe ser uno de: {", ".join(REPORT_SORT_KEYS)}')
+        if self.disponibilidad is not None and self.disponibilidad not in AVAILABILITY_FILTERS:
+            raise ValueError(
+                f'disponibilidad debe ser uno de: {", ".join(AVAILABILITY_FILTERS)}')
+
+    _SCOPE_FIELDS = ('facultad', 'carrera', 'asignatura', 'disponibilidad', 'texto')
+
+    def is_filtered(self) -> bool:
+        return any(getattr(self, campo) for campo in self._SCOPE_FIELDS)
+
+    def scope(self) -> str:
+        """
+        Nombre del alcance del reporte según sus filtros (no según página ni
+        orden): legible y apto como nombre de carpeta. Sin filtros es el
+        reporte completo.
+        """
+        valores = [(c, getattr(self, c)) for c in self._SCOPE_FIELDS if getattr(self, c)]
+        if not valores:
+            return REPORT_SCOPE_FULL
+        legible = '__'.join(f"{c}-{fold_text(v).replace(' ', '_')[:30]}" for c, v in valores)
+        huella = hashlib.sha1(repr(valores).encode('utf-8')).hexdigest()[:8]
+        return f"{legible}-{huella}"
+
+
+@dataclass
+class ReportPage:
+    """Una página de filas del reporte y el total de filas que cumplen los filtros."""
+    rows: List[ReportRow] = field(default_factory=list)
+    total: int = 0
+    page: int = 1
+    page_size: int = 25
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.page_size))
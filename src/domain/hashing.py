@@ -0,0 +1,25 @@
+"""
+Huellas de contenido (hash) para archivos y textos.
+No depende de ninguna tecnología de infraestructura.
+"""
+import hashlib
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(file_path: str) -> str:
+    """Retorna el SHA-256 hexadecimal del contenido del archivo (leído por bloques)."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for bloque in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def sha256_text(*partes: str) -> str:
+    """Retorna el SHA-256 hexadecimal de la concatenación de los textos."""
+    digest = hashlib.sha256()
+    for parte in partes:
+        digest.update(parte.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -0,0 +1,31 @@
+"""
+Normalización de textos bibliográficos para comparar y agrupar.
+No depende de ninguna tecnología de infraestructura.
+"""
+import re
+import unicodedata
+
+_NO_ALFANUMERICO = re.compile(r'[^\w]+', re.UNICODE)
+
+
+def fold_text(texto: str) -> str:
+    """
+    Forma canónica de un texto: minúsculas, sin tildes, sin puntuación y con
+    espacios simples. "Bourdieu,  Pierre." y "bourdieu pierre" son iguales.
+    """
+    if not texto:
+        return ''
+    descompuesto = unicodedata.normalize('NFKD', texto.casefold())
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(_NO_ALFANUMERICO.sub(' ', sin_tildes).replace('_', ' ').split())
+
+
+def dedup_key(author: str, title: str):
+    """
+    Clave de deduplicación de un título: autor y título normalizados con
+    fold_text. Retorna None si falta alguno de los dos (no se deduplica).
+    """
+    autor, titulo = fold_text(author), fold_text(title)
+    if not autor or not titulo:
+        return None
+    return f"{autor}|{titulo}"
@@ -7,8 +7,13 @@ from .repository_ports import (
     AsignaturaRepositoryPort,
     TituloRepositoryPort,
     AdquisicionRepositoryPort,
+    ReportRepositoryPort,
+    ProcessedFileRepositoryPort,
+    JobRepositoryPort,
+    JobEventRepositoryPort,
 )
-from .ai_port import AIProviderPort
-from .catalog_port import CatalogSearchPort
+from .ai_port import AIProviderPort, AsyncAIProviderPort
+from .catalog_port import CatalogSearchPort, AsyncCatalogSearchPort
 from .file_extractor_port import FileExtractorPort
 from .report_port import ReportPort
+from .job_queue_port import JobQueuePort
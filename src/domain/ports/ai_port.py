@@ -25,3 +25,29 @@ class AIProviderPort(ABC):
                                max_tokens: int = 2000, temperature: float = 0.7) -> str:
         """Genera usando un proveedor específico por nombre."""
         ...
+
+
+class AsyncAIProviderPort(ABC):
+    """
+    Variante asíncrona de AIProviderPort.
+
+    Permite mantener muchas solicitudes de IA en vuelo desde un solo event loop;
+    las implementaciones son responsables de limitar la concurrencia por proveedor.
+    """
+
+    @abstractmethod
+    async def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        """Genera texto dado un prompt. Retorna el string de respuesta."""
+        ...
+
+    @abstractmethod
+    async def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
+                                     temperature: float = 0.7) -> Tuple[str, str]:
+        """Genera con fallback automático. Retorna (respuesta, nombre_proveedor)."""
+        ...
+
+    @abstractmethod
+    async def generate_with_provider(self, provider_name: str, prompt: str,
+                                     max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        """Genera usando un proveedor específico por nombre."""
+        ...
@@ -30,5 +30,19 @@ class CatalogSearchPort(ABC):
                 'disponibilidad_fisica': str,
                 'disponibilidad_online': str
             }
+
+        Raises:
+            Exception: Si el catálogo no responde (tiempo agotado, navegador o
+                       red caídos). None se reserva para "no encontrado", que
+                       puede guardarse en caché; un error no.
         """
         ...
+
+
+class AsyncCatalogSearchPort(ABC):
+    """Variante asíncrona de CatalogSearchPort (mismo formato de resultado)."""
+
+    @abstractmethod
+    async def search(self, search_term: str) -> Optional[Dict]:
+        """Busca un libro en el catálogo. Retorna el diccionario de detalles o None."""
+        ...
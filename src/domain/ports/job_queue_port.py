@@ -0,0 +1,20 @@
+"""
+Puerto de salida: JobQueuePort
+Define la interfaz para ejecutar trabajos largos fuera del hilo que los solicita.
+"""
+from abc import ABC, abstractmethod
+from typing import Callable
+
+
+class JobQueuePort(ABC):
+    """Puerto de salida para una cola de trabajos en segundo plano."""
+
+    @abstractmethod
+    def submit(self, fn: Callable[..., None], *args) -> None:
+        """
+        Encola ``fn(*args)`` y retorna de inmediato.
+
+        Los errores de ``fn`` no se propagan a quien encola: ``fn`` debe
+        registrar su propio resultado (p.ej. en la bitácora de trabajos).
+        """
+        ...
@@ -3,19 +3,24 @@ Puerto de salida: ReportPort
 Define la interfaz para generar reportes de bibliografía.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Dict, Iterable
+
+from src.domain.entities.report_row import REPORT_SCOPE_FULL
 
 
 class ReportPort(ABC):
     """Puerto de salida para generación y persistencia de reportes."""
 
     @abstractmethod
-    def generate(self, data: List[Dict]) -> str:
+    def generate(self, data: Iterable[Dict], scope: str = REPORT_SCOPE_FULL) -> str:
         """
         Genera un reporte a partir de los datos.
 
         Args:
-            data: Lista de filas del reporte
+            data: Filas del reporte; puede ser un generador que se consume
+                  una sola vez
+            scope: Alcance del reporte (completo, de un trabajo o de un filtro);
+                   cada alcance conserva sus propias versiones
 
         Returns:
             Ruta al archivo generado
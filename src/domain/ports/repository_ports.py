@@ -3,12 +3,15 @@ Puertos de repositorios (secondary ports).
 El dominio define estas interfaces; la infraestructura las implementa.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from src.domain.entities.career import Career
 from src.domain.entities.subject import Subject
 from src.domain.entities.title import Title
 from src.domain.entities.acquisition import Acquisition
+from src.domain.entities.processed_file import ProcessedFile
+from src.domain.entities.job import Job, JobFile, JobEvent
+from src.domain.entities.report_row import ReportRow, ReportQuery, ReportPage
 
 
 class CarreraRepositoryPort(ABC):
@@ -62,6 +65,20 @@ class TituloRepositoryPort(ABC):
     def link_to_subject(self, title: Title, subject: Subject) -> None:
         ...
 
+    @abstractmethod
+    def save_bibliography(self, subject: Subject,
+                          new_titles: Sequence[Tuple[Title, Acquisition]],
+                          existing_titles: Sequence[Title]) -> List[Title]:
+        """
+        Persiste la bibliografía de una asignatura en una sola transacción:
+        inserta los títulos nuevos con su adquisición y vincula nuevos y
+        existentes a la asignatura. Si algo falla no se guarda nada.
+
+        Returns:
+            Los títulos nuevos, con su id asignado
+        """
+        ...
+
     @abstractmethod
     def get_all_with_relations(self) -> List:
         """Devuelve todos los títulos con sus relaciones (para reportes)."""
@@ -82,3 +99,106 @@ class AdquisicionRepositoryPort(ABC):
     @abstractmethod
     def get_all_available(self) -> List[Acquisition]:
         ...
+
+
+class ReportRepositoryPort(ABC):
+    """Puerto de salida para la lectura del reporte consolidado."""
+
+    @abstractmethod
+    def iter_report_rows(self, query: Optional[ReportQuery] = None) -> Iterator[ReportRow]:
+        """
+        Recorre las filas del reporte (carrera → asignatura → título) ya
+        acompañadas de la adquisición del título y sus conteos por carrera y
+        global, ordenadas por carrera, asignatura y título. Si se entrega
+        ``query`` se aplican sus filtros (no su página ni su orden).
+        """
+        ...
+
+    @abstractmethod
+    def find_report_page(self, query: ReportQuery) -> ReportPage:
+        """
+        Una página de filas del reporte que cumplen los filtros de ``query``,
+        en el orden pedido, junto con el total de filas que los cumplen.
+        """
+        ...
+
+    @abstractmethod
+    def list_careers_by_faculty(self) -> Dict[str, List[str]]:
+        """Carreras con filas en el reporte, agrupadas por facultad (para los filtros)."""
+        ...
+
+
+class ProcessedFileRepositoryPort(ABC):
+    """Puerto de salida para el registro de archivos ya procesados (ingesta incremental)."""
+
+    @abstractmethod
+    def find_processed_hashes(self, content_hashes: Iterable[str], pipeline_version: str,
+                              facultad: str, carrera: str) -> Set[str]:
+        """Retorna el subconjunto de hashes ya procesados con esa versión y carrera."""
+        ...
+
+    @abstractmethod
+    def mark_processed(self, processed_file: ProcessedFile) -> ProcessedFile:
+        """Registra (o actualiza) un archivo como procesado."""
+        ...
+
+
+class JobRepositoryPort(ABC):
+    """Puerto de salida para la bitácora de trabajos de procesamiento."""
+
+    @abstractmethod
+    def create(self, job: Job) -> Job:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: int) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def find_unfinished(self, directory: str, facultad: str, carrera: str) -> Optional[Job]:
+        """Retorna el último trabajo en curso sobre el mismo directorio y carrera."""
+        ...
+
+    @abstractmethod
+    def list_unfinished(self) -> List[Job]:
+        """Trabajos en cola o en curso, del más antiguo al más reciente."""
+        ...
+
+    @abstractmethod
+    def claim(self, job_id: int, worker: str, previous_worker: Optional[str]) -> bool:
+        """
+        Asigna el trabajo a ``worker`` solo si aún pertenece a ``previous_worker``
+        (operación atómica). Retorna False si otro proceso lo tomó antes.
+        """
+        ...
+
+    @abstractmethod
+    def update_status(self, job_id: int, status: str, error: Optional[str] = None,
+                      report_path: Optional[str] = None) -> None:
+        """Cambia el estado del trabajo; ``error`` y ``report_path`` solo si se entregan."""
+        ...
+
+    @abstractmethod
+    def get_files(self, job_id: int) -> List[JobFile]:
+        ...
+
+    @abstractmethod
+    def save_file(self, job_file: JobFile) -> JobFile:
+        """Crea o actualiza el estado de un archivo del trabajo."""
+        ...
+
+
+class JobEventRepositoryPort(ABC):
+    """
+    Puerto de salida para los eventos de progreso de los trabajos.
+    Las implementaciones deben poder usarse desde cualquier hilo.
+    """
+
+    @abstractmethod
+    def add(self, event: JobEvent) -> JobEvent:
+        ...
+
+    @abstractmethod
+    def list_after(self, job_id: int, after_id: int = 0, limit: int = 200) -> List[JobEvent]:
+        """Eventos del trabajo con id mayor que ``after_id``, en orden."""
+        ...
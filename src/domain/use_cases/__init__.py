@@ -5,3 +5,5 @@ from .process_files_use_case import ProcessFilesUseCase
 from .generate_report_use_case import GenerateReportUseCase
 from .notify_careers_use_case import NotifyCareersUseCase
 from .import_csv_use_case import ImportCsvUseCase
+from .submit_processing_job_use_case import SubmitProcessingJobUseCase
+from .query_report_use_case import QueryReportUseCase
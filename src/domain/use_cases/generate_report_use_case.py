@@ -4,23 +4,32 @@ Genera el reporte CSV consolidado con toda la información bibliográfica.
 Solo depende de puertos, no de implementaciones concretas.
 """
 import re
-from typing import List, Dict
+from typing import Dict, Iterator, Optional
 
-from src.domain.ports.repository_ports import (
-    CarreraRepositoryPort,
-    AdquisicionRepositoryPort,
-)
+from src.domain.entities.report_row import ReportRow, ReportQuery
+from src.domain.entities.title import Title
+from src.domain.ports.repository_ports import ReportRepositoryPort
 from src.domain.ports.report_port import ReportPort
 
 
-def _extraer_numero_copias(disponibilidad_fisica: str) -> int:
-    """Extrae el número de copias del string de disponibilidad física."""
+# Hay existencias impresas pero el catálogo no informó cuántas copias
+COPIAS_SIN_DATO = 'sin dato'
+
+
+def _extraer_numero_copias(disponibilidad_fisica: str) -> Optional[int]:
+    """
+    Extrae el número de copias del string de disponibilidad física.
+
+    Retorna 0 sin existencias físicas y None si las hay pero el texto no trae
+    la cantidad (p.ej. "Disponible (Biblioteca Central ...)" del cliente HTTP
+    de Primo, cuya búsqueda no incluye el conteo de copias).
+    """
     if not disponibilidad_fisica:
         return 0
     match = re.search(r'(\d+)\s+copias?', disponibilidad_fisica, re.IGNORECASE)
     if match:
         return int(match.group(1))
-    return 0
+    return None
 
 
 class GenerateReportUseCase:
@@ -31,77 +40,79 @@ class GenerateReportUseCase:
 
     def __init__(
         self,
-        carrera_repo: CarreraRepositoryPort,
-        adquisicion_repo: AdquisicionRepositoryPort,
+        report_repo: ReportRepositoryPort,
         report_port: ReportPort,
     ):
-        self._carrera_repo = carrera_repo
-        self._adquisicion_repo = adquisicion_repo
+        self._report_repo = report_repo
         self._report_port = report_port
 
-    def execute(self) -> str:
-        """Genera el reporte y retorna la ruta del archivo generado."""
-        datos = self._build_report_data()
-        return self._report_port.generate(datos)
-
-    def _build_report_data(self) -> List[Dict]:
-        """Construye la lista de filas del reporte."""
-        datos = []
-        carreras = self._carrera_repo.get_all()
-
-        for carrera in carreras:
-            for asignatura in carrera.asignaturas:
-                for titulo in asignatura.titulos:
-                    adquisicion = self._adquisicion_repo.get_by_title(titulo.id)
-
-                    num_copias_fisicas = _extraer_numero_copias(titulo.physical_availability)
-                    disponible_online = 1 if (adquisicion and adquisicion.available_digital) else 0
-
-                    es_articulo = (
-                        titulo.publisher
-                        and ('http' in titulo.publisher.lower() or 'www' in titulo.publisher.lower())
-                    )
-
-                    conteo_carrera = sum(
-                        1 for asig in titulo.asignaturas if asig.career_id == carrera.id
-                    )
-                    conteo_global = len(titulo.asignaturas)
-
-                    datos.append({
-                        'Facultad': carrera.facultad or '',
-                        'Carrera ': carrera.name or '',
-                        'Asignatura ': asignatura.name or '',
-                        'Plan (año)': asignatura.plan or '',
-                        'Semestre': asignatura.semester or '',
-                        'Autor (Apellido, Nombre) ': titulo.normalized_author or '',
-                        'Título del libro/revistas (Información completa del título)': titulo.normalized_title or '',
-                        'Capitulo o artículo si se amerita la información': titulo.chapter or '',
-                        'Edición': titulo.edition or '',
-                        'Lugar de Públicación ': titulo.place or '',
-                        'Editorial / Si es articulo de revista, Volumen, No': titulo.publisher or '',
-                        'Año de Publicación': titulo.year or '',
-                        'Idioma': titulo.language or 'Español',
-                        'Tipo Bibliografía (Básica / Complementaria) ': titulo.type_bib or '',
-                        'Tipo de Formato': titulo.format or (
-                            'Digital' if disponible_online
-                            else ('Impreso' if num_copias_fisicas > 0 else '')
-                        ),
-                        'Total de ejemplares en catalogo impresos': num_copias_fisicas,
-                        'Total de ejemplares en catalogo digitales': disponible_online,
-                        'Título asociado a carrera': conteo_carrera,
-                        'Título asociado a asignatura ': conteo_global,
-                        'Basica ': 1 if (titulo.type_bib and 'basic' in titulo.type_bib.lower()) else 0,
-                        'Complementaria ': 1 if (titulo.type_bib and 'complementary' in titulo.type_bib.lower()) else 0,
-                        'Colección ': '',
-                        'Número de pédido': '',
-                        'Plataforma de bibliografía': '',
-                        'Fuente del recurso ': '',
-                        'link': titulo.publisher if es_articulo else '',
-                        'Procedencia de información': '',
-                        'Notas ': '',
-                        'Títulos Solicitados': 1,
-                        'Títulos en Biblioteca': 1 if (
-                            adquisicion and (adquisicion.available_printed or adquisicion.available_digital)
-                        ) else 0,
-                    })
-        return datos
+    def execute(self, query: Optional[ReportQuery] = None, scope: Optional[str] = None) -> str:
+        """
+        Genera el reporte y retorna la ruta del archivo generado.
+
+        Args:
+            query: Filtros del reporte (None = reporte completo)
+            scope: Alcance con que se guarda; por defecto el de los filtros
+        """
+        query = query or ReportQuery()
+        return self._report_port.generate(self._iter_report_data(query),
+                                          scope=scope or query.scope())
+
+    def _iter_report_data(self, query: ReportQuery) -> Iterator[Dict]:
+        """Genera las filas del reporte a medida que se leen de la base de datos."""
+        for fila in self._report_repo.iter_report_rows(query):
+            yield self.row_to_dict(fila)
+
+    @staticmethod
+    def row_to_dict(fila: ReportRow) -> Dict:
+        """Traduce una fila del repositorio a las columnas del reporte CSV."""
+        titulo = fila.titulo
+        num_copias_fisicas = _extraer_numero_copias(titulo.physical_availability)
+        disponible_online = 1 if fila.available_digital else 0
+
+        es_articulo = (
+            titulo.publisher
+            and ('http' in titulo.publisher.lower() or 'www' in titulo.publisher.lower())
+        )
+
+        return {
+            'Facultad': fila.facultad or '',
+            'Carrera ': fila.carrera or '',
+            'Asignatura ': fila.asignatura or '',
+            'Plan (año)': fila.plan or '',
+            'Semestre': fila.semestre or '',
+            'Autor (Apellido, Nombre) ': titulo.normalized_author or '',
+            'Título del libro/revistas (Información completa del título)': titulo.normalized_title or '',
+            'Capitulo o artículo si se amerita la información': titulo.chapter or '',
+            'Edición': titulo.edition or '',
+            'Lugar de Públicación ': titulo.place or '',
+            'Editorial / Si es articulo de revista, Volumen, No': titulo.publisher or '',
+            'Año de Publicación': titulo.year or '',
+            'Idioma': titulo.language or 'Español',
+            'Tipo Bibliografía (Básica / Complementaria) ': titulo.type_bib or '',
+            'Tipo de Formato': titulo.format or (
+                'Digital' if disponible_online
+                else ('Impreso' if num_copias_fisicas is None or num_copias_fisicas > 0 else '')
+            ),
+            'Total de ejemplares en catalogo impresos': (
+                COPIAS_SIN_DATO if num_copias_fisicas is None else num_copias_fisicas
+            ),
+            'Total de ejemplares en catalogo digitales': disponible_online,
+            'Título asociado a carrera': fila.conteo_carrera,
+            'Título asociado a asignatura ': fila.conteo_global,
+            'Basica ': 1 if (titulo.type_bib and 'basic' in titulo.type_bib.lower()) else 0,
+            'Complementaria ': 1 if (titulo.type_bib and 'complementary' in titulo.type_bib.lower()) else 0,
+            'Colección ': '',
+            'Número de pédido': '',
+            'Plataforma de bibliografía': '',
+            'Fuente del recurso ': '',
+            'link': titulo.publisher if es_articulo else '',
+            'Procedencia de información': '',
+            'Notas ': '',
+            'Títulos Solicitados': 1,
+            'Títulos en Biblioteca': 1 if (fila.available_printed or fila.available_digital) else 0,
+        }
+
+
+# Columnas del reporte, en orden (las del CSV y de la API paginada)
+REPORT_HEADERS = list(GenerateReportUseCase.row_to_dict(ReportRow('', '', '', '', '', Title('', ''))))
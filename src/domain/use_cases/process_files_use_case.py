@@ -10,13 +10,26 @@ Orquesta todo el flujo de procesamiento de archivos de syllabus:
 
 Solo depende de puertos (interfaces), no de implementaciones concretas.
 """
+import asyncio
+import copy
+import functools
 import os
 import json
 import re
-import time
-from typing import List, Optional
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.domain.entities.bibliography import BibliographyEntry
+from src.domain.entities.processed_file import ProcessedFile
+from src.domain.entities.job import (
+    Job, JobFile, JobEvent, JOB_RUNNING, JOB_DONE, JOB_FAILED,
+    JOURNAL_EXTRACTED, JOURNAL_SUBJECT, JOURNAL_BIBLIOGRAPHY, JOURNAL_CATALOG, JOURNAL_STORED,
+    EVENT_FILE_STARTED, EVENT_SUBJECT, EVENT_ENTRIES, EVENT_CATALOG, EVENT_STORED,
+    EVENT_FILE_FINISHED,
+)
 from src.domain.entities.title import Title
 from src.domain.entities.acquisition import Acquisition
 from src.domain.ports.repository_ports import (
@@ -24,10 +37,125 @@ from src.domain.ports.repository_ports import (
     AsignaturaRepositoryPort,
     TituloRepositoryPort,
     AdquisicionRepositoryPort,
+    ProcessedFileRepositoryPort,
+    JobRepositoryPort,
+    JobEventRepositoryPort,
 )
-from src.domain.ports.ai_port import AIProviderPort
-from src.domain.ports.catalog_port import CatalogSearchPort
+from src.domain.hashing import sha256_file, sha256_text
+from src.domain.normalization import dedup_key
+from src.domain.ports.ai_port import AIProviderPort, AsyncAIProviderPort
+from src.domain.ports.catalog_port import CatalogSearchPort, AsyncCatalogSearchPort
 from src.domain.ports.file_extractor_port import FileExtractorPort
+from src.domain.use_cases.staged_pipeline import Stage, StagedPipeline
+
+
+STATUS_OK = 'ok'
+STATUS_SKIPPED = 'omitido'
+STATUS_ERROR = 'error'
+STATUS_UNCHANGED = 'sin cambios'
+
+# Etapas del pipeline (claves de stage_workers)
+STAGE_EXTRACT = 'extract'
+STAGE_AI = 'ai'
+STAGE_CATALOG = 'catalog'
+STAGE_STORE = 'store'
+
+DEFAULT_STAGE_WORKERS = {STAGE_EXTRACT: 2, STAGE_AI: 4, STAGE_CATALOG: 2, STAGE_STORE: 1}
+
+
+SUBJECT_PROMPT_TEMPLATE = """
+Extrae la siguiente información del encabezado o primera página del syllabus:
+1. Asignatura (Nombre de la materia)
+2. Plan (Año del plan de estudios, ej: "2019", "2024")
+3. Semestre (Número de semestre, ej: "4°", "I", "Segundo")
+
+Texto:
+{texto_inicio}
+
+Retorna SOLO el siguiente JSON sin texto adicional:
+{{"subject": "...", "plan": "...", "semester": "..."}}
+"""
+
+BIBLIOGRAPHY_PROMPT_TEMPLATE = """Eres un experto en bibliometría y extracción de datos estructurados.
+Tu misión es extraer ABSOLUTAMENTE TODAS las referencias bibliográficas presentes en el texto del syllabus universitario adjunto.
+
+INSTRUCCIONES CRÍTICAS DE EXHAUSTIVIDAD:
+1. EXTRAE LA TOTALIDAD: En el texto suele haber entre 20 y 40 referencias bibliográficas. DEBES EXTRAERLAS TODAS, una por una, desde la primera hasta la última sin excepción. ESTÁ ESTRICTAMENTE PROHIBIDO OMITIR, RESUMIR, ACORTAR O TRUNCAR LA LISTA.
+2. Clasificación:
+   - Si la referencia está bajo "Bibliografía básica", "Obligatoria" o similar -> colócala en el array "basic".
+   - Si está bajo "Bibliografía complementaria", "Sugerida", "Recomendada" o similar -> colócala en el array "complementary".
+   - Si no hay división clara, coloca todas en "basic".
+3. Tipo (type):
+   - Si tiene URL, enlace web o dice "Disponible en http..." -> type="article".
+   - Si es libro, manual o no tiene enlace -> type="book".
+4. Capítulos: Si es un capítulo o artículo dentro de una obra o compilación (ej. "En Viveros, L. (coord.)..."), pon el título de la compilación/libro en 'title' y el del capítulo/artículo en 'chapter_title'.
+5. FORMATO JSON ESTRICTO:
+   - Responde ÚNICAMENTE con un objeto JSON válido.
+   - Escapa adecuadamente las comillas dobles dentro de los textos o reemplázalas por comillas simples (' ').
+   - NO incluyas saltos de línea literales dentro de las cadenas de texto JSON.
+
+ESTRUCTURA DE RESPUESTA REQUERIDA (Debes llenar los arreglos con TODAS las referencias encontradas en el texto):
+{{
+  "basic": [
+    {{"author": "Apellido, Iniciales", "normalized_author": "Nombre Apellido", "year": "2020", "title": "Título original", "normalized_title": "Título En Title Case", "publisher": "Editorial o ciudad", "url": "", "type": "book", "chapter_title": "", "language": "Español"}}
+  ],
+  "complementary": [
+    {{"author": "Apellido, Iniciales", "normalized_author": "Nombre Apellido", "year": "2021", "title": "Título original", "normalized_title": "Título En Title Case", "publisher": "Editorial", "url": "http://...", "type": "article", "chapter_title": "", "language": "Español"}}
+  ]
+}}
+
+TEXTO DE BIBLIOGRAFÍA A PROCESAR:
+{bibliografia_texto}
+"""
+
+
+# Subir al cambiar la lógica de extracción/normalización/persistencia: fuerza
+# el reprocesamiento de los archivos ya ingeridos (ingesta incremental)
+PIPELINE_VERSION = '1'
+
+
+def pipeline_version() -> str:
+    """Versión del pipeline: PIPELINE_VERSION más una huella de los prompts."""
+    huella = sha256_text(SUBJECT_PROMPT_TEMPLATE, BIBLIOGRAPHY_PROMPT_TEMPLATE)
+    return f"{PIPELINE_VERSION}-{huella[:12]}"
+
+
+@dataclass
+class FileResult:
+    """Resultado del procesamiento de un archivo (para el resumen final)."""
+    file_name: str
+    status: str
+    detail: Optional[str] = None
+
+
+@dataclass
+class PreparedEntry:
+    """Entrada deduplicada y, si es nueva, enriquecida con el catálogo; lista para persistir."""
+    entry: BibliographyEntry
+    title: Title
+    duplicate: Optional[Title] = None
+    impreso: bool = False
+    digital: bool = False
+    encontrado_en_primo: bool = False
+
+
+@dataclass
+class FileTask:
+    """Estado de un archivo a medida que avanza por las etapas del pipeline."""
+    file_name: str
+    file_path: str
+    facultad: str
+    carrera: str
+    content_hash: Optional[str] = None
+    texto: Optional[str] = None
+    asignatura: Optional[str] = None
+    plan: Optional[str] = None
+    semestre: Optional[str] = None
+    entries: List[BibliographyEntry] = field(default_factory=list)
+    prepared: List[Optional[PreparedEntry]] = field(default_factory=list)
+    job_id: Optional[int] = None
+    journal: dict = field(default_factory=dict)  # resultados de etapas (bitácora)
+    journal_stage: Optional[str] = None
 
 
 class ProcessFilesUseCase:
@@ -35,6 +163,40 @@ class ProcessFilesUseCase:
     Caso de uso principal: procesa todos los archivos soportados de un directorio.
 
     Recibe todos sus colaboradores por inyección de dependencias (puertos).
+
+    Modo concurrente: si se entrega ``worker_factory`` y ``max_workers > 1``,
+    los archivos se procesan en paralelo. Cada hilo obtiene su propia instancia
+    del caso de uso desde la fábrica (y por lo tanto su propia sesión de BD),
+    ya que las sesiones de SQLAlchemy no son seguras entre hilos.
+
+    Modo pipeline: si se entrega ``stage_workers`` (p.ej. ``{'extract': 2,
+    'ai': 4, 'catalog': 2, 'store': 1}``), cada etapa (extracción → IA →
+    catálogo → persistencia) corre en su propio pool de hilos conectado por
+    colas acotadas (ver StagedPipeline), de modo que la conversión de PDF se
+    solapa con las llamadas de red y una etapa lenta frena a las anteriores.
+
+    Modo asíncrono: si se entregan ``async_ai_provider`` y ``async_catalog``,
+    ``execute()`` delega en ``execute_async()``: un solo event loop mantiene en
+    vuelo las llamadas de IA y catálogo de varios archivos (los límites de
+    concurrencia por proveedor los aplican los adaptadores). La extracción
+    corre en hilos y el acceso a BD en un único hilo dedicado.
+
+    Ingesta incremental: si se entrega ``processed_repo``, cada archivo
+    procesado (u omitido por no tener asignatura) se registra con el hash de su
+    contenido y la versión del pipeline; en ejecuciones siguientes los archivos
+    sin cambios no se extraen ni se envían a la IA ni al catálogo. ``force``
+    desactiva este filtro.
+
+    Trabajos reanudables: si se entrega ``job_repo``, cada ejecución es un
+    trabajo de la bitácora y cada archivo guarda su última etapa completada
+    (texto extraído, asignatura, bibliografía, catálogo, almacenado) junto con
+    sus resultados. Si la ejecución se interrumpe, la siguiente sobre el mismo
+    directorio (o ``resume(job_id)``) continúa desde esa etapa sin repetir las
+    llamadas a la IA ni al catálogo ya hechas.
+
+    Progreso: si se entrega ``event_repo``, cada archivo de un trabajo emite
+    eventos (iniciado, asignatura, entradas extraídas, resultado de catálogo
+    por entrada, almacenado, terminado) que la aplicación web transmite en vivo.
     """
 
     SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
@@ -48,6 +210,17 @@ class ProcessFilesUseCase:
         asignatura_repo: AsignaturaRepositoryPort,
         titulo_repo: TituloRepositoryPort,
         adquisicion_repo: AdquisicionRepositoryPort,
+        worker_factory: Optional[Callable[[], 'ProcessFilesUseCase']] = None,
+        max_workers: int = 1,
+        stage_workers: Optional[Dict[str, int]] = None,
+        queue_size: int = 8,
+        async_ai_provider: Optional[AsyncAIProviderPort] = None,
+        async_catalog: Optional[AsyncCatalogSearchPort] = None,
+        max_concurrent_files: int = 16,
+        processed_repo: Optional[ProcessedFileRepositoryPort] = None,
+        force: bool = False,
+        job_repo: Optional[JobRepositoryPort] = None,
+        event_repo: Optional[JobEventRepositoryPort] = None,
     ):
         self._extractor = file_extractor
         self._ai = ai_provider
@@ -56,54 +229,636 @@ class ProcessFilesUseCase:
         self._asignatura_repo = asignatura_repo
         self._titulo_repo = titulo_repo
         self._adquisicion_repo = adquisicion_repo
+        self._worker_factory = worker_factory
+        self._max_workers = max(1, max_workers)
+        self._stage_workers = stage_workers
+        self._queue_size = queue_size
+        self._async_ai = async_ai_provider
+        self._async_catalog = async_catalog
+        self._max_concurrent_files = max(1, max_concurrent_files)
+        self._processed_repo = processed_repo
+        self._force = force
+        self._job_repo = job_repo
+        self._event_repo = event_repo
+        self._local = threading.local()
+        # Compartido con los workers: serializa deduplicación y escrituras
+        self._persist_lock = threading.RLock()
 
     # ------------------------------------------------------------------
     # Método principal
     # ------------------------------------------------------------------
 
     def execute(self, directory: str, facultad: str = 'Ciencias Sociales',
-                carrera_default: str = 'Trabajo Social') -> None:
-        """Procesa todos los archivos soportados del directorio."""
+                carrera_default: str = 'Trabajo Social',
+                max_workers: Optional[int] = None,
+                force: Optional[bool] = None,
+                job_id: Optional[int] = None) -> Dict[str, FileResult]:
+        """
+        Procesa todos los archivos soportados del directorio.
+
+        Args:
+            directory: Carpeta con los syllabus
+            facultad: Facultad a la que se asocia la carrera
+            carrera_default: Carrera a la que se asocian las asignaturas
+            max_workers: Número de archivos procesados en paralelo
+                         (por defecto el configurado en el constructor)
+            force: Reprocesar también los archivos sin cambios
+                   (por defecto el configurado en el constructor)
+            job_id: Trabajo a reanudar (por defecto el último trabajo en curso
+                    sobre el mismo directorio y carrera, o uno nuevo)
+
+        Returns:
+            Diccionario nombre_archivo -> FileResult
+        """
         if not os.path.exists(directory):
             print(f"Error: El directorio '{directory}' no existe.")
+            return {}
+
+        if self._async_ai is not None and self._async_catalog is not None:
+            return asyncio.run(self.execute_async(directory, facultad, carrera_default,
+                                                  force=force, job_id=job_id))
+
+        todos = self._list_supported_files(directory)
+        tasks, previos, job = self._plan_run(directory, todos, facultad, carrera_default,
+                                             force, job_id)
+        workers = max(1, max_workers or self._max_workers)
+
+        if not tasks:
+            resultados = {}
+        elif self._stage_workers and self._worker_factory is not None:
+            resultados = self._execute_pipeline(tasks)
+        elif workers > 1 and len(tasks) > 1 and self._worker_factory is not None:
+            print(f"[INFO] Procesando {len(tasks)} archivos con {workers} workers")
+            resultados = self._execute_concurrent(tasks, workers)
+        else:
+            resultados = {task.file_name: self._run_file(self, task) for task in tasks}
+
+        resultados = self._merge_results(todos, resultados, previos)
+        self._finish_job(job, resultados)
+        self._print_summary(resultados)
+        self._print_catalog_cache_stats()
+        return resultados
+
+    def resume(self, job_id: int, **options) -> Dict[str, FileResult]:
+        """Reanuda un trabajo de la bitácora con su directorio, facultad y carrera."""
+        if self._job_repo is None:
+            raise ValueError("resume requiere job_repo")
+        job = self._job_repo.get(job_id)
+        if job is None:
+            raise ValueError(f"No existe el trabajo {job_id}")
+        return self.execute(job.directory, facultad=job.facultad,
+                            carrera_default=job.carrera, job_id=job.id, **options)
+
+    def _plan_run(self, directory: str, filenames: List[str], facultad: str, carrera: str,
+                  force: Optional[bool] = None, job_id: Optional[int] = None
+                  ) -> Tuple[List[FileTask], Dict[str, FileResult], Optional[Job]]:
+        """
+        Arma las tareas de la ejecución: omite archivos sin cambios y, si hay
+        bitácora, los ya almacenados en el trabajo, y carga el progreso de los
+        archivos interrumpidos.
+
+        Returns:
+            (tareas a procesar, resultados de los archivos omitidos, trabajo)
+        """
+        pendientes, hashes, previos = self._filter_unchanged(directory, filenames, facultad,
+                                                             carrera, force)
+        job, bitacora = self._open_job(directory, facultad, carrera, job_id)
+
+        tasks = []
+        for filename in pendientes:
+            task = FileTask(filename, os.path.join(directory, filename), facultad, carrera,
+                            hashes.get(filename), job_id=job.id if job else None)
+            registro = bitacora.get(filename)
+            # Un archivo modificado desde la interrupción se procesa desde cero
+            if registro and registro.content_hash == task.content_hash:
+                if registro.stage == JOURNAL_STORED and registro.status == STATUS_OK:
+                    previos[filename] = FileResult(filename, STATUS_OK)
+                    continue
+                task.journal = dict(registro.payload)
+                task.journal_stage = registro.stage
+            tasks.append(task)
+
+        reanudadas = sum(1 for t in tasks if t.journal)
+        if reanudadas:
+            print(f"[INFO] Reanudando {reanudadas} archivos del trabajo #{job.id}")
+        return tasks, previos, job
+
+    def _filter_unchanged(self, directory: str, filenames: List[str], facultad: str,
+                          carrera: str, force: Optional[bool] = None
+                          ) -> Tuple[List[str], Dict[str, str], Dict[str, FileResult]]:
+        """
+        Separa los archivos nuevos o modificados de los ya procesados.
+
+        Returns:
+            (archivos a procesar, hashes por archivo, resultados de los archivos sin cambios)
+        """
+        if self._processed_repo is None and self._job_repo is None:
+            return filenames, {}, {}
+
+        hashes = {f: sha256_file(os.path.join(directory, f)) for f in filenames}
+        if self._processed_repo is None or (self._force if force is None else force):
+            return filenames, hashes, {}
+
+        procesados = self._processed_repo.find_processed_hashes(
+            hashes.values(), pipeline_version(), facultad, carrera
+        )
+        pendientes = [f for f in filenames if hashes[f] not in procesados]
+        sin_cambios = {
+            f: FileResult(f, STATUS_UNCHANGED)
+            for f in filenames if hashes[f] in procesados
+        }
+        if sin_cambios:
+            print(f"[INFO] {len(sin_cambios)} archivos sin cambios desde la última ejecución; "
+                  f"{len(pendientes)} por procesar")
+        return pendientes, hashes, sin_cambios
+
+    def _open_job(self, directory: str, facultad: str, carrera: str,
+                  job_id: Optional[int] = None) -> Tuple[Optional[Job], Dict[str, JobFile]]:
+        """Abre (o reanuda) el trabajo en la bitácora y retorna su estado por archivo."""
+        if self._job_repo is None:
+            return None, {}
+        job = None
+        if job_id is not None:
+            job = self._job_repo.get(job_id)
+        if job is None:
+            job = self._job_repo.find_unfinished(directory, facultad, carrera)
+        if job is None:
+            job = self._job_repo.create(Job(directory, facultad, carrera))
+            print(f"[INFO] Trabajo #{job.id} creado")
+            return job, {}
+        if job.status != JOB_RUNNING:
+            self._job_repo.update_status(job.id, JOB_RUNNING)
+        return job, {jf.file_name: jf for jf in self._job_repo.get_files(job.id)}
+
+    def _finish_job(self, job: Optional[Job], resultados: Dict[str, FileResult]) -> None:
+        """Cierra el trabajo; queda 'con errores' si algún archivo falló."""
+        if job is None:
+            return
+        fallidos = any(r.status == STATUS_ERROR for r in resultados.values())
+        self._job_repo.update_status(job.id, JOB_FAILED if fallidos else JOB_DONE)
+
+    @staticmethod
+    def _merge_results(filenames: List[str], resultados: Dict[str, FileResult],
+                       previos: Dict[str, FileResult]) -> Dict[str, FileResult]:
+        """Combina resultados procesados y omitidos en el orden del directorio."""
+        return {f: resultados.get(f) or previos[f] for f in filenames}
+
+    def _finish_task(self, task: FileTask, status: str, error: Optional[str] = None) -> None:
+        """
+        Registra el resultado final de un archivo en la bitácora y el registro incremental.
+
+        Solo los archivos procesados por completo (respuestas de IA interpretadas
+        y bibliografía guardada) se registran como procesados: los omitidos y los
+        fallidos se vuelven a intentar en la próxima ejecución.
+        """
+        if status == STATUS_OK:
+            self._record_processed(task, status)
+        etapa = JOURNAL_STORED if status == STATUS_OK else task.journal_stage
+        self._journal(task, etapa, status, error)
+        self._emit(task, EVENT_FILE_FINISHED, status=status, error=error)
+
+    def _record_processed(self, task: FileTask, status: str) -> None:
+        """Registra el archivo como procesado para omitirlo en la próxima ejecución."""
+        if self._processed_repo is None or not task.content_hash:
+            return
+        with self._persist_lock:
+            self._processed_repo.mark_processed(ProcessedFile(
+                file_name=task.file_name,
+                content_hash=task.content_hash,
+                pipeline_version=pipeline_version(),
+                facultad=task.facultad,
+                carrera=task.carrera,
+                status=status,
+            ))
+
+    def _journal(self, task: FileTask, stage: Optional[str], status: str = JOB_RUNNING,
+                 error: Optional[str] = None, payload: Optional[dict] = None) -> None:
+        """Guarda en la bitácora la última etapa completada del archivo y sus resultados."""
+        if self._job_repo is None or task.job_id is None:
             return
+        task.journal_stage = stage
+        with self._persist_lock:
+            self._job_repo.save_file(JobFile(
+                job_id=task.job_id,
+                file_name=task.file_name,
+                content_hash=task.content_hash,
+                stage=stage,
+                status=status,
+                payload=task.journal if payload is None else payload,
+                error=error,
+            ))
+
+    def _emit(self, task: FileTask, kind: str, **data) -> None:
+        """Publica un evento de progreso del archivo; sus errores no detienen el proceso."""
+        if self._event_repo is None or task.job_id is None:
+            return
+        try:
+            self._event_repo.add(JobEvent(task.job_id, kind, task.file_name, data))
+        except Exception as e:
+            print(f"[WARN] No se pudo registrar el evento {kind}: {e}")
+
+    def _emit_subject(self, task: FileTask) -> None:
+        self._emit(task, EVENT_SUBJECT, asignatura=task.asignatura, plan=task.plan,
+                   semestre=task.semestre)
+
+    def _emit_catalog(self, task: FileTask, i: int) -> None:
+        """Evento con el resultado de catálogo de la entrada ``i``."""
+        prepared = task.prepared[i]
+        if prepared.duplicate is not None:
+            resultado = 'duplicado'
+        elif prepared.encontrado_en_primo:
+            resultado = 'encontrado'
+        elif prepared.entry.is_article:
+            resultado = 'artículo'
+        else:
+            resultado = 'no encontrado'
+        self._emit(task, EVENT_CATALOG, index=i + 1, total=len(task.entries),
+                   titulo=prepared.title.normalized_title, resultado=resultado)
+
+    def _list_supported_files(self, directory: str) -> List[str]:
+        """Lista (ordenados) los archivos soportados del directorio."""
+        return sorted(
+            f for f in os.listdir(directory)
+            if f.lower().endswith(self.SUPPORTED_EXTENSIONS)
+        )
+
+    async def execute_async(self, directory: str, facultad: str = 'Ciencias Sociales',
+                            carrera_default: str = 'Trabajo Social',
+                            max_concurrent_files: Optional[int] = None,
+                            force: Optional[bool] = None,
+                            job_id: Optional[int] = None) -> Dict[str, FileResult]:
+        """
+        Versión asíncrona de execute().
+
+        Args:
+            directory: Carpeta con los syllabus
+            facultad: Facultad a la que se asocia la carrera
+            carrera_default: Carrera a la que se asocian las asignaturas
+            max_concurrent_files: Archivos en vuelo simultáneamente
+            force: Reprocesar también los archivos sin cambios
+            job_id: Trabajo a reanudar
+
+        Returns:
+            Diccionario nombre_archivo -> FileResult
+        """
+        if self._async_ai is None or self._async_catalog is None:
+            raise ValueError("execute_async requiere async_ai_provider y async_catalog")
+        if not os.path.exists(directory):
+            print(f"Error: El directorio '{directory}' no existe.")
+            return {}
+
+        todos = self._list_supported_files(directory)
+        limite = asyncio.Semaphore(max_concurrent_files or self._max_concurrent_files)
+
+        # La sesión de BD de esta instancia solo se usa desde este hilo
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='syllabus-db') as db:
+            loop = asyncio.get_running_loop()
+            tasks, previos, job = await loop.run_in_executor(
+                db, self._plan_run, directory, todos, facultad, carrera_default, force, job_id
+            )
+
+            async def procesar(task: FileTask) -> FileResult:
+                async with limite:
+                    return await self._run_file_async(db, task)
+
+            lista = await asyncio.gather(*(procesar(t) for t in tasks))
+            resultados = self._merge_results(
+                todos, {t.file_name: r for t, r in zip(tasks, lista)}, previos
+            )
+            await loop.run_in_executor(db, self._finish_job, job, resultados)
+
+        self._print_summary(resultados)
+        self._print_catalog_cache_stats()
+        return resultados
+
+    def _execute_concurrent(self, tasks: List[FileTask], workers: int) -> Dict[str, FileResult]:
+        """Procesa los archivos en un pool de hilos, un caso de uso por hilo."""
+        resultados: Dict[str, FileResult] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='syllabus') as pool:
+            futures = {pool.submit(self._run_file, None, task): task.file_name for task in tasks}
+            for future in as_completed(futures):
+                resultados[futures[future]] = future.result()
+        # Mantener el orden del directorio en el resumen
+        return {t.file_name: resultados[t.file_name] for t in tasks}
+
+    def _execute_pipeline(self, tasks: List[FileTask]) -> Dict[str, FileResult]:
+        """Procesa los archivos con el pipeline por etapas."""
+        workers = {**DEFAULT_STAGE_WORKERS, **self._stage_workers}
+        resultados: Dict[str, FileResult] = {}
+        lock = threading.Lock()
+
+        def registrar(task: FileTask, status: str, detail: Optional[str] = None) -> None:
+            self._worker()._finish_task(task, status, detail)
+            with lock:
+                resultados[task.file_name] = FileResult(task.file_name, status, detail)
+
+        def on_error(stage: Stage, task: FileTask, error: Exception) -> None:
+            print(f"Error procesando {task.file_name} (etapa {stage.name}): {error}")
+            traceback.print_exc()
+            registrar(task, STATUS_ERROR, str(error))
+
+        def store(task: FileTask) -> None:
+            self._worker()._stage_store(task)
+            registrar(task, STATUS_OK)
+
+        def ai(task: FileTask) -> Optional[FileTask]:
+            if self._worker()._stage_ai(task):
+                return task
+            registrar(task, STATUS_SKIPPED)
+            return None
+
+        stages = [
+            Stage(STAGE_EXTRACT, lambda t: self._worker()._stage_extract(t), workers[STAGE_EXTRACT]),
+            Stage(STAGE_AI, ai, workers[STAGE_AI]),
+            Stage(STAGE_CATALOG, lambda t: self._worker()._stage_catalog(t), workers[STAGE_CATALOG]),
+            Stage(STAGE_STORE, store, workers[STAGE_STORE]),
+        ]
+        print(f"[INFO] Pipeline de {len(tasks)} archivos: "
+              + ", ".join(f"{st.name}={st.workers}" for st in stages))
+
+        StagedPipeline(stages, queue_size=self._queue_size, on_error=on_error).run(tasks)
+        return {t.file_name: resultados[t.file_name] for t in tasks}
+
+    def _worker(self) -> 'ProcessFilesUseCase':
+        """Retorna la instancia del caso de uso asociada al hilo actual."""
+        worker = getattr(self._local, 'use_case', None)
+        if worker is None:
+            worker = self._worker_factory()
+            worker._persist_lock = self._persist_lock
+            self._local.use_case = worker
+        return worker
+
+    def _run_file(self, worker: Optional['ProcessFilesUseCase'], task: FileTask) -> FileResult:
+        """Procesa un archivo capturando errores para el resumen."""
+        worker = worker or self._worker()
+        try:
+            status = STATUS_OK if worker._process_task(task) else STATUS_SKIPPED
+            worker._finish_task(task, status)
+            return FileResult(task.file_name, status)
+        except Exception as e:
+            print(f"Error procesando {task.file_name}: {e}")
+            traceback.print_exc()
+            worker._finish_task(task, STATUS_ERROR, str(e))
+            return FileResult(task.file_name, STATUS_ERROR, str(e))
+
+    async def _run_file_async(self, db: ThreadPoolExecutor, task: FileTask) -> FileResult:
+        """Procesa un archivo en el event loop capturando errores para el resumen."""
+        loop = asyncio.get_running_loop()
+        try:
+            await self._stage_extract_async(task, db)
+            if not await self._stage_ai_async(task, db):
+                status = STATUS_SKIPPED
+            else:
+                await self._stage_catalog_async(task, db)
+                await loop.run_in_executor(db, self._stage_store, task)
+                status = STATUS_OK
+            await loop.run_in_executor(db, self._finish_task, task, status)
+            return FileResult(task.file_name, status)
+        except Exception as e:
+            print(f"Error procesando {task.file_name}: {e}")
+            traceback.print_exc()
+            await loop.run_in_executor(db, self._finish_task, task, STATUS_ERROR, str(e))
+            return FileResult(task.file_name, STATUS_ERROR, str(e))
 
-        for filename in os.listdir(directory):
-            if filename.lower().endswith(self.SUPPORTED_EXTENSIONS):
-                file_path = os.path.join(directory, filename)
-                print(f"Procesando {filename}")
-                try:
-                    self._process_single_file(file_path, facultad, carrera_default)
-                except Exception as e:
-                    import traceback
-                    print(f"Error procesando {filename}: {e}")
-                    traceback.print_exc()
+    @staticmethod
+    def _print_summary(resultados: Dict[str, FileResult]) -> None:
+        """Imprime el resumen de éxitos/fallos por archivo."""
+        if not resultados:
+            return
+        ok = sum(1 for r in resultados.values() if r.status == STATUS_OK)
+        print("=" * 60)
+        print(f"RESUMEN: {ok}/{len(resultados)} archivos procesados correctamente")
+        for r in resultados.values():
+            detalle = f" ({r.detail[:100]})" if r.detail else ''
+            print(f"  [{r.status.upper()}] {r.file_name}{detalle}")
+        print("=" * 60)
+
+    def _print_catalog_cache_stats(self) -> None:
+        """Imprime aciertos/fallos de la caché del catálogo, si el adaptador la tiene."""
+        stats = getattr(self._catalog, 'stats', None)
+        if not callable(stats):
+            return
+        s = stats()
+        print(f"[INFO] Caché de catálogo: {s['hits']} aciertos, {s['misses']} fallos "
+              f"({s['hit_rate']:.0%}), {s['entries']} entradas")
 
     # ------------------------------------------------------------------
     # Métodos privados de dominio
     # ------------------------------------------------------------------
 
-    def _process_single_file(self, file_path: str, facultad: str, carrera_default: str) -> None:
-        """Procesa un único archivo de syllabus."""
+    def _process_single_file(self, file_path: str, facultad: str, carrera_default: str) -> bool:
+        """Procesa un único archivo de syllabus. Retorna False si se omitió."""
+        return self._process_task(
+            FileTask(os.path.basename(file_path), file_path, facultad, carrera_default)
+        )
+
+    def _process_task(self, task: FileTask) -> bool:
+        """Procesa un archivo de punta a punta en el hilo actual. False si se omitió."""
         # 1. Extraer texto
-        texto = self._extractor.extract(file_path)
+        self._stage_extract(task)
 
-        # 2. Detectar asignatura, plan y semestre
-        nombre_asignatura, plan, semestre = self._extract_subject_details(texto)
-        if not nombre_asignatura:
-            print(f"  No se pudo extraer la asignatura de {os.path.basename(file_path)}, omitiendo.")
+        # 2-3. Detectar asignatura, plan y semestre; extraer bibliografía
+        if not self._stage_ai(task):
+            return False
+
+        # 4. Verificar catálogo y almacenar
+        self._stage_catalog(task)
+        self._stage_store(task)
+        return True
+
+    # ------------------------------------------------------------------
+    # Etapas (compartidas por el modo secuencial/concurrente y el pipeline)
+    # ------------------------------------------------------------------
+
+    def _stage_extract(self, task: FileTask) -> FileTask:
+        """Etapa de extracción de texto (CPU: conversión PDF/Word)."""
+        print(f"Procesando {task.file_name}")
+        self._emit(task, EVENT_FILE_STARTED)
+        if task.journal.get('entries'):
+            # Bibliografía ya extraída antes de la interrupción: el texto no se necesita
+            return task
+        task.texto = self._extractor.extract(task.file_path)
+        if not task.journal:
+            self._journal(task, JOURNAL_EXTRACTED)
+        return task
+
+    async def _stage_extract_async(self, task: FileTask, db: ThreadPoolExecutor) -> None:
+        """
+        Versión asíncrona de _stage_extract: solo la conversión del archivo corre
+        en otro hilo; eventos y bitácora se escriben en el hilo ``db``.
+        """
+        loop = asyncio.get_running_loop()
+        print(f"Procesando {task.file_name}")
+        await loop.run_in_executor(db, self._emit, task, EVENT_FILE_STARTED)
+        if task.journal.get('entries'):
             return
+        task.texto = await asyncio.to_thread(self._extractor.extract, task.file_path)
+        if not task.journal:
+            await loop.run_in_executor(db, self._journal, task, JOURNAL_EXTRACTED)
+
+    def _stage_ai(self, task: FileTask) -> bool:
+        """Etapa de IA: asignatura/plan/semestre y bibliografía. False si se omite."""
+        detalles = self._journaled_subject(task)
+        if detalles is None:
+            detalles = self._extract_subject_details(task.texto)
+            self._journal_subject(task, detalles)
+        if not self._accept_subject(task, detalles):
+            return False
+        self._emit_subject(task)
+        if not self._load_journaled_entries(task):
+            task.entries = self._extract_bibliography(task.texto)
+            self._journal_entries(task)
+        self._emit(task, EVENT_ENTRIES, total=len(task.entries))
+        task.texto = None  # liberar memoria: las etapas siguientes no lo usan
+        return True
+
+    async def _stage_ai_async(self, task: FileTask, db: ThreadPoolExecutor) -> bool:
+        """Versión asíncrona de _stage_ai (la bitácora se escribe en el hilo ``db``)."""
+        loop = asyncio.get_running_loop()
+        detalles = self._journaled_subject(task)
+        if detalles is None:
+            detalles = await self._extract_subject_details_async(task.texto)
+            await loop.run_in_executor(db, self._journal_subject, task, detalles)
+        if not self._accept_subject(task, detalles):
+            return False
+        await loop.run_in_executor(db, self._emit_subject, task)
+        if not self._load_journaled_entries(task):
+            task.entries = await self._extract_bibliography_async(task.texto)
+            await loop.run_in_executor(db, self._journal_entries, task)
+        await loop.run_in_executor(
+            db, functools.partial(self._emit, task, EVENT_ENTRIES, total=len(task.entries)))
+        task.texto = None
+        return True
+
+    @staticmethod
+    def _accept_subject(task: FileTask, detalles) -> bool:
+        """Registra asignatura/plan/semestre en la tarea. False si no hay asignatura."""
+        nombre_asignatura, plan, semestre = detalles
+        if not nombre_asignatura:
+            print(f"  No se pudo extraer la asignatura de {task.file_name}, omitiendo.")
+            return False
 
         print(f"    Asignatura: {nombre_asignatura}")
-        print(f"    Carrera (Default): {carrera_default}")
+        print(f"    Carrera (Default): {task.carrera}")
         print(f"    Plan: {plan}")
         print(f"    Semestre: {semestre}")
+        task.asignatura, task.plan, task.semestre = nombre_asignatura, plan, semestre
+        return True
+
+    def _stage_catalog(self, task: FileTask) -> FileTask:
+        """Etapa de catálogo: deduplica y consulta Primo para las entradas nuevas."""
+        task.prepared = self._journaled_prepared(task)
+        for i, entry in enumerate(task.entries):
+            if task.prepared[i] is None:
+                task.prepared[i] = self._prepare_entry(entry)
+                self._emit_catalog(task, i)
+                if self._remember_prepared(task, i):
+                    self._journal(task, JOURNAL_BIBLIOGRAPHY)
+        self._journal(task, JOURNAL_CATALOG)
+        return task
+
+    async def _stage_catalog_async(self, task: FileTask, db: ThreadPoolExecutor) -> None:
+        """Versión asíncrona de _stage_catalog: consulta todas las entradas en paralelo."""
+        loop = asyncio.get_running_loop()
+        task.prepared = self._journaled_prepared(task)
+
+        async def preparar(i: int, entry: BibliographyEntry) -> None:
+            task.prepared[i] = await self._prepare_entry_async(entry, db)
+            await loop.run_in_executor(db, self._emit_catalog, task, i)
+            if self._remember_prepared(task, i):
+                # Copia: el loop sigue modificando la bitácora mientras el hilo db la guarda
+                await loop.run_in_executor(db, self._journal, task, JOURNAL_BIBLIOGRAPHY,
+                                           JOB_RUNNING, None, copy.deepcopy(task.journal))
+
+        # Todas las consultas terminan antes de propagar un error: ninguna escribe
+        # en la bitácora después de que el archivo se cierra con error
+        resultados = await asyncio.gather(*(
+            preparar(i, entry) for i, entry in enumerate(task.entries)
+            if task.prepared[i] is None
+        ), return_exceptions=True)
+        for resultado in resultados:
+            if isinstance(resultado, BaseException):
+                raise resultado
+        await loop.run_in_executor(db, self._journal, task, JOURNAL_CATALOG)
 
-        # 3. Extraer bibliografía
-        entries = self._extract_bibliography(texto)
+    # ------------------------------------------------------------------
+    # Bitácora del trabajo (resultados por etapa para reanudar)
+    # ------------------------------------------------------------------
 
-        # 4. Almacenar
-        self._store_bibliography(nombre_asignatura, carrera_default, entries, facultad, plan, semestre)
+    def _journaling(self, task: FileTask) -> bool:
+        return self._job_repo is not None and task.job_id is not None
+
+    @staticmethod
+    def _journaled_subject(task: FileTask):
+        datos = task.journal.get('subject')
+        if not datos:
+            return None
+        return datos['asignatura'], datos['plan'], datos['semestre']
+
+    def _journal_subject(self, task: FileTask, detalles) -> None:
+        # Sin asignatura no se guarda: al reanudar se vuelve a intentar
+        if not self._journaling(task) or not detalles[0]:
+            return
+        task.journal['subject'] = dict(zip(('asignatura', 'plan', 'semestre'), detalles))
+        self._journal(task, JOURNAL_SUBJECT)
+
+    @staticmethod
+    def _load_journaled_entries(task: FileTask) -> bool:
+        datos = task.journal.get('entries')
+        if not datos:
+            return False
+        task.entries = [BibliographyEntry(**d) for d in datos]
+        return True
+
+    def _journal_entries(self, task: FileTask) -> None:
+        if not self._journaling(task) or not task.entries:
+            return
+        task.journal['entries'] = [asdict(e) for e in task.entries]
+        task.journal['prepared'] = [None] * len(task.entries)
+        self._journal(task, JOURNAL_BIBLIOGRAPHY)
+
+    @staticmethod
+    def _journaled_prepared(task: FileTask) -> List[Optional[PreparedEntry]]:
+        """Entradas ya consultadas en el catálogo antes de la interrupción (None si no)."""
+        prepared: List[Optional[PreparedEntry]] = [None] * len(task.entries)
+        for i, datos in enumerate((task.journal.get('prepared') or [])[:len(task.entries)]):
+            if datos:
+                # El duplicado se vuelve a buscar al persistir
+                prepared[i] = PreparedEntry(
+                    task.entries[i], Title(**datos['title']),
+                    impreso=datos['impreso'], digital=datos['digital'],
+                    encontrado_en_primo=datos['encontrado_en_primo'],
+                )
+        return prepared
+
+    def _remember_prepared(self, task: FileTask, i: int) -> bool:
+        """Agrega a la bitácora el resultado de catálogo de la entrada ``i``."""
+        if not self._journaling(task) or 'prepared' not in task.journal:
+            return False
+        prepared = task.prepared[i]
+        task.journal['prepared'][i] = {
+            'title': asdict(prepared.title),
+            'impreso': prepared.impreso,
+            'digital': prepared.digital,
+            'encontrado_en_primo': prepared.encontrado_en_primo,
+        }
+        return True
+
+    def _stage_store(self, task: FileTask) -> None:
+        """
+        Etapa de persistencia: la bibliografía del syllabus se guarda en una
+        sola transacción (un commit por archivo, rollback completo si falla).
+
+        Las lecturas/escrituras de deduplicación se hacen bajo ``_persist_lock``
+        (compartido entre workers) para que dos archivos procesados en paralelo
+        no creen la misma carrera, asignatura o título. La consulta al catálogo
+        (etapa anterior) queda fuera del lock.
+        """
+        asignatura = self._resolve_subject(task.asignatura, task.carrera, task.facultad,
+                                           task.plan, task.semestre)
+        nuevos, duplicados = self._persist_entries(task.prepared, asignatura)
+        self._emit(task, EVENT_STORED, asignatura=asignatura.name, nuevos=nuevos,
+                   duplicados=duplicados)
 
     @staticmethod
     def _parse_llm_json(raw: str) -> dict:
@@ -195,28 +950,37 @@ class ProcessFilesUseCase:
 
         raise ValueError(f"No se pudo parsear JSON de la respuesta LLM: {raw[:200]!r}")
 
-    def _extract_subject_details(self, texto: str):
-        """Detecta asignatura, plan y semestre del encabezado del documento."""
-        texto_inicio = texto[:3000]
-        prompt = f"""
-Extrae la siguiente información del encabezado o primera página del syllabus:
-1. Asignatura (Nombre de la materia)
-2. Plan (Año del plan de estudios, ej: "2019", "2024")
-3. Semestre (Número de semestre, ej: "4°", "I", "Segundo")
+    def _subject_prompt(self, texto: str) -> str:
+        """Construye el prompt de detección de asignatura/plan/semestre."""
+        return SUBJECT_PROMPT_TEMPLATE.format(texto_inicio=texto[:3000])
 
-Texto:
-{texto_inicio}
+    @classmethod
+    def _parse_subject_response(cls, resultado: str):
+        """Interpreta la respuesta del LLM: (asignatura, plan, semestre)."""
+        datos = cls._parse_llm_json(resultado)
+        return datos.get('subject'), datos.get('plan'), datos.get('semester')
 
-Retorna SOLO el siguiente JSON sin texto adicional:
-{{"subject": "...", "plan": "...", "semester": "..."}}
-"""
+    def _extract_subject_details(self, texto: str):
+        """Detecta asignatura, plan y semestre del encabezado del documento."""
+        prompt = self._subject_prompt(texto)
         try:
             resultado, _ = self._ai.generate_with_fallback(prompt, max_tokens=50000, temperature=0.1)
-            datos = self._parse_llm_json(resultado)
-            return datos.get('subject'), datos.get('plan'), datos.get('semester')
+            return self._parse_subject_response(resultado)
+        except Exception as e:
+            # Un fallo de la IA no es "sin asignatura": el archivo queda con error
+            print(f"Error extrayendo detalles de asignatura: {e}")
+            raise
+
+    async def _extract_subject_details_async(self, texto: str):
+        """Versión asíncrona de _extract_subject_details."""
+        prompt = self._subject_prompt(texto)
+        try:
+            resultado, _ = await self._async_ai.generate_with_fallback(
+                prompt, max_tokens=50000, temperature=0.1)
+            return self._parse_subject_response(resultado)
         except Exception as e:
             print(f"Error extrayendo detalles de asignatura: {e}")
-            return None, None, None
+            raise
 
     def _extract_bibliography_section(self, texto: str) -> str:
         """Extrae la sección de bibliografía del texto usando regex."""
@@ -231,82 +995,71 @@ Retorna SOLO el siguiente JSON sin texto adicional:
         largo = len(texto)
         return texto[int(largo * 0.8):]
 
-    def _extract_bibliography(self, texto: str) -> List[BibliographyEntry]:
-        """Extrae todas las referencias bibliográficas usando IA (Gemini)."""
+    def _bibliography_prompt(self, texto: str) -> str:
+        """Construye el prompt de extracción de bibliografía."""
         bibliografia_texto = self._extract_bibliography_section(texto)
         print(f"  -> Texto de bibliografía extraído: {len(bibliografia_texto)} caracteres")
+        return BIBLIOGRAPHY_PROMPT_TEMPLATE.format(bibliografia_texto=bibliografia_texto)
 
-        prompt = f"""Eres un experto en bibliometría y extracción de datos estructurados.
-Tu misión es extraer ABSOLUTAMENTE TODAS las referencias bibliográficas presentes en el texto del syllabus universitario adjunto.
+    @classmethod
+    def _parse_bibliography_response(cls, resultado: str) -> List[BibliographyEntry]:
+        """Convierte la respuesta JSON del LLM en entradas bibliográficas."""
+        # Debug: mostrar longitud y los primeros 300 chars de la respuesta
+        print(f"  -> Longitud respuesta Gemini: {len(resultado)} caracteres")
+        print(f"  -> Respuesta Gemini (primeros 300 chars): {resultado[:300]!r}")
 
-INSTRUCCIONES CRÍTICAS DE EXHAUSTIVIDAD:
-1. EXTRAE LA TOTALIDAD: En el texto suele haber entre 20 y 40 referencias bibliográficas. DEBES EXTRAERLAS TODAS, una por una, desde la primera hasta la última sin excepción. ESTÁ ESTRICTAMENTE PROHIBIDO OMITIR, RESUMIR, ACORTAR O TRUNCAR LA LISTA.
-2. Clasificación:
-   - Si la referencia está bajo "Bibliografía básica", "Obligatoria" o similar -> colócala en el array "basic".
-   - Si está bajo "Bibliografía complementaria", "Sugerida", "Recomendada" o similar -> colócala en el array "complementary".
-   - Si no hay división clara, coloca todas en "basic".
-3. Tipo (type):
-   - Si tiene URL, enlace web o dice "Disponible en http..." -> type="article".
-   - Si es libro, manual o no tiene enlace -> type="book".
-4. Capítulos: Si es un capítulo o artículo dentro de una obra o compilación (ej. "En Viveros, L. (coord.)..."), pon el título de la compilación/libro en 'title' y el del capítulo/artículo en 'chapter_title'.
-5. FORMATO JSON ESTRICTO:
-   - Responde ÚNICAMENTE con un objeto JSON válido.
-   - Escapa adecuadamente las comillas dobles dentro de los textos o reemplázalas por comillas simples (' ').
-   - NO incluyas saltos de línea literales dentro de las cadenas de texto JSON.
+        datos = cls._parse_llm_json(resultado)
+        print(f"  -> Tipo de datos parseados: {type(datos).__name__}")
 
-ESTRUCTURA DE RESPUESTA REQUERIDA (Debes llenar los arreglos con TODAS las referencias encontradas en el texto):
-{{
-  "basic": [
-    {{"author": "Apellido, Iniciales", "normalized_author": "Nombre Apellido", "year": "2020", "title": "Título original", "normalized_title": "Título En Title Case", "publisher": "Editorial o ciudad", "url": "", "type": "book", "chapter_title": "", "language": "Español"}}
-  ],
-  "complementary": [
-    {{"author": "Apellido, Iniciales", "normalized_author": "Nombre Apellido", "year": "2021", "title": "Título original", "normalized_title": "Título En Title Case", "publisher": "Editorial", "url": "http://...", "type": "article", "chapter_title": "", "language": "Español"}}
-  ]
-}}
+        # --- Normalizar la estructura de datos ---
+        entries_by_type = cls._normalize_bibliography_structure(datos)
 
-TEXTO DE BIBLIOGRAFÍA A PROCESAR:
-{bibliografia_texto}
-"""
+        entries: List[BibliographyEntry] = []
+        for bib_type, lista in entries_by_type.items():
+            for item in lista:
+                if not isinstance(item, dict):
+                    continue
+                entries.append(BibliographyEntry(
+                    author=item.get('author', ''),
+                    title=item.get('title', ''),
+                    year=item.get('year'),
+                    publisher=item.get('publisher'),
+                    url=item.get('url'),
+                    chapter_title=item.get('chapter_title'),
+                    type=item.get('type', 'book'),
+                    bib_type=bib_type,
+                    normalized_author=item.get('normalized_author', item.get('author', '')),
+                    normalized_title=item.get('normalized_title', item.get('title', '')),
+                    language=item.get('language', 'Español'),
+                ))
+
+        num_basic = sum(1 for e in entries if e.bib_type == 'basic')
+        num_complementary = sum(1 for e in entries if e.bib_type == 'complementary')
+        print(f"  -> Títulos detectados: {num_basic} básicos, {num_complementary} complementarios")
+        return entries
+
+    def _extract_bibliography(self, texto: str) -> List[BibliographyEntry]:
+        """Extrae todas las referencias bibliográficas usando IA (Gemini)."""
+        prompt = self._bibliography_prompt(texto)
         try:
             print("  -> Usando Gemini para detección de títulos (Contexto completo)...")
             resultado = self._ai.generate_with_provider('gemini', prompt, max_tokens=50000, temperature=0.1)
+            return self._parse_bibliography_response(resultado)
+        except Exception as e:
+            # Un fallo de la IA no es "bibliografía vacía": el archivo queda con error
+            print(f"Error extrayendo bibliografía con Gemini: {e}")
+            raise
 
-            # Debug: mostrar longitud y los primeros 300 chars de la respuesta
-            print(f"  -> Longitud respuesta Gemini: {len(resultado)} caracteres")
-            print(f"  -> Respuesta Gemini (primeros 300 chars): {resultado[:300]!r}")
-
-            datos = self._parse_llm_json(resultado)
-            print(f"  -> Tipo de datos parseados: {type(datos).__name__}")
-
-            # --- Normalizar la estructura de datos ---
-            entries_by_type = self._normalize_bibliography_structure(datos)
-
-            entries: List[BibliographyEntry] = []
-            for bib_type, lista in entries_by_type.items():
-                for item in lista:
-                    if not isinstance(item, dict):
-                        continue
-                    entries.append(BibliographyEntry(
-                        author=item.get('author', ''),
-                        title=item.get('title', ''),
-                        year=item.get('year'),
-                        publisher=item.get('publisher'),
-                        url=item.get('url'),
-                        chapter_title=item.get('chapter_title'),
-                        type=item.get('type', 'book'),
-                        bib_type=bib_type,
-                        normalized_author=item.get('normalized_author', item.get('author', '')),
-                        normalized_title=item.get('normalized_title', item.get('title', '')),
-                        language=item.get('language', 'Español'),
-                    ))
-
-            num_basic = sum(1 for e in entries if e.bib_type == 'basic')
-            num_complementary = sum(1 for e in entries if e.bib_type == 'complementary')
-            print(f"  -> Títulos detectados: {num_basic} básicos, {num_complementary} complementarios")
-            return entries
+    async def _extract_bibliography_async(self, texto: str) -> List[BibliographyEntry]:
+        """Versión asíncrona de _extract_bibliography."""
+        prompt = self._bibliography_prompt(texto)
+        try:
+            resultado = await self._async_ai.generate_with_provider(
+                'gemini', prompt, max_tokens=50000, temperature=0.1)
+            return self._parse_bibliography_response(resultado)
         except Exception as e:
             print(f"Error extrayendo bibliografía con Gemini: {e}")
-            return []
+            raise
 
     @staticmethod
     def _normalize_bibliography_structure(datos) -> dict:
@@ -396,124 +1149,207 @@ TEXTO DE BIBLIOGRAFÍA A PROCESAR:
             print("  -> Artículo web detectado, no se busca en Primo")
             return False, True, None
 
-        search_term = f"{title.normalized_title} {title.normalized_author}"
-        time.sleep(3)
+        search_term = self._catalog_search_term(title)
 
         try:
             detalles = self._catalog.search(search_term)
-            if detalles and detalles.get('titulo') and detalles.get('autor'):
-                print(f"  -> ✓ Encontrado en Primo")
-                print(f"     Título de Primo: {detalles['titulo'][:80]}...")
-
-                print("  -> Normalizando datos de Primo...")
-                norm = self._normalize_entry(detalles['autor'], detalles['titulo'])
-
-                detalles_norm = {
-                    'autor_normalizado': norm['normalized_author'],
-                    'titulo_normalizado': norm['normalized_title'],
-                    'autor_original': detalles['autor'],
-                    'titulo_original': detalles['titulo'],
-                    'editor': detalles.get('editor'),
-                    'fecha_creacion': detalles.get('fecha_creacion'),
-                    'edicion': detalles.get('edicion'),
-                    'formato': detalles.get('formato'),
-                    'disponibilidad_fisica': detalles.get('disponibilidad_fisica'),
-                    'disponibilidad_online': detalles.get('disponibilidad_online'),
-                }
-
-                formato = (detalles.get('formato') or '').lower()
-                disponible_digital = any(k in formato for k in ('online', 'digital', 'electronic'))
-                return True, disponible_digital, detalles_norm
-            else:
-                print("  -> ✗ No encontrado en Primo o datos incompletos")
-                return False, False, None
         except Exception as e:
+            # Un catálogo caído no es "no encontrado": el archivo queda con error
             print(f"  -> ✗ Error al buscar en Primo: {str(e)[:100]}")
-            return False, False, None
+            raise
+        return self._interpret_catalog_result(detalles)
 
-    def _store_bibliography(self, nombre_asignatura: str, nombre_carrera: str,
-                            entries: List[BibliographyEntry], facultad: str,
-                            plan: str, semestre: str) -> None:
-        """Persiste la bibliografía usando los repositorios."""
-        # Obtener / crear carrera
-        carrera = self._carrera_repo.get_or_create(nombre_carrera, facultad)
-
-        # Obtener / crear asignatura
-        asignatura = self._asignatura_repo.get_by_name_and_career(nombre_asignatura, carrera.id)
-        if not asignatura:
-            asignatura = self._asignatura_repo.get_or_create(nombre_asignatura, carrera)
+    async def _check_catalog_availability_async(self, title: Title, is_article: bool):
+        """Versión asíncrona de _check_catalog_availability."""
+        if is_article:
+            print("  -> Artículo web detectado, no se busca en Primo")
+            return False, True, None
+
+        search_term = self._catalog_search_term(title)
+
+        try:
+            detalles = await self._async_catalog.search(search_term)
+        except Exception as e:
+            print(f"  -> ✗ Error al buscar en Primo: {str(e)[:100]}")
+            raise
+        return self._interpret_catalog_result(detalles)
+
+    @staticmethod
+    def _catalog_search_term(title: Title) -> str:
+        """Término de búsqueda en el catálogo: título + autor normalizados."""
+        return f"{title.normalized_title} {title.normalized_author}"
+
+    def _interpret_catalog_result(self, detalles: Optional[dict]):
+        """Traduce el resultado del catálogo a (impreso, digital, detalles_normalizados)."""
+        if detalles and detalles.get('titulo') and detalles.get('autor'):
+            print(f"  -> ✓ Encontrado en Primo")
+            print(f"     Título de Primo: {detalles['titulo'][:80]}...")
+
+            print("  -> Normalizando datos de Primo...")
+            norm = self._normalize_entry(detalles['autor'], detalles['titulo'])
+
+            detalles_norm = {
+                'autor_normalizado': norm['normalized_author'],
+                'titulo_normalizado': norm['normalized_title'],
+                'autor_original': detalles['autor'],
+                'titulo_original': detalles['titulo'],
+                'editor': detalles.get('editor'),
+                'fecha_creacion': detalles.get('fecha_creacion'),
+                'edicion': detalles.get('edicion'),
+                'formato': detalles.get('formato'),
+                'lugar': detalles.get('lugar'),
+                'disponibilidad_fisica': detalles.get('disponibilidad_fisica'),
+                'disponibilidad_online': detalles.get('disponibilidad_online'),
+            }
+
+            formato = (detalles.get('formato') or '').lower()
+            disponible_digital = any(k in formato for k in ('online', 'digital', 'electronic'))
+            return True, disponible_digital, detalles_norm
         else:
-            if plan or semestre:
-                self._asignatura_repo.update_plan_and_semester(asignatura, plan, semestre)
-
-        # Procesar cada entrada
-        for entry in entries:
-            print(f"Normalizando: {entry.author} - {entry.title}")
-            if hasattr(entry, 'normalized_author') and entry.normalized_author and entry.normalized_title:
-                norm = {
-                    "normalized_author": entry.normalized_author,
-                    "normalized_title": entry.normalized_title,
-                    "language": getattr(entry, 'language', 'Español') or 'Español'
-                }
+            print("  -> ✗ No encontrado en Primo o datos incompletos")
+            return False, False, None
+
+    def _resolve_subject(self, nombre_asignatura: str, nombre_carrera: str, facultad: str,
+                         plan: str, semestre: str):
+        """Obtiene o crea la carrera y la asignatura, actualizando plan/semestre."""
+        with self._persist_lock:
+            # Obtener / crear carrera
+            carrera = self._carrera_repo.get_or_create(nombre_carrera, facultad)
+
+            # Obtener / crear asignatura
+            asignatura = self._asignatura_repo.get_by_name_and_career(nombre_asignatura, carrera.id)
+            if not asignatura:
+                asignatura = self._asignatura_repo.get_or_create(nombre_asignatura, carrera)
             else:
-                norm = self._normalize_entry(entry.author, entry.title)
+                if plan or semestre:
+                    self._asignatura_repo.update_plan_and_semester(asignatura, plan, semestre)
+            return asignatura
+
+    def _build_title(self, entry: BibliographyEntry) -> Title:
+        """Construye el Título (aún sin persistir) a partir de la entrada extraída."""
+        print(f"Normalizando: {entry.author} - {entry.title}")
+        if hasattr(entry, 'normalized_author') and entry.normalized_author and entry.normalized_title:
+            norm = {
+                "normalized_author": entry.normalized_author,
+                "normalized_title": entry.normalized_title,
+                "language": getattr(entry, 'language', 'Español') or 'Español'
+            }
+        else:
+            norm = self._normalize_entry(entry.author, entry.title)
+
+        url_articulo = entry.url
+        return Title(
+            normalized_author=norm['normalized_author'],
+            normalized_title=norm['normalized_title'],
+            original_author=entry.author,
+            original_title=entry.title,
+            year=entry.year,
+            publisher=entry.publisher if not entry.is_article else url_articulo,
+            type_bib=entry.bib_type,
+            chapter=entry.chapter_title,
+            language=norm.get('language', 'Español'),
+        )
+
+    def _find_duplicate(self, title: Title) -> Optional[Title]:
+        """Busca un título ya guardado con el mismo autor y título normalizados."""
+        with self._persist_lock:
+            return self._titulo_repo.find_duplicate(title.normalized_author, title.normalized_title)
+
+    def _prepare_entry(self, entry: BibliographyEntry) -> PreparedEntry:
+        """Deduplica una entrada y, si es nueva, consulta el catálogo (sin escribir)."""
+        nuevo_titulo = self._build_title(entry)
+        titulo_existente = self._find_duplicate(nuevo_titulo)
+        if titulo_existente:
+            return PreparedEntry(entry, nuevo_titulo, duplicate=titulo_existente)
+
+        impreso, digital, detalles_primo = self._check_catalog_availability(
+            nuevo_titulo, entry.is_article
+        )
+        return self._prepared_from_catalog(entry, nuevo_titulo, impreso, digital, detalles_primo)
+
+    async def _prepare_entry_async(self, entry: BibliographyEntry,
+                                   db: ThreadPoolExecutor) -> PreparedEntry:
+        """Versión asíncrona de _prepare_entry (la BD se consulta en el hilo ``db``)."""
+        nuevo_titulo = self._build_title(entry)
+        loop = asyncio.get_running_loop()
+        titulo_existente = await loop.run_in_executor(db, self._find_duplicate, nuevo_titulo)
+        if titulo_existente:
+            return PreparedEntry(entry, nuevo_titulo, duplicate=titulo_existente)
+
+        impreso, digital, detalles_primo = await self._check_catalog_availability_async(
+            nuevo_titulo, entry.is_article
+        )
+        return self._prepared_from_catalog(entry, nuevo_titulo, impreso, digital, detalles_primo)
+
+    def _prepared_from_catalog(self, entry: BibliographyEntry, titulo: Title, impreso: bool,
+                               digital: bool, detalles_primo: Optional[dict]) -> PreparedEntry:
+        """Arma la entrada preparada con el resultado de la consulta al catálogo."""
+        if detalles_primo:
+            self._apply_catalog_details(titulo, detalles_primo)
+        return PreparedEntry(entry, titulo, impreso=impreso, digital=digital,
+                             encontrado_en_primo=detalles_primo is not None)
+
+    def _persist_entries(self, prepared_entries: List[PreparedEntry],
+                         asignatura) -> Tuple[int, int]:
+        """
+        Guarda las entradas preparadas de un syllabus en una sola transacción:
+        los títulos nuevos con su adquisición y el vínculo de todos (nuevos y
+        duplicados) con la asignatura. Retorna (nuevos, duplicados).
+        """
+        with self._persist_lock:
+            nuevos, existentes, en_lote = [], [], set()
+            for prepared in prepared_entries:
+                titulo_existente = prepared.duplicate
+                if titulo_existente is None:
+                    # Otro worker pudo guardar el mismo título mientras se consultaba el catálogo
+                    titulo_existente = self._find_duplicate(prepared.title)
+                if titulo_existente:
+                    print(f"    [DUPLICADO] ID: {titulo_existente.id}")
+                    existentes.append(titulo_existente)
+                    continue
 
-            titulo_existente = self._titulo_repo.find_duplicate(
-                norm['normalized_author'], norm['normalized_title']
-            )
+                clave = dedup_key(prepared.title.normalized_author, prepared.title.normalized_title)
+                if clave is not None and clave in en_lote:
+                    print("    [DUPLICADO] Repetido en el mismo syllabus")
+                    continue
+                en_lote.add(clave)
 
-            if titulo_existente:
-                print(f"    [DUPLICADO] ID: {titulo_existente.id}")
-                self._titulo_repo.link_to_subject(titulo_existente, asignatura)
-            else:
                 print("    [NUEVO] Creando entrada...")
-                url_articulo = entry.url
-                nuevo_titulo = Title(
-                    normalized_author=norm['normalized_author'],
-                    normalized_title=norm['normalized_title'],
-                    original_author=entry.author,
-                    original_title=entry.title,
-                    year=entry.year,
-                    publisher=entry.publisher if not entry.is_article else url_articulo,
-                    type_bib=entry.bib_type,
-                    chapter=entry.chapter_title,
-                    language=norm.get('language', 'Español'),
-                )
-                nuevo_titulo = self._titulo_repo.save(nuevo_titulo)
+                nuevos.append((prepared.title, self._new_acquisition(prepared)))
 
-                impreso, digital, detalles_primo = self._check_catalog_availability(
-                    nuevo_titulo, entry.is_article
-                )
-                encontrado_en_primo = detalles_primo is not None
-
-                if detalles_primo:
-                    nuevo_titulo.normalized_author = detalles_primo['autor_normalizado']
-                    nuevo_titulo.normalized_title = detalles_primo['titulo_normalizado']
-                    nuevo_titulo.original_author = detalles_primo['autor_original']
-                    nuevo_titulo.original_title = detalles_primo['titulo_original']
-                    if detalles_primo.get('editor'):
-                        nuevo_titulo.publisher = detalles_primo['editor']
-                    if detalles_primo.get('fecha_creacion'):
-                        nuevo_titulo.year = detalles_primo['fecha_creacion']
-                    if detalles_primo.get('edicion'):
-                        nuevo_titulo.edition = detalles_primo['edicion']
-                    if detalles_primo.get('formato'):
-                        nuevo_titulo.format = detalles_primo['formato']
-                    if detalles_primo.get('lugar'):
-                        nuevo_titulo.place = detalles_primo['lugar']
-                    if detalles_primo.get('disponibilidad_fisica'):
-                        nuevo_titulo.physical_availability = detalles_primo['disponibilidad_fisica']
-                    nuevo_titulo.online_availability = (
-                        detalles_primo.get('disponibilidad_online')
-                        or ("Disponible en catálogo Primo" if encontrado_en_primo else None)
-                    )
-                    self._titulo_repo.update(nuevo_titulo)
-
-                adquisicion = Acquisition(
-                    title_id=nuevo_titulo.id,
-                    status='disponible' if (impreso or digital or encontrado_en_primo) else 'no disponible',
-                    available_printed=impreso,
-                    available_digital=digital or encontrado_en_primo,
-                )
-                self._adquisicion_repo.save(adquisicion)
-                self._titulo_repo.link_to_subject(nuevo_titulo, asignatura)
+            self._titulo_repo.save_bibliography(asignatura, nuevos, existentes)
+            return len(nuevos), len(prepared_entries) - len(nuevos)
+
+    @staticmethod
+    def _new_acquisition(prepared: PreparedEntry) -> Acquisition:
+        """Adquisición de un título nuevo según su disponibilidad en el catálogo."""
+        disponible = prepared.impreso or prepared.digital or prepared.encontrado_en_primo
+        return Acquisition(
+            title_id=None,
+            status='disponible' if disponible else 'no disponible',
+            available_printed=prepared.impreso,
+            available_digital=prepared.digital or prepared.encontrado_en_primo,
+        )
+
+    @staticmethod
+    def _apply_catalog_details(titulo: Title, detalles_primo: dict) -> None:
+        """Completa el título con los datos normalizados obtenidos del catálogo."""
+        titulo.normalized_author = detalles_primo['autor_normalizado']
+        titulo.normalized_title = detalles_primo['titulo_normalizado']
+        titulo.original_author = detalles_primo['autor_original']
+        titulo.original_title = detalles_primo['titulo_original']
+        if detalles_primo.get('editor'):
+            titulo.publisher = detalles_primo['editor']
+        if detalles_primo.get('fecha_creacion'):
+            titulo.year = detalles_primo['fecha_creacion']
+        if detalles_primo.get('edicion'):
+            titulo.edition = detalles_primo['edicion']
+        if detalles_primo.get('formato'):
+            titulo.format = detalles_primo['formato']
+        if detalles_primo.get('lugar'):
+            titulo.place = detalles_primo['lugar']
+        if detalles_primo.get('disponibilidad_fisica'):
+            titulo.physical_availability = detalles_primo['disponibilidad_fisica']
+        titulo.online_availability = (
+            detalles_primo.get('disponibilidad_online') or "Disponible en catálogo Primo"
+        )
@@ -0,0 +1,64 @@
+"""
+Caso de uso: QueryReportUseCase
+Consulta el reporte consolidado por páginas, con orden y filtros resueltos en
+la base de datos (sin leer el CSV generado).
+Solo depende de puertos, no de implementaciones concretas.
+"""
+from typing import Dict, List
+
+from src.domain.entities.report_row import ReportQuery
+from src.domain.ports.repository_ports import ReportRepositoryPort
+from src.domain.use_cases.generate_report_use_case import GenerateReportUseCase, REPORT_HEADERS
+
+# Columnas del reporte por las que se puede ordenar → clave de orden
+SORTABLE_HEADERS = {
+    'Facultad': 'facultad',
+    'Carrera ': 'carrera',
+    'Asignatura ': 'asignatura',
+    'Plan (año)': 'plan',
+    'Semestre': 'semestre',
+    'Autor (Apellido, Nombre) ': 'autor',
+    'Título del libro/revistas (Información completa del título)': 'titulo',
+    'Año de Publicación': 'anio',
+    'Título asociado a carrera': 'conteo_carrera',
+    'Título asociado a asignatura ': 'conteo_global',
+}
+
+
+class QueryReportUseCase:
+    """
+    Retorna una página del reporte con las mismas columnas del CSV, el total
+    de filas que cumplen los filtros y las columnas por las que se puede ordenar.
+    """
+
+    def __init__(self, report_repo: ReportRepositoryPort):
+        self._report_repo = report_repo
+
+    def execute(self, query: ReportQuery) -> Dict:
+        """
+        Args:
+            query: Página, orden y filtros
+
+        Returns:
+            dict serializable a JSON
+
+        Raises:
+            ValueError: Si la página, el orden o el filtro de disponibilidad no son válidos
+        """
+        query.validate()
+        pagina = self._report_repo.find_report_page(query)
+        return {
+            'headers': REPORT_HEADERS,
+            'rows': [GenerateReportUseCase.row_to_dict(fila) for fila in pagina.rows],
+            'total': pagina.total,
+            'page': pagina.page,
+            'page_size': pagina.page_size,
+            'pages': pagina.pages,
+            'sort': query.sort,
+            'order': 'desc' if query.descending else 'asc',
+            'sortable': SORTABLE_HEADERS,
+        }
+
+    def list_careers(self) -> Dict[str, List[str]]:
+        """Opciones de los filtros: carreras con filas en el reporte por facultad."""
+        return self._report_repo.list_careers_by_faculty()
@@ -0,0 +1,107 @@
+"""
+Pipeline por etapas (productor/consumidor) con colas acotadas.
+
+Cada etapa tiene su propio pool de hilos y lee de una cola de entrada con
+tamaño máximo. Cuando una etapa lenta llena su cola, los ``put`` de la etapa
+anterior se bloquean (backpressure) en lugar de acumular trabajo en memoria.
+
+No depende de ninguna tecnología de infraestructura.
+"""
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+
+_FIN = object()  # Centinela de fin de flujo
+
+
+@dataclass
+class Stage:
+    """
+    Etapa del pipeline.
+
+    Attributes:
+        name: Nombre de la etapa (para logs y errores)
+        handler: Función que recibe un ítem y retorna el ítem para la etapa
+                 siguiente, o None para descartarlo
+        workers: Número de hilos de la etapa
+    """
+    name: str
+    handler: Callable[[Any], Any]
+    workers: int = 1
+
+
+class StagedPipeline:
+    """Ejecuta una secuencia de etapas conectadas por colas acotadas."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 8,
+                 on_error: Optional[Callable[[Stage, Any, Exception], None]] = None):
+        """
+        Args:
+            stages: Etapas en orden de ejecución
+            queue_size: Capacidad de la cola de entrada de cada etapa
+            on_error: Callback invocado cuando un handler lanza una excepción;
+                      el ítem se descarta y el pipeline continúa
+        """
+        if not stages:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        self._stages = stages
+        self._queue_size = max(1, queue_size)
+        self._on_error = on_error
+
+    def run(self, items: Iterable[Any]) -> None:
+        """Procesa todos los ítems y retorna cuando todas las etapas terminaron."""
+        colas = [queue.Queue(maxsize=self._queue_size) for _ in self._stages]
+        hilos = []
+
+        for idx, stage in enumerate(self._stages):
+            salida = colas[idx + 1] if idx + 1 < len(colas) else None
+            siguiente = self._stages[idx + 1] if salida is not None else None
+            restantes = [max(1, stage.workers)]
+            lock = threading.Lock()
+            for n in range(max(1, stage.workers)):
+                hilo = threading.Thread(
+                    target=self._stage_loop,
+                    args=(stage, colas[idx], salida, siguiente, restantes, lock),
+                    name=f'pipeline-{stage.name}-{n}',
+                    daemon=True,
+                )
+                hilo.start()
+                hilos.append(hilo)
+
+        # El productor corre en el hilo llamador: se bloquea si la primera etapa está llena
+        primera = colas[0]
+        try:
+            for item in items:
+                primera.put(item)
+        finally:
+            for _ in range(max(1, self._stages[0].workers)):
+                primera.put(_FIN)
+
+        for hilo in hilos:
+            hilo.join()
+
+    def _stage_loop(self, stage: Stage, entrada: queue.Queue, salida: Optional[queue.Queue],
+                    siguiente: Optional[Stage], restantes: List[int], lock: threading.Lock) -> None:
+        """Bucle de un worker de la etapa."""
+        while True:
+            item = entrada.get()
+            if item is _FIN:
+                break
+            try:
+                resultado = stage.handler(item)
+            except Exception as e:
+                if self._on_error:
+                    self._on_error(stage, item, e)
+                continue
+            if resultado is not None and salida is not None:
+                salida.put(resultado)
+
+        # El último worker en terminar propaga el fin a la etapa siguiente
+        with lock:
+            restantes[0] -= 1
+            ultimo = restantes[0] == 0
+        if ultimo and salida is not None:
+            for _ in range(max(1, siguiente.workers)):
+                salida.put(_FIN)
@@ -0,0 +1,195 @@
+"""
+Caso de uso: SubmitProcessingJobUseCase
+Encola el procesamiento de un directorio de syllabus y la generación del
+reporte como un trabajo en segundo plano, y consulta su estado.
+Solo depende de puertos, no de implementaciones concretas.
+"""
+import os
+import shutil
+from typing import Callable, Dict, List, Optional
+
+from src.domain.entities.job import (
+    Job, JobEvent, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED, EVENT_JOB_FINISHED,
+)
+from src.domain.entities.report_row import job_report_scope
+from src.domain.ports.job_queue_port import JobQueuePort
+from src.domain.ports.repository_ports import JobRepositoryPort, JobEventRepositoryPort
+from src.domain.use_cases.generate_report_use_case import GenerateReportUseCase
+from src.domain.use_cases.process_files_use_case import ProcessFilesUseCase, STATUS_ERROR
+
+
+class SubmitProcessingJobUseCase:
+    """
+    Registra el trabajo en la bitácora (estado 'en cola'), lo entrega a la cola
+    y retorna de inmediato. El trabajo corre en un hilo de la cola con sus
+    propias instancias de los casos de uso (y sus propias sesiones de BD),
+    construidas con las fábricas entregadas.
+
+    Si se entrega ``event_repo``, al terminar se publica un evento
+    'job_finished' que cierra el flujo de progreso en vivo.
+
+    La cola vive en la memoria del proceso: cada trabajo guarda ``worker_id``
+    y ``recover_orphaned_jobs()`` retoma (desde su bitácora) los trabajos
+    cuyo proceso ya no existe según ``worker_alive``.
+    """
+
+    def __init__(
+        self,
+        job_repo_factory: Callable[[], JobRepositoryPort],
+        job_queue: JobQueuePort,
+        process_factory: Callable[[], ProcessFilesUseCase],
+        report_factory: Callable[[], GenerateReportUseCase],
+        event_repo: Optional[JobEventRepositoryPort] = None,
+        worker_id: Optional[str] = None,
+        worker_alive: Optional[Callable[[Optional[str]], bool]] = None,
+        remove_directory: bool = False,
+    ):
+        """
+        Args:
+            worker_id: Id del proceso actual (se guarda en cada trabajo encolado)
+            worker_alive: Indica si el proceso dueño de un trabajo sigue vivo
+            remove_directory: Eliminar el directorio del trabajo al terminar
+                              (subidas web en un directorio temporal)
+        """
+        self._job_repo_factory = job_repo_factory
+        self._queue = job_queue
+        self._process_factory = process_factory
+        self._report_factory = report_factory
+        self._event_repo = event_repo
+        self._worker_id = worker_id
+        self._worker_alive = worker_alive
+        self._remove_directory = remove_directory
+
+    def execute(self, directory: str, facultad: str, carrera: str) -> Job:
+        """Encola el procesamiento del directorio y retorna el trabajo creado."""
+        job = self._job_repo_factory().create(
+            Job(directory, facultad, carrera, status=JOB_QUEUED, worker=self._worker_id)
+        )
+        self._queue.submit(self._run, job.id)
+        print(f"[INFO] Trabajo #{job.id} en cola")
+        return job
+
+    def recover_orphaned_jobs(self) -> List[int]:
+        """
+        Retoma los trabajos 'en cola' o 'en curso' cuyo proceso se detuvo.
+
+        Cada trabajo lo toma un solo proceso (asignación atómica). Se reencola
+        y continúa desde su bitácora; si sus archivos ya no existen se marca
+        con errores. Los trabajos sin proceso dueño (CLI) no se tocan.
+
+        Returns:
+            Ids de los trabajos reencolados
+        """
+        if self._worker_id is None or self._worker_alive is None:
+            return []
+        job_repo = self._job_repo_factory()
+        reencolados = []
+        for job in job_repo.list_unfinished():
+            if not job.worker or self._worker_alive(job.worker):
+                continue
+            if not job_repo.claim(job.id, self._worker_id, job.worker):
+                continue  # otro proceso lo tomó primero
+            if not os.path.isdir(job.directory):
+                error = 'El trabajo se interrumpió y sus archivos subidos ya no existen'
+                print(f"[WARN] Trabajo #{job.id}: {error}")
+                job_repo.update_status(job.id, JOB_FAILED, error=error)
+                self._emit_finished(job.id, JOB_FAILED, error=error)
+                continue
+            self._queue.submit(self._run, job.id)
+            reencolados.append(job.id)
+            print(f"[INFO] Trabajo #{job.id} retomado (su proceso se detuvo)")
+        return reencolados
+
+    def get_status(self, job_id: int) -> Optional[Dict]:
+        """
+        Estado del trabajo y avance por archivo.
+
+        Returns:
+            dict serializable a JSON, o None si el trabajo no existe
+        """
+        job_repo = self._job_repo_factory()
+        job = job_repo.get(job_id)
+        if job is None:
+            return None
+        archivos = job_repo.get_files(job_id)
+        terminados = [a for a in archivos if a.status not in (JOB_QUEUED, JOB_RUNNING)]
+        total = self._count_files(job.directory) if os.path.isdir(job.directory) else len(archivos)
+        return {
+            'id': job.id,
+            'status': job.status,
+            'finished': job.status in (JOB_DONE, JOB_FAILED),
+            'facultad': job.facultad,
+            'carrera': job.carrera,
+            'total_files': total,
+            'finished_files': len(terminados),
+            'failed_files': sum(1 for a in terminados if a.status == STATUS_ERROR),
+            'files': [
+                {'file_name': a.file_name, 'stage': a.stage, 'status': a.status,
+                 'error': a.error}
+                for a in sorted(archivos, key=lambda a: a.file_name)
+            ],
+            'error': job.error,
+            'report_ready': bool(job.report_path) and os.path.isfile(job.report_path),
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'updated_at': job.updated_at.isoformat() if job.updated_at else None,
+        }
+
+    def get_report_path(self, job_id: int) -> Optional[str]:
+        """Reporte generado por el trabajo, o None si no existe (o ya se eliminó)."""
+        job = self._job_repo_factory().get(job_id)
+        if job is None or not job.report_path or not os.path.isfile(job.report_path):
+            return None
+        return job.report_path
+
+    def get_events(self, job_id: int, after_id: int = 0) -> List[JobEvent]:
+        """Eventos de progreso del trabajo posteriores a ``after_id``."""
+        if self._event_repo is None:
+            return []
+        return self._event_repo.list_after(job_id, after_id)
+
+    def _run(self, job_id: int) -> None:
+        """Procesa el directorio del trabajo y genera el reporte (hilo de la cola)."""
+        job_repo = self._job_repo_factory()
+        job = job_repo.get(job_id)
+        try:
+            resultados = self._process_factory().execute(
+                job.directory, facultad=job.facultad, carrera_default=job.carrera,
+                job_id=job.id,
+            )
+            if not resultados:
+                error = 'No se encontraron archivos para procesar'
+                job_repo.update_status(job.id, JOB_FAILED, error=error)
+                self._emit_finished(job.id, JOB_FAILED, error=error)
+                return
+            report_path = self._report_factory().execute(scope=job_report_scope(job.id))
+            # ProcessFilesUseCase ya dejó el trabajo 'completado' o 'con errores'
+            status = job_repo.get(job.id).status
+            job_repo.update_status(job.id, status, report_path=report_path)
+            self._emit_finished(job.id, status, report_ready=bool(report_path))
+        except Exception as e:
+            print(f"[ERROR] Trabajo #{job.id} falló: {e}")
+            job_repo.update_status(job.id, JOB_FAILED, error=str(e)[:500])
+            self._emit_finished(job.id, JOB_FAILED, error=str(e)[:500])
+        finally:
+            if self._remove_directory:
+                # Si el proceso muere antes de llegar aquí, los archivos quedan
+                # para que recover_orphaned_jobs() retome el trabajo
+                shutil.rmtree(job.directory, ignore_errors=True)
+
+    def _emit_finished(self, job_id: int, status: str, report_ready: bool = False,
+                       error: Optional[str] = None) -> None:
+        if self._event_repo is None:
+            return
+        try:
+            self._event_repo.add(JobEvent(job_id, EVENT_JOB_FINISHED, data={
+                'status': status, 'report_ready': report_ready, 'error': error,
+            }))
+        except Exception as e:
+            print(f"[WARN] No se pudo registrar el fin del trabajo #{job_id}: {e}")
+
+    @staticmethod
+    def _count_files(directory: str) -> int:
+        if not os.path.isdir(directory):
+            return 0
+        return sum(1 for f in os.listdir(directory)
+                   if f.lower().endswith(ProcessFilesUseCase.SUPPORTED_EXTENSIONS))
@@ -1,2 +1,4 @@
 # Infrastructure AI package
 from .ai_provider_adapter import AIProviderAdapter
+from .async_ai_provider_adapter import AsyncAIProviderAdapter
+from .cached_ai_provider_adapter import CachedAIProviderAdapter, CachedAsyncAIProviderAdapter
@@ -21,8 +21,7 @@ class AIProviderAdapter(AIProviderPort):
 
     def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7) -> str:
         """Genera texto usando el proveedor con balanceo de carga."""
-        provider = self._factory.get_provider()
-        return provider.generate_completion(prompt, max_tokens, temperature)
+        return self._factory.complete(None, prompt, max_tokens, temperature)
 
     def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
                                temperature: float = 0.7) -> Tuple[str, str]:
@@ -32,5 +31,4 @@ class AIProviderAdapter(AIProviderPort):
     def generate_with_provider(self, provider_name: str, prompt: str,
                                max_tokens: int = 2000, temperature: float = 0.7) -> str:
         """Genera usando un proveedor específico por nombre."""
-        provider = self._factory.get_provider(provider_name)
-        return provider.generate_completion(prompt, max_tokens, temperature)
+        return self._factory.complete(provider_name, prompt, max_tokens, temperature)
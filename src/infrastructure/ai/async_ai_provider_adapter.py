@@ -0,0 +1,78 @@
+"""
+Adaptador de infraestructura: AsyncAIProviderAdapter
+Implementa AsyncAIProviderPort usando las estrategias del AIProviderFactory
+(cliente asíncrono nativo de Gemini y OpenAI) con un límite de concurrencia
+por proveedor.
+"""
+import asyncio
+import weakref
+from typing import Dict, Optional, Tuple
+
+from src.config import env_int
+from src.domain.ports.ai_port import AsyncAIProviderPort
+from src.services.ai_providers import AIProviderFactory
+
+
+class AsyncAIProviderAdapter(AsyncAIProviderPort):
+    """
+    Adaptador asíncrono sobre AIProviderFactory.
+
+    Cada proveedor tiene su propio semáforo (GEMINI_MAX_CONCURRENCY,
+    OPENAI_MAX_CONCURRENCY; por defecto DEFAULT_CONCURRENCY), de modo que un
+    solo event loop puede mantener decenas de solicitudes en vuelo sin superar
+    los límites de cada API.
+    """
+
+    DEFAULT_CONCURRENCY = 8
+
+    def __init__(self, factory: AIProviderFactory = None,
+                 max_concurrency: Optional[Dict[str, int]] = None):
+        if factory is None:
+            factory = AIProviderFactory(load_balance=True)
+        self._factory = factory
+        self._limits = {
+            name: env_int(f'{name.upper()}_MAX_CONCURRENCY', self.DEFAULT_CONCURRENCY)
+            for name in factory.providers
+        }
+        self._limits.update(max_concurrency or {})
+        # Los semáforos pertenecen a un event loop: se crean uno por loop
+        self._semaphores: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+    def _semaphore(self, provider_name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        por_proveedor = self._semaphores.setdefault(loop, {})
+        if provider_name not in por_proveedor:
+            limite = self._limits.get(provider_name, self.DEFAULT_CONCURRENCY)
+            por_proveedor[provider_name] = asyncio.Semaphore(max(1, limite))
+        return por_proveedor[provider_name]
+
+    async def _call(self, provider_name: str, prompt: str, max_tokens: int,
+                    temperature: float) -> str:
+        provider = self._factory.get_provider(provider_name)
+        async with self._semaphore(provider_name):
+            # Solo cuenta la llamada a la API, no la espera por el semáforo
+            with self._factory.health.measure(provider_name):
+                return await provider.generate_completion_async(prompt, max_tokens, temperature)
+
+    async def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        """Genera texto usando el proveedor con balanceo de carga."""
+        provider_name = self._factory.provider_key(self._factory.get_provider())
+        return await self._call(provider_name, prompt, max_tokens, temperature)
+
+    async def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
+                                     temperature: float = 0.7) -> Tuple[str, str]:
+        """Genera con fallback automático entre proveedores (mismo orden que el factory)."""
+        last_error = None
+        for provider_name in self._factory.fallback_order():
+            try:
+                response = await self._call(provider_name, prompt, max_tokens, temperature)
+                return response, provider_name
+            except Exception as e:
+                last_error = e
+                print(f"[ERROR] Error con {provider_name}: {str(e)[:100]}")
+        raise Exception(f"Todos los proveedores fallaron. Último error: {last_error}")
+
+    async def generate_with_provider(self, provider_name: str, prompt: str,
+                                     max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        """Genera usando un proveedor específico por nombre."""
+        return await self._call(provider_name, prompt, max_tokens, temperature)
@@ -0,0 +1,131 @@
+"""
+Adaptador de infraestructura: CachedAIProviderAdapter
+Caché persistente de respuestas de IA delante de AIProviderPort / AsyncAIProviderPort.
+
+La clave es el hash de (operación, proveedor, modelos, prompt, temperatura,
+max_tokens): un syllabus subido de nuevo reutiliza las respuestas sin llamar
+a la API.
+"""
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+
+from src.domain.ports.ai_port import AIProviderPort, AsyncAIProviderPort
+from src.infrastructure.cache.sqlite_cache_store import SQLiteCacheStore, cache_key
+
+NAMESPACE = 'ai'
+
+
+class _AICacheKeys:
+    """Construcción de claves compartida por los adaptadores síncrono y asíncrono."""
+
+    def __init__(self, store: SQLiteCacheStore, model_names: Dict[str, str],
+                 ttl: Optional[float] = -1):
+        """
+        Args:
+            store: Caché persistente
+            model_names: Modelo configurado por proveedor, p.ej. {'gemini': 'gemini-2.5-flash'}
+            ttl: Segundos de vida de cada respuesta (-1 = TTL por defecto del store)
+        """
+        self._store = store
+        self._models = dict(model_names)
+        self._ttl = ttl
+
+    def _key(self, provider: Optional[str], prompt: str, max_tokens: int,
+             temperature: float) -> str:
+        # Sin proveedor fijo cualquier modelo puede responder: la clave incluye todos
+        modelos = self._models.get(provider) if provider else sorted(self._models.items())
+        return cache_key(provider or '*', modelos, prompt, temperature, max_tokens)
+
+    def _get(self, key: str) -> Optional[dict]:
+        valor = self._store.get(NAMESPACE, key)
+        return json.loads(valor) if valor is not None else None
+
+    def _set(self, key: str, **valor) -> None:
+        self._store.set(NAMESPACE, key, json.dumps(valor, ensure_ascii=False), ttl=self._ttl)
+
+    def stats(self) -> Dict[str, float]:
+        """Aciertos/fallos de la caché de IA."""
+        return self._store.stats(NAMESPACE)
+
+
+class CachedAIProviderAdapter(_AICacheKeys, AIProviderPort):
+    """Envuelve un AIProviderPort; solo las respuestas exitosas se guardan."""
+
+    def __init__(self, inner: AIProviderPort, store: SQLiteCacheStore,
+                 model_names: Dict[str, str], ttl: Optional[float] = -1):
+        super().__init__(store, model_names, ttl)
+        self._inner = inner
+
+    def generate(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        key = self._key(None, prompt, max_tokens, temperature)
+        cacheado = self._get(key)
+        if cacheado is not None:
+            return cacheado['response']
+        respuesta = self._inner.generate(prompt, max_tokens, temperature)
+        self._set(key, response=respuesta)
+        return respuesta
+
+    def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
+                               temperature: float = 0.7) -> Tuple[str, str]:
+        key = self._key(None, prompt, max_tokens, temperature)
+        cacheado = self._get(key)
+        if cacheado is not None:
+            print("[OK] Respuesta de IA desde caché")
+            return cacheado['response'], cacheado.get('provider', 'cache')
+        respuesta, proveedor = self._inner.generate_with_fallback(prompt, max_tokens, temperature)
+        self._set(key, response=respuesta, provider=proveedor)
+        return respuesta, proveedor
+
+    def generate_with_provider(self, provider_name: str, prompt: str,
+                               max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        key = self._key(provider_name, prompt, max_tokens, temperature)
+        cacheado = self._get(key)
+        if cacheado is not None:
+            print(f"[OK] Respuesta de {provider_name} desde caché")
+            return cacheado['response']
+        respuesta = self._inner.generate_with_provider(provider_name, prompt,
+                                                       max_tokens, temperature)
+        self._set(key, response=respuesta)
+        return respuesta
+
+
+class CachedAsyncAIProviderAdapter(_AICacheKeys, AsyncAIProviderPort):
+    """Versión asíncrona: la caché (SQLite) se consulta en un hilo."""
+
+    def __init__(self, inner: AsyncAIProviderPort, store: SQLiteCacheStore,
+                 model_names: Dict[str, str], ttl: Optional[float] = -1):
+        super().__init__(store, model_names, ttl)
+        self._inner = inner
+
+    async def generate(self, prompt: str, max_tokens: int = 2000,
+                       temperature: float = 0.7) -> str:
+        key = self._key(None, prompt, max_tokens, temperature)
+        cacheado = await asyncio.to_thread(self._get, key)
+        if cacheado is not None:
+            return cacheado['response']
+        respuesta = await self._inner.generate(prompt, max_tokens, temperature)
+        await asyncio.to_thread(self._set, key, response=respuesta)
+        return respuesta
+
+    async def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
+                                     temperature: float = 0.7) -> Tuple[str, str]:
+        key = self._key(None, prompt, max_tokens, temperature)
+        cacheado = await asyncio.to_thread(self._get, key)
+        if cacheado is not None:
+            return cacheado['response'], cacheado.get('provider', 'cache')
+        respuesta, proveedor = await self._inner.generate_with_fallback(
+            prompt, max_tokens, temperature)
+        await asyncio.to_thread(self._set, key, response=respuesta, provider=proveedor)
+        return respuesta, proveedor
+
+    async def generate_with_provider(self, provider_name: str, prompt: str,
+                                     max_tokens: int = 2000, temperature: float = 0.7) -> str:
+        key = self._key(provider_name, prompt, max_tokens, temperature)
+        cacheado = await asyncio.to_thread(self._get, key)
+        if cacheado is not None:
+            return cacheado['response']
+        respuesta = await self._inner.generate_with_provider(provider_name, prompt,
+                                                             max_tokens, temperature)
+        await asyncio.to_thread(self._set, key, response=respuesta)
+        return respuesta
@@ -0,0 +1,2 @@
+# Infrastructure cache package
+from .sqlite_cache_store import SQLiteCacheStore, cache_key
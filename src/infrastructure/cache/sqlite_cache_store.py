@@ -0,0 +1,198 @@
+"""
+Caché persistente clave-valor sobre SQLite (stdlib sqlite3).
+
+Los valores se guardan comprimidos con zlib, agrupados por espacio de nombres
+('ai', 'catalog', ...). Cada entrada expira según su TTL y, si el archivo
+supera ``max_bytes``, se eliminan primero las entradas usadas hace más tiempo
+(LRU por tamaño). Lleva contadores de aciertos/fallos por espacio de nombres.
+
+El tamaño total vive en la tabla ``cache_size``, que mantienen triggers en la
+misma transacción de cada escritura: todos los procesos que comparten el
+archivo (p.ej. los workers de gunicorn) ven el mismo total y desalojan a tiempo.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+# Junto a bibliografia.db (mismo volumen en Docker)
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'cache.db'
+)
+
+
+def cache_key(*partes) -> str:
+    """Clave de caché: SHA-256 de las partes serializadas en JSON."""
+    datos = json.dumps(partes, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+
+class SQLiteCacheStore:
+    """Caché en disco con TTL, desalojo LRU por tamaño y estadísticas."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024,
+                 default_ttl: Optional[float] = 30 * 24 * 3600):
+        """
+        Args:
+            path: Archivo SQLite (por defecto CACHE_DB_PATH o database/cache.db)
+            max_bytes: Tamaño máximo (comprimido) de todos los valores
+            default_ttl: Segundos de vida por defecto de cada entrada (None = sin vencimiento)
+        """
+        self._path = path or os.getenv('CACHE_DB_PATH', DEFAULT_CACHE_PATH)
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        self._conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,'
+            ' size INTEGER NOT NULL, expires_at REAL, accessed_at REAL NOT NULL,'
+            ' PRIMARY KEY (namespace, key))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed_at)')
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_size ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)'
+            )
+            # Cachés creadas antes de la tabla: el total parte de las entradas existentes
+            self._conn.execute('INSERT OR IGNORE INTO cache_size (id, total)'
+                               ' SELECT 0, COALESCE(SUM(size), 0) FROM cache')
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache BEGIN'
+                ' UPDATE cache_size SET total = total + NEW.size WHERE id = 0; END'
+            )
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache BEGIN'
+                ' UPDATE cache_size SET total = total - OLD.size WHERE id = 0; END'
+            )
+            self._conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache BEGIN'
+                ' UPDATE cache_size SET total = total + NEW.size - OLD.size WHERE id = 0; END'
+            )
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """Retorna el valor guardado o None si no existe o expiró."""
+        ahora = time.time()
+        with self._lock:
+            fila = self._conn.execute(
+                'SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?',
+                (namespace, key),
+            ).fetchone()
+            if fila and fila[1] is not None and fila[1] <= ahora:
+                self._conn.execute('DELETE FROM cache WHERE namespace = ? AND key = ?',
+                                   (namespace, key))
+                fila = None
+            self._count(namespace, 'hits' if fila else 'misses')
+            if not fila:
+                return None
+            self._conn.execute(
+                'UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                (ahora, namespace, key),
+            )
+        return zlib.decompress(fila[0]).decode('utf-8')
+
+    def set(self, namespace: str, key: str, value: str, ttl: Optional[float] = -1) -> None:
+        """
+        Guarda un valor.
+
+        Args:
+            ttl: Segundos de vida; -1 usa el TTL por defecto y None no vence
+        """
+        ahora = time.time()
+        ttl = self._default_ttl if ttl == -1 else ttl
+        comprimido = zlib.compress(value.encode('utf-8'))
+        with self._lock:
+            # UPSERT (no INSERT OR REPLACE): el reemplazo dispara el trigger de UPDATE
+            self._conn.execute(
+                'INSERT INTO cache (namespace, key, value, size, expires_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?)'
+                ' ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value,'
+                ' size = excluded.size, expires_at = excluded.expires_at,'
+                ' accessed_at = excluded.accessed_at',
+                (namespace, key, comprimido, len(comprimido),
+                 ahora + ttl if ttl is not None else None, ahora),
+            )
+            self._evict()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE namespace = ? AND key = ?',
+                               (namespace, key))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Vacía un espacio de nombres (o toda la caché)."""
+        with self._lock:
+            if namespace is None:
+                self._conn.execute('DELETE FROM cache')
+            else:
+                self._conn.execute('DELETE FROM cache WHERE namespace = ?', (namespace,))
+
+    def stats(self, namespace: Optional[str] = None) -> Dict[str, float]:
+        """Aciertos, fallos y tasa de aciertos (de un espacio de nombres o totales)."""
+        with self._lock:
+            if namespace is not None:
+                contadores = dict(self._stats.get(namespace, {}))
+                filtro, params = ' WHERE namespace = ?', (namespace,)
+            else:
+                contadores = {
+                    'hits': sum(s.get('hits', 0) for s in self._stats.values()),
+                    'misses': sum(s.get('misses', 0) for s in self._stats.values()),
+                }
+                filtro, params = '', ()
+            entradas, tamano = self._conn.execute(
+                f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache{filtro}', params
+            ).fetchone()
+        hits, misses = contadores.get('hits', 0), contadores.get('misses', 0)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': entradas,
+            'bytes': tamano,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _count(self, namespace: str, campo: str) -> None:
+        contadores = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+        contadores[campo] += 1
+
+    def _total_size(self) -> int:
+        """Tamaño de todas las entradas, incluidas las escritas por otros procesos."""
+        return self._conn.execute('SELECT total FROM cache_size WHERE id = 0').fetchone()[0]
+
+    def _evict(self) -> None:
+        """Elimina entradas vencidas y luego las menos usadas hasta respetar max_bytes."""
+        if self._total_size() <= self._max_bytes:
+            return
+        self._conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                           (time.time(),))
+        while self._total_size() > self._max_bytes:
+            filas = self._conn.execute(
+                'SELECT namespace, key, size FROM cache ORDER BY accessed_at LIMIT 64'
+            ).fetchall()
+            if not filas:
+                break
+            exceso = self._total_size() - self._max_bytes
+            for namespace, key, size in filas:
+                if exceso <= 0:
+                    break
+                self._conn.execute('DELETE FROM cache WHERE namespace = ? AND key = ?',
+                                   (namespace, key))
+                exceso -= size
@@ -1,2 +1,6 @@
 # Infrastructure catalog package
 from .primo_catalog_adapter import PrimoCatalogAdapter
+from .async_catalog_adapter import AsyncCatalogAdapter
+from .primo_http_catalog_adapter import PrimoHttpCatalogAdapter
+from .rate_limited_catalog_adapter import RateLimitedCatalogAdapter
+from .cached_catalog_adapter import CachedCatalogAdapter
@@ -0,0 +1,35 @@
+"""
+Adaptador de infraestructura: AsyncCatalogAdapter
+Implementa AsyncCatalogSearchPort sobre cualquier CatalogSearchPort síncrono.
+"""
+import asyncio
+import weakref
+from typing import Dict, Optional
+
+from src.domain.ports.catalog_port import AsyncCatalogSearchPort, CatalogSearchPort
+
+
+class AsyncCatalogAdapter(AsyncCatalogSearchPort):
+    """
+    Ejecuta las búsquedas del catálogo síncrono en hilos, con un máximo de
+    ``max_concurrency`` búsquedas simultáneas por event loop.
+
+    El scraper de Primo (Selenium) no tiene API asíncrona; este adaptador
+    permite usarlo desde ProcessFilesUseCase.execute_async sin bloquear el loop.
+    """
+
+    def __init__(self, catalog: CatalogSearchPort, max_concurrency: int = 2):
+        self._catalog = catalog
+        self._max_concurrency = max(1, max_concurrency)
+        self._semaphores: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphores[loop]
+
+    async def search(self, search_term: str) -> Optional[Dict]:
+        """Busca un libro en el catálogo sin bloquear el event loop."""
+        async with self._semaphore():
+            return await asyncio.to_thread(self._catalog.search, search_term)
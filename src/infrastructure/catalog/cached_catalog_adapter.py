@@ -0,0 +1,81 @@
+"""
+Adaptador de infraestructura: CachedCatalogAdapter
+Caché persistente de búsquedas del catálogo delante de CatalogSearchPort.
+
+La clave es el término de búsqueda normalizado (minúsculas, sin tildes ni
+puntuación): el mismo texto citado en muchos syllabus se busca en Primo una
+sola vez. Los libros encontrados viven ``ttl`` segundos (la disponibilidad
+cambia) y los "no encontrado" ``negative_ttl``, normalmente menor. Los errores
+del catálogo no se guardan.
+"""
+import json
+import threading
+from typing import Dict, List, Optional
+
+from src.domain.normalization import fold_text
+from src.domain.ports.catalog_port import CatalogSearchPort
+from src.infrastructure.cache.sqlite_cache_store import SQLiteCacheStore, cache_key
+
+NAMESPACE = 'catalog'
+
+
+class CachedCatalogAdapter(CatalogSearchPort):
+    """Envuelve un CatalogSearchPort con caché positiva y negativa."""
+
+    def __init__(self, inner: CatalogSearchPort, store: SQLiteCacheStore,
+                 ttl: Optional[float] = 7 * 24 * 3600,
+                 negative_ttl: Optional[float] = 24 * 3600):
+        """
+        Args:
+            inner: Catálogo real
+            store: Caché persistente
+            ttl: Segundos de vida de un resultado encontrado (None = sin vencimiento)
+            negative_ttl: Segundos de vida de un "no encontrado"
+        """
+        self._inner = inner
+        self._store = store
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        # Candado por término y cuántos hilos lo usan: se elimina con el último
+        self._locks: Dict[str, List] = {}
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def _key(search_term: str) -> str:
+        return cache_key(fold_text(search_term))
+
+    def _acquire_lock(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            entrada = self._locks.setdefault(key, [threading.Lock(), 0])
+            entrada[1] += 1
+            return entrada[0]
+
+    def _release_lock(self, key: str) -> None:
+        with self._locks_lock:
+            entrada = self._locks[key]
+            entrada[1] -= 1
+            if entrada[1] == 0:
+                del self._locks[key]
+
+    def search(self, search_term: str) -> Optional[Dict]:
+        """Busca en la caché y, si no está, en el catálogo real."""
+        key = self._key(search_term)
+        # Un solo worker consulta Primo por término; los demás esperan su resultado
+        lock = self._acquire_lock(key)
+        try:
+            with lock:
+                cacheado = self._store.get(NAMESPACE, key)
+                if cacheado is not None:
+                    print("  -> Resultado de catálogo desde caché")
+                    return json.loads(cacheado)['details']
+                detalles = self._inner.search(search_term)
+                self._store.set(NAMESPACE, key,
+                                json.dumps({'details': detalles}, ensure_ascii=False),
+                                ttl=self._ttl if detalles else self._negative_ttl)
+                return detalles
+        finally:
+            self._release_lock(key)
+
+    def stats(self) -> Dict[str, float]:
+        """Aciertos/fallos de la caché de catálogo."""
+        return self._store.stats(NAMESPACE)
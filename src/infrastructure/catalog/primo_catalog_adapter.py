@@ -5,15 +5,30 @@ Implementa CatalogSearchPort usando el scraper de Primo existente.
 from typing import Optional, Dict
 
 from src.domain.ports.catalog_port import CatalogSearchPort
-from src.services.scraper_primo import buscar_libro_detalles
+from src.services.chrome_driver_pool import ChromeDriverPool
+
+
+def buscar_libro_detalles(*args, **kwargs) -> Optional[Dict]:
+    """scraper_primo.buscar_libro_detalles, importando Selenium en la primera búsqueda."""
+    from src.services.scraper_primo import buscar_libro_detalles as buscar
+    return buscar(*args, **kwargs)
 
 
 class PrimoCatalogAdapter(CatalogSearchPort):
     """
     Adaptador que envuelve buscar_libro_detalles() e implementa
     el puerto de dominio CatalogSearchPort.
+
+    Con un ChromeDriverPool cada búsqueda reutiliza un navegador ya iniciado;
+    sin él se inicia y cierra un Chrome por búsqueda.
     """
 
+    def __init__(self, driver_pool: Optional[ChromeDriverPool] = None):
+        self._pool = driver_pool
+
     def search(self, search_term: str) -> Optional[Dict]:
         """Busca un libro en el catálogo Primo de la UAH."""
-        return buscar_libro_detalles(search_term, verbose=False)
+        if self._pool is None:
+            return buscar_libro_detalles(search_term, verbose=False)
+        with self._pool.lease() as driver:
+            return buscar_libro_detalles(search_term, verbose=False, driver=driver)
@@ -0,0 +1,22 @@
+"""
+Adaptador de infraestructura: PrimoHttpCatalogAdapter
+Implementa CatalogSearchPort con el cliente HTTP de Primo (sin navegador).
+"""
+from typing import Optional, Dict
+
+from src.domain.ports.catalog_port import CatalogSearchPort
+from src.services.primo_http_client import PrimoHttpClient
+
+
+class PrimoHttpCatalogAdapter(CatalogSearchPort):
+    """
+    Adaptador que consulta los endpoints JSON de Primo sobre una sesión HTTP
+    reutilizable. Retorna el mismo diccionario que PrimoCatalogAdapter.
+    """
+
+    def __init__(self, client: PrimoHttpClient = None):
+        self._client = client or PrimoHttpClient()
+
+    def search(self, search_term: str) -> Optional[Dict]:
+        """Busca un libro en el catálogo Primo de la UAH."""
+        return self._client.buscar_libro_detalles(search_term)
@@ -0,0 +1,25 @@
+"""
+Adaptador de infraestructura: RateLimitedCatalogAdapter
+Decora un CatalogSearchPort limitando la tasa de búsquedas con un TokenBucket.
+"""
+from typing import Dict, Optional
+
+from src.domain.ports.catalog_port import CatalogSearchPort
+from src.services.rate_limiter import TokenBucket
+
+
+class RateLimitedCatalogAdapter(CatalogSearchPort):
+    """
+    Aplica el limitador antes de cada búsqueda. Al compartir el mismo
+    TokenBucket entre todos los adaptadores del proceso, la tasa acordada con
+    Primo se respeta sin importar cuántos workers busquen a la vez.
+    """
+
+    def __init__(self, inner: CatalogSearchPort, limiter: TokenBucket):
+        self._inner = inner
+        self._limiter = limiter
+
+    def search(self, search_term: str) -> Optional[Dict]:
+        """Espera un token del limitador y delega la búsqueda."""
+        self._limiter.acquire()
+        return self._inner.search(search_term)
@@ -10,7 +10,9 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'bibliografia.db')
 
-engine = create_engine(f'sqlite:///{DB_PATH}')
+# timeout: espera a que se libere el lock de escritura de SQLite cuando varios
+# workers de ProcessFilesUseCase escriben en paralelo
+engine = create_engine(f'sqlite:///{DB_PATH}', connect_args={'timeout': 30})
 Sesion = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -3,12 +3,13 @@ Script de migración de base de datos (mantiene implementación original).
 Movido a infrastructure/database/.
 """
 from sqlalchemy import text
+from src.domain.normalization import dedup_key
 from src.infrastructure.database.db import engine
 
 
-def migrate_db():
+def migrate_db(bind=None):
     """Agrega columnas nuevas a las tablas existentes si no existen."""
-    with engine.connect() as conn:
+    with (bind or engine).connect() as conn:
         _add_column(conn, "ALTER TABLE titles ADD COLUMN edition TEXT", 'edition')
         _add_column(conn, "ALTER TABLE titles ADD COLUMN format TEXT", 'format')
         _add_column(conn, "ALTER TABLE titles ADD COLUMN physical_availability TEXT", 'physical_availability')
@@ -18,6 +19,12 @@ def migrate_db():
         _add_column(conn, "ALTER TABLE titles ADD COLUMN language TEXT", 'language')
         _add_column(conn, "ALTER TABLE titles ADD COLUMN place TEXT", 'place')
         _add_column(conn, "ALTER TABLE titles ADD COLUMN chapter TEXT", 'chapter')
+        _add_column(conn, "ALTER TABLE titles ADD COLUMN dedup_key TEXT", 'dedup_key')
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_titles_dedup_key ON titles (dedup_key)"))
+        _backfill_dedup_keys(conn)
+        _add_column(conn, "ALTER TABLE jobs ADD COLUMN error TEXT", 'error')
+        _add_column(conn, "ALTER TABLE jobs ADD COLUMN report_path TEXT", 'report_path')
+        _add_column(conn, "ALTER TABLE jobs ADD COLUMN worker TEXT", 'worker')
         conn.commit()
 
     print("\n[OK] Migración completada. La base de datos está lista para usar.")
@@ -34,5 +41,27 @@ def _add_column(conn, sql: str, column_name: str):
             print(f"Error al agregar columna '{column_name}': {e}")
 
 
+def _backfill_dedup_keys(conn, batch_size: int = 1000):
+    """Calcula dedup_key de los títulos que aún no la tienen (se pliega en Python: tildes)."""
+    total = 0
+    ultimo_id = 0
+    while True:
+        filas = conn.execute(
+            text("SELECT id, normalized_author, normalized_title FROM titles "
+                 "WHERE dedup_key IS NULL AND id > :ultimo ORDER BY id LIMIT :limite"),
+            {'ultimo': ultimo_id, 'limite': batch_size},
+        ).fetchall()
+        if not filas:
+            break
+        ultimo_id = filas[-1][0]
+        claves = [{'id': f[0], 'key': dedup_key(f[1], f[2])} for f in filas]
+        claves = [c for c in claves if c['key'] is not None]
+        if claves:
+            conn.execute(text("UPDATE titles SET dedup_key = :key WHERE id = :id"), claves)
+            total += len(claves)
+    if total:
+        print(f"[OK] Clave de deduplicación calculada para {total} títulos")
+
+
 if __name__ == '__main__':
     migrate_db()
@@ -2,7 +2,11 @@
 Modelos ORM de SQLAlchemy (mantiene la implementación original intacta).
 Solo se mueve al paquete de infraestructura de base de datos.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Table
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, Integer, String, Text, ForeignKey, Boolean, Table, DateTime, UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from src.infrastructure.database.db import Base
 
@@ -46,6 +50,8 @@ class TituloORM(Base):
     id = Column(Integer, primary_key=True)
     normalized_author = Column(String)
     normalized_title = Column(String)
+    # Autor|título normalizados (ver src.domain.normalization.dedup_key)
+    dedup_key = Column(String, index=True)
     original_author = Column(String)
     original_title = Column(String)
     year = Column(String)
@@ -75,3 +81,71 @@ class AdquisicionORM(Base):
     status = Column(String)
     available_printed = Column(Boolean, default=False)
     available_digital = Column(Boolean, default=False)
+
+
+class ArchivoProcesadoORM(Base):
+    """Modelo ORM para el registro de syllabus ya procesados (ingesta incremental)."""
+    __tablename__ = 'processed_files'
+    __table_args__ = (
+        UniqueConstraint('content_hash', 'pipeline_version', 'facultad', 'carrera',
+                         name='uq_processed_files_version'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    file_name = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+    pipeline_version = Column(String, nullable=False)
+    facultad = Column(String, nullable=False)
+    carrera = Column(String, nullable=False)
+    status = Column(String, nullable=False, default='ok')
+    processed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class TrabajoORM(Base):
+    """Modelo ORM para un trabajo de procesamiento (bitácora reanudable)."""
+    __tablename__ = 'jobs'
+
+    id = Column(Integer, primary_key=True)
+    directory = Column(String, nullable=False)
+    facultad = Column(String, nullable=False)
+    carrera = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    error = Column(Text)
+    report_path = Column(String)
+    worker = Column(String)  # proceso cuya cola tiene el trabajo
+
+    archivos = relationship('TrabajoArchivoORM', back_populates='trabajo')
+
+
+class TrabajoArchivoORM(Base):
+    """Modelo ORM para el estado por archivo y etapa de un trabajo."""
+    __tablename__ = 'job_files'
+    __table_args__ = (
+        UniqueConstraint('job_id', 'file_name', name='uq_job_files_file'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
+    file_name = Column(String, nullable=False)
+    content_hash = Column(String(64))
+    stage = Column(String)
+    status = Column(String, nullable=False)
+    payload = Column(Text)  # JSON con los resultados de las etapas completadas
+    error = Column(Text)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    trabajo = relationship('TrabajoORM', back_populates='archivos')
+
+
+class EventoTrabajoORM(Base):
+    """Modelo ORM para los eventos de progreso de un trabajo."""
+    __tablename__ = 'job_events'
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    file_name = Column(String)
+    data = Column(Text)  # JSON
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
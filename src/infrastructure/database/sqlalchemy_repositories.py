@@ -2,21 +2,38 @@
 Implementaciones SQLAlchemy de los puertos de repositorio.
 Adaptan los modelos ORM a las entidades de dominio puras.
 """
-from typing import List, Optional
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, not_, or_, select
+from sqlalchemy.exc import IntegrityError
 
 from src.domain.entities.career import Career
 from src.domain.entities.subject import Subject
 from src.domain.entities.title import Title
 from src.domain.entities.acquisition import Acquisition
+from src.domain.entities.processed_file import ProcessedFile
+from src.domain.entities.job import Job, JobFile, JobEvent, JOB_QUEUED, JOB_RUNNING
+from src.domain.entities.report_row import (
+    ReportRow, ReportQuery, ReportPage,
+    AVAILABILITY_PRINTED, AVAILABILITY_DIGITAL, AVAILABILITY_ANY, AVAILABILITY_NONE,
+)
+from src.domain.normalization import dedup_key
 from src.domain.ports.repository_ports import (
     CarreraRepositoryPort,
     AsignaturaRepositoryPort,
     TituloRepositoryPort,
     AdquisicionRepositoryPort,
+    ReportRepositoryPort,
+    ProcessedFileRepositoryPort,
+    JobRepositoryPort,
+    JobEventRepositoryPort,
 )
 from src.infrastructure.database.db import Sesion
 from src.infrastructure.database.orm_models import (
-    CarreraORM, AsignaturaORM, TituloORM, AdquisicionORM
+    CarreraORM, AsignaturaORM, TituloORM, AdquisicionORM, ArchivoProcesadoORM,
+    TrabajoORM, TrabajoArchivoORM, EventoTrabajoORM, titulo_asignatura,
 )
 
 
@@ -26,7 +43,7 @@ from src.infrastructure.database.orm_models import (
 
 def _orm_to_career(orm: CarreraORM) -> Career:
     c = Career(name=orm.name, facultad=orm.facultad, id=orm.id)
-    # Adjuntamos la lista ORM de asignaturas para que GenerateReportUseCase pueda iterar
+    # Adjuntamos la lista ORM de asignaturas para recorrer la jerarquía completa
     c.asignaturas = [_orm_to_subject(a) for a in orm.asignaturas]
     return c
 
@@ -83,6 +100,35 @@ def _orm_to_acquisition(orm: AdquisicionORM) -> Acquisition:
     return a
 
 
+def _orm_to_job(orm: TrabajoORM) -> Job:
+    return Job(
+        directory=orm.directory,
+        facultad=orm.facultad,
+        carrera=orm.carrera,
+        status=orm.status,
+        created_at=orm.created_at,
+        updated_at=orm.updated_at,
+        error=orm.error,
+        report_path=orm.report_path,
+        worker=orm.worker,
+        id=orm.id,
+    )
+
+
+def _orm_to_job_file(orm: TrabajoArchivoORM) -> JobFile:
+    return JobFile(
+        job_id=orm.job_id,
+        file_name=orm.file_name,
+        content_hash=orm.content_hash,
+        stage=orm.stage,
+        status=orm.status,
+        payload=json.loads(orm.payload) if orm.payload else {},
+        error=orm.error,
+        updated_at=orm.updated_at,
+        id=orm.id,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Repositorios concretos
 # ---------------------------------------------------------------------------
@@ -102,7 +148,12 @@ class SQLAlchemyCarreraRepository(CarreraRepositoryPort):
         if not orm:
             orm = CarreraORM(name=name, facultad=facultad)
             self._session.add(orm)
-            self._session.commit()
+            try:
+                self._session.commit()
+            except IntegrityError:
+                # Otro proceso creó la misma carrera en paralelo
+                self._session.rollback()
+                orm = self._session.query(CarreraORM).filter_by(name=name).one()
         return _orm_to_career(orm)
 
     def get_all(self) -> List[Career]:
@@ -147,22 +198,28 @@ class SQLAlchemyAsignaturaRepository(AsignaturaRepositoryPort):
 class SQLAlchemyTituloRepository(TituloRepositoryPort):
     """Repositorio de Título usando SQLAlchemy."""
 
+    # SQLite limita el número de parámetros por consulta
+    _IN_CHUNK = 500
+
     def __init__(self, session=None):
         self._session = session or Sesion()
 
     def find_duplicate(self, normalized_author: str, normalized_title: str) -> Optional[Title]:
-        all_titles = self._session.query(TituloORM).all()
-        for orm in all_titles:
-            if (orm.normalized_author and orm.normalized_title and
-                orm.normalized_author.lower().strip() == normalized_author.lower().strip() and
-                    orm.normalized_title.lower().strip() == normalized_title.lower().strip()):
-                return _orm_to_title(orm)
-        return None
-
-    def save(self, title: Title) -> Title:
-        orm = TituloORM(
+        key = dedup_key(normalized_author, normalized_title)
+        if key is None:
+            return None
+        orm = (self._session.query(TituloORM)
+               .filter(TituloORM.dedup_key == key)
+               .order_by(TituloORM.id)
+               .first())
+        return _orm_to_title(orm) if orm else None
+
+    @staticmethod
+    def _to_orm(title: Title) -> TituloORM:
+        return TituloORM(
             normalized_author=title.normalized_author,
             normalized_title=title.normalized_title,
+            dedup_key=dedup_key(title.normalized_author, title.normalized_title),
             original_author=title.original_author,
             original_title=title.original_title,
             year=title.year,
@@ -176,6 +233,9 @@ class SQLAlchemyTituloRepository(TituloRepositoryPort):
             language=title.language,
             type_bib=title.type_bib,
         )
+
+    def save(self, title: Title) -> Title:
+        orm = self._to_orm(title)
         self._session.add(orm)
         self._session.commit()
         title.id = orm.id
@@ -186,6 +246,7 @@ class SQLAlchemyTituloRepository(TituloRepositoryPort):
         if orm:
             orm.normalized_author = title.normalized_author
             orm.normalized_title = title.normalized_title
+            orm.dedup_key = dedup_key(title.normalized_author, title.normalized_title)
             orm.original_author = title.original_author
             orm.original_title = title.original_title
             orm.year = title.year
@@ -207,6 +268,51 @@ class SQLAlchemyTituloRepository(TituloRepositoryPort):
             titulo_orm.asignaturas.append(asignatura_orm)
             self._session.commit()
 
+    def save_bibliography(self, subject: Subject,
+                          new_titles: Sequence[Tuple[Title, Acquisition]],
+                          existing_titles: Sequence[Title]) -> List[Title]:
+        try:
+            nuevos = []
+            for title, acquisition in new_titles:
+                orm = self._to_orm(title)
+                orm.adquisiciones.append(AdquisicionORM(
+                    status=acquisition.status,
+                    available_printed=acquisition.available_printed,
+                    available_digital=acquisition.available_digital,
+                ))
+                nuevos.append(orm)
+            self._session.add_all(nuevos)
+            # Un flush para todos los INSERT: asigna los ids de títulos y adquisiciones
+            self._session.flush()
+            ids_nuevos = [(o.id, o.adquisiciones[0].id) for o in nuevos]
+
+            ids = list(dict.fromkeys(
+                [i for i, _ in ids_nuevos] + [t.id for t in existing_titles if t.id is not None]
+            ))
+            vinculados = set()
+            for i in range(0, len(ids), self._IN_CHUNK):
+                vinculados.update(self._session.execute(
+                    select(titulo_asignatura.c.title_id).where(
+                        titulo_asignatura.c.subject_id == subject.id,
+                        titulo_asignatura.c.title_id.in_(ids[i:i + self._IN_CHUNK]),
+                    )
+                ).scalars())
+            vinculos = [{'title_id': i, 'subject_id': subject.id}
+                        for i in ids if i not in vinculados]
+            if vinculos:
+                self._session.execute(titulo_asignatura.insert(), vinculos)
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+
+        guardados = []
+        for (title, acquisition), (title_id, acquisition_id) in zip(new_titles, ids_nuevos):
+            title.id = acquisition.title_id = title_id
+            acquisition.id = acquisition_id
+            guardados.append(title)
+        return guardados
+
     def get_all_with_relations(self) -> List[Title]:
         return [_orm_to_title(o) for o in self._session.query(TituloORM).all()]
 
@@ -236,3 +342,335 @@ class SQLAlchemyAdquisicionRepository(AdquisicionRepositoryPort):
     def get_all_available(self) -> List[Acquisition]:
         orms = self._session.query(AdquisicionORM).filter_by(status='disponible').all()
         return [_orm_to_acquisition(o) for o in orms]
+
+
+class SQLAlchemyReportRepository(ReportRepositoryPort):
+    """
+    Lectura del reporte consolidado con una sola consulta: los conteos por
+    carrera y global se calculan con funciones de ventana sobre title_subject
+    y la adquisición se une por título (sin cargar el grafo de entidades).
+
+    La misma consulta, con filtros, orden y LIMIT/OFFSET, sirve las páginas
+    de la API del reporte sin leer el CSV generado.
+    """
+
+    _TITLE_FIELDS = (
+        'id', 'normalized_author', 'normalized_title', 'original_author', 'original_title',
+        'year', 'publisher', 'edition', 'format', 'physical_availability',
+        'online_availability', 'place', 'chapter', 'language', 'type_bib',
+    )
+    # Orden del CSV: carrera → asignatura → título
+    _NATURAL_ORDER = (CarreraORM.id, AsignaturaORM.id, TituloORM.id)
+
+    def __init__(self, session=None, batch_size: int = 1000):
+        self._session = session or Sesion()
+        self._batch_size = batch_size
+
+    def _report_query(self):
+        ts = titulo_asignatura
+        vinculos = (
+            select(
+                ts.c.title_id,
+                ts.c.subject_id,
+                func.count().over(
+                    partition_by=(ts.c.title_id, AsignaturaORM.career_id)
+                ).label('conteo_carrera'),
+                func.count().over(partition_by=ts.c.title_id).label('conteo_global'),
+            )
+            .join(AsignaturaORM, AsignaturaORM.id == ts.c.subject_id)
+            .subquery()
+        )
+        # Una adquisición por título (la primera), como get_by_title()
+        primera_adquisicion = (
+            select(AdquisicionORM.title_id, func.min(AdquisicionORM.id).label('id'))
+            .group_by(AdquisicionORM.title_id)
+            .subquery()
+        )
+        return (
+            select(
+                CarreraORM.facultad.label('facultad'),
+                CarreraORM.name.label('carrera'),
+                AsignaturaORM.name.label('asignatura'),
+                AsignaturaORM.plan.label('plan'),
+                AsignaturaORM.semester.label('semestre'),
+                *(getattr(TituloORM, campo).label(campo) for campo in self._TITLE_FIELDS),
+                AdquisicionORM.available_printed.label('available_printed'),
+                AdquisicionORM.available_digital.label('available_digital'),
+                vinculos.c.conteo_carrera,
+                vinculos.c.conteo_global,
+            )
+            .select_from(CarreraORM)
+            .join(AsignaturaORM, AsignaturaORM.career_id == CarreraORM.id)
+            .join(vinculos, vinculos.c.subject_id == AsignaturaORM.id)
+            .join(TituloORM, TituloORM.id == vinculos.c.title_id)
+            .outerjoin(primera_adquisicion, primera_adquisicion.c.title_id == TituloORM.id)
+            .outerjoin(AdquisicionORM, AdquisicionORM.id == primera_adquisicion.c.id)
+            .order_by(*self._NATURAL_ORDER)
+        )
+
+    def iter_report_rows(self, query: Optional[ReportQuery] = None) -> Iterator[ReportRow]:
+        consulta = self._report_query()
+        if query is not None:
+            consulta = self._filtered(consulta, query)
+        resultado = self._session.execute(consulta.execution_options(yield_per=self._batch_size))
+        for fila in resultado:
+            yield self._to_report_row(fila)
+
+    def find_report_page(self, query: ReportQuery) -> ReportPage:
+        consulta = self._filtered(self._report_query(), query)
+        total = self._session.execute(
+            select(func.count()).select_from(consulta.order_by(None).subquery())
+        ).scalar_one()
+        if query.sort:
+            columna = self._sort_columns(consulta)[query.sort]
+            # El orden natural desempata para que las páginas sean estables
+            consulta = consulta.order_by(None).order_by(
+                columna.desc() if query.descending else columna.asc(), *self._NATURAL_ORDER
+            )
+        filas = self._session.execute(consulta.offset(query.offset).limit(query.page_size))
+        return ReportPage(rows=[self._to_report_row(f) for f in filas], total=total,
+                          page=query.page, page_size=query.page_size)
+
+    def list_careers_by_faculty(self) -> Dict[str, List[str]]:
+        filas = self._session.execute(
+            select(CarreraORM.facultad, CarreraORM.name)
+            .where(CarreraORM.asignaturas.any(AsignaturaORM.titulos.any()))
+            .order_by(CarreraORM.facultad, CarreraORM.name)
+        )
+        carreras: Dict[str, List[str]] = {}
+        for facultad, carrera in filas:
+            carreras.setdefault(facultad or '', []).append(carrera)
+        return carreras
+
+    @staticmethod
+    def _filtered(consulta, query: ReportQuery):
+        if query.facultad:
+            consulta = consulta.where(CarreraORM.facultad == query.facultad)
+        if query.carrera:
+            consulta = consulta.where(CarreraORM.name == query.carrera)
+        if query.asignatura:
+            consulta = consulta.where(AsignaturaORM.name.icontains(query.asignatura, autoescape=True))
+        if query.texto:
+            consulta = consulta.where(or_(
+                TituloORM.normalized_title.icontains(query.texto, autoescape=True),
+                TituloORM.normalized_author.icontains(query.texto, autoescape=True),
+                AsignaturaORM.name.icontains(query.texto, autoescape=True),
+            ))
+        impreso = AdquisicionORM.available_printed.is_(True)
+        digital = AdquisicionORM.available_digital.is_(True)
+        if query.disponibilidad == AVAILABILITY_PRINTED:
+            consulta = consulta.where(impreso)
+        elif query.disponibilidad == AVAILABILITY_DIGITAL:
+            consulta = consulta.where(digital)
+        elif query.disponibilidad == AVAILABILITY_ANY:
+            consulta = consulta.where(or_(impreso, digital))
+        elif query.disponibilidad == AVAILABILITY_NONE:
+            # Sin adquisición (outer join) cuenta como no disponible
+            consulta = consulta.where(not_(and_(
+                AdquisicionORM.id.is_not(None), or_(impreso, digital)
+            )))
+        return consulta
+
+    @staticmethod
+    def _sort_columns(consulta) -> Dict:
+        columnas = consulta.selected_columns
+        return {
+            'facultad': CarreraORM.facultad,
+            'carrera': CarreraORM.name,
+            'asignatura': AsignaturaORM.name,
+            'plan': AsignaturaORM.plan,
+            'semestre': AsignaturaORM.semester,
+            'autor': TituloORM.normalized_author,
+            'titulo': TituloORM.normalized_title,
+            'anio': TituloORM.year,
+            'conteo_carrera': columnas.conteo_carrera,
+            'conteo_global': columnas.conteo_global,
+        }
+
+    def _to_report_row(self, fila) -> ReportRow:
+        return ReportRow(
+            facultad=fila.facultad,
+            carrera=fila.carrera,
+            asignatura=fila.asignatura,
+            plan=fila.plan,
+            semestre=fila.semestre,
+            titulo=Title(**{campo: getattr(fila, campo) for campo in self._TITLE_FIELDS}),
+            available_printed=bool(fila.available_printed),
+            available_digital=bool(fila.available_digital),
+            conteo_carrera=fila.conteo_carrera,
+            conteo_global=fila.conteo_global,
+        )
+
+
+class SQLAlchemyProcessedFileRepository(ProcessedFileRepositoryPort):
+    """Repositorio del registro de archivos procesados usando SQLAlchemy."""
+
+    # SQLite limita el número de parámetros por consulta
+    _IN_CHUNK = 500
+
+    def __init__(self, session=None):
+        self._session = session or Sesion()
+
+    def find_processed_hashes(self, content_hashes: Iterable[str], pipeline_version: str,
+                              facultad: str, carrera: str) -> Set[str]:
+        hashes = list(dict.fromkeys(content_hashes))
+        encontrados = set()
+        for i in range(0, len(hashes), self._IN_CHUNK):
+            filas = self._session.query(ArchivoProcesadoORM.content_hash).filter(
+                ArchivoProcesadoORM.content_hash.in_(hashes[i:i + self._IN_CHUNK]),
+                ArchivoProcesadoORM.pipeline_version == pipeline_version,
+                ArchivoProcesadoORM.facultad == facultad,
+                ArchivoProcesadoORM.carrera == carrera,
+            ).all()
+            encontrados.update(h for (h,) in filas)
+        return encontrados
+
+    def mark_processed(self, processed_file: ProcessedFile) -> ProcessedFile:
+        orm = self._session.query(ArchivoProcesadoORM).filter_by(
+            content_hash=processed_file.content_hash,
+            pipeline_version=processed_file.pipeline_version,
+            facultad=processed_file.facultad,
+            carrera=processed_file.carrera,
+        ).first()
+        if not orm:
+            orm = ArchivoProcesadoORM(
+                content_hash=processed_file.content_hash,
+                pipeline_version=processed_file.pipeline_version,
+                facultad=processed_file.facultad,
+                carrera=processed_file.carrera,
+            )
+            self._session.add(orm)
+        orm.file_name = processed_file.file_name
+        orm.status = processed_file.status
+        orm.processed_at = processed_file.processed_at or datetime.utcnow()
+        try:
+            self._session.commit()
+        except IntegrityError:
+            # Otro proceso registró el mismo archivo en paralelo
+            self._session.rollback()
+        processed_file.id = orm.id
+        processed_file.processed_at = orm.processed_at
+        return processed_file
+
+
+class SQLAlchemyJobRepository(JobRepositoryPort):
+    """Repositorio de la bitácora de trabajos usando SQLAlchemy."""
+
+    def __init__(self, session=None):
+        self._session = session or Sesion()
+
+    def create(self, job: Job) -> Job:
+        ahora = datetime.utcnow()
+        orm = TrabajoORM(
+            directory=job.directory,
+            facultad=job.facultad,
+            carrera=job.carrera,
+            status=job.status,
+            created_at=ahora,
+            updated_at=ahora,
+            error=job.error,
+            report_path=job.report_path,
+            worker=job.worker,
+        )
+        self._session.add(orm)
+        self._session.commit()
+        return _orm_to_job(orm)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        orm = self._session.query(TrabajoORM).filter_by(id=job_id).first()
+        return _orm_to_job(orm) if orm else None
+
+    def find_unfinished(self, directory: str, facultad: str, carrera: str) -> Optional[Job]:
+        orm = self._session.query(TrabajoORM).filter_by(
+            directory=directory, facultad=facultad, carrera=carrera, status=JOB_RUNNING
+        ).order_by(TrabajoORM.id.desc()).first()
+        return _orm_to_job(orm) if orm else None
+
+    def list_unfinished(self) -> List[Job]:
+        orms = self._session.query(TrabajoORM).filter(
+            TrabajoORM.status.in_([JOB_QUEUED, JOB_RUNNING])
+        ).order_by(TrabajoORM.id).all()
+        return [_orm_to_job(o) for o in orms]
+
+    def claim(self, job_id: int, worker: str, previous_worker: Optional[str]) -> bool:
+        filtro = (TrabajoORM.worker.is_(None) if previous_worker is None
+                  else TrabajoORM.worker == previous_worker)
+        filas = self._session.query(TrabajoORM).filter(
+            TrabajoORM.id == job_id, filtro
+        ).update({TrabajoORM.worker: worker, TrabajoORM.updated_at: datetime.utcnow()},
+                 synchronize_session=False)
+        self._session.commit()
+        return filas == 1
+
+    def update_status(self, job_id: int, status: str, error: Optional[str] = None,
+                      report_path: Optional[str] = None) -> None:
+        orm = self._session.query(TrabajoORM).filter_by(id=job_id).first()
+        if orm:
+            orm.status = status
+            if error is not None:
+                orm.error = error
+            if report_path is not None:
+                orm.report_path = report_path
+            orm.updated_at = datetime.utcnow()
+            self._session.commit()
+
+    def get_files(self, job_id: int) -> List[JobFile]:
+        orms = self._session.query(TrabajoArchivoORM).filter_by(job_id=job_id).all()
+        return [_orm_to_job_file(o) for o in orms]
+
+    def save_file(self, job_file: JobFile) -> JobFile:
+        orm = self._session.query(TrabajoArchivoORM).filter_by(
+            job_id=job_file.job_id, file_name=job_file.file_name
+        ).first()
+        if not orm:
+            orm = TrabajoArchivoORM(job_id=job_file.job_id, file_name=job_file.file_name)
+            self._session.add(orm)
+        orm.content_hash = job_file.content_hash
+        orm.stage = job_file.stage
+        orm.status = job_file.status
+        orm.payload = json.dumps(job_file.payload, ensure_ascii=False)
+        orm.error = job_file.error
+        orm.updated_at = datetime.utcnow()
+        self._session.commit()
+        job_file.id = orm.id
+        job_file.updated_at = orm.updated_at
+        return job_file
+
+
+class SQLAlchemyJobEventRepository(JobEventRepositoryPort):
+    """
+    Eventos de progreso usando SQLAlchemy. Cada operación abre su propia
+    sesión, de modo que la misma instancia sirve a todos los hilos de un
+    trabajo y los eventos son visibles de inmediato para otros procesos.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory or Sesion
+
+    def add(self, event: JobEvent) -> JobEvent:
+        with self._session_factory() as session:
+            orm = EventoTrabajoORM(
+                job_id=event.job_id,
+                kind=event.kind,
+                file_name=event.file_name,
+                data=json.dumps(event.data, ensure_ascii=False),
+                created_at=event.created_at or datetime.utcnow(),
+            )
+            session.add(orm)
+            session.commit()
+            event.id, event.created_at = orm.id, orm.created_at
+        return event
+
+    def list_after(self, job_id: int, after_id: int = 0, limit: int = 200) -> List[JobEvent]:
+        with self._session_factory() as session:
+            orms = (session.query(EventoTrabajoORM)
+                    .filter(EventoTrabajoORM.job_id == job_id, EventoTrabajoORM.id > after_id)
+                    .order_by(EventoTrabajoORM.id)
+                    .limit(limit)
+                    .all())
+            return [
+                JobEvent(job_id=o.job_id, kind=o.kind, file_name=o.file_name,
+                         data=json.loads(o.data) if o.data else {},
+                         created_at=o.created_at, id=o.id)
+                for o in orms
+            ]
@@ -1,2 +1,3 @@
 # Infrastructure file extractor package
 from .file_extractor_adapter import FileExtractorAdapter
+from .cached_file_extractor_adapter import CachedFileExtractorAdapter
@@ -0,0 +1,58 @@
+"""
+Adaptador de infraestructura: CachedFileExtractorAdapter
+Caché persistente de textos extraídos delante de FileExtractorAdapter.
+
+La clave es el SHA-256 del contenido del archivo más la versión del
+extractor: al reprocesar un lote (p.ej. tras cambiar los prompts) los
+syllabus sin cambios no se vuelven a convertir a Markdown. El texto se
+guarda comprimido en la caché persistente; los errores no se guardan.
+"""
+import os
+from typing import Dict, Optional
+
+from src.domain.hashing import sha256_file
+from src.domain.ports.file_extractor_port import FileExtractorPort
+from src.infrastructure.cache.sqlite_cache_store import SQLiteCacheStore, cache_key
+from src.infrastructure.file_extractor.file_extractor_adapter import FileExtractorAdapter
+
+NAMESPACE = 'extract'
+
+
+class CachedFileExtractorAdapter(FileExtractorPort):
+    """Envuelve un FileExtractorAdapter con caché por contenido."""
+
+    def __init__(self, inner: FileExtractorAdapter, store: SQLiteCacheStore,
+                 ttl: Optional[float] = -1):
+        """
+        Args:
+            inner: Extractor real
+            store: Caché persistente
+            ttl: Segundos de vida de cada texto (-1 = TTL por defecto del store)
+        """
+        self._inner = inner
+        self._store = store
+        self._ttl = ttl
+
+    def _key(self, file_path: str) -> str:
+        _, ext = os.path.splitext(file_path)
+        return cache_key(self._inner.version, ext.lower(), sha256_file(file_path))
+
+    def extract(self, file_path: str) -> str:
+        """Retorna el texto guardado para este contenido o lo extrae y lo guarda."""
+        if not self.supports(file_path) or not os.path.isfile(file_path):
+            return self._inner.extract(file_path)  # lanza el error correspondiente
+        key = self._key(file_path)
+        cacheado = self._store.get(NAMESPACE, key)
+        if cacheado is not None:
+            print(f"  -> Texto de {os.path.basename(file_path)} desde caché")
+            return cacheado
+        texto = self._inner.extract(file_path)
+        self._store.set(NAMESPACE, key, texto, ttl=self._ttl)
+        return texto
+
+    def supports(self, file_path: str) -> bool:
+        return self._inner.supports(file_path)
+
+    def stats(self) -> Dict[str, float]:
+        """Aciertos/fallos de la caché de textos extraídos."""
+        return self._store.stats(NAMESPACE)
@@ -3,22 +3,44 @@ Adaptador de infraestructura: FileExtractorAdapter
 Implementa FileExtractorPort usando las estrategias de extracción existentes.
 """
 import os
+from typing import Optional
 
 from src.domain.ports.file_extractor_port import FileExtractorPort
-from src.services.file_extractor_strategies import FileProcessor
+from src.services.extraction_pool import ExtractionProcessPool
+from src.services.file_extractor_strategies import EXTRACTOR_VERSION, FileProcessor
 
 
 class FileExtractorAdapter(FileExtractorPort):
     """
     Adaptador que envuelve FileProcessor (Strategy Pattern) e implementa
     el puerto de dominio FileExtractorPort.
+
+    Con ``pool``, la extracción corre en un proceso del pool en lugar del
+    hilo que llama (la conversión usa CPU y retiene el GIL).
     """
 
     SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
 
+    def __init__(self, pdf_fast: bool = False, pool: Optional[ExtractionProcessPool] = None):
+        """
+        Args:
+            pdf_fast: En PDFs, convierte a Markdown solo las páginas de
+                      encabezado y bibliografía (ver PDFExtractorStrategy)
+            pool: Pool de procesos extractores compartido (opcional)
+        """
+        self._pdf_fast = pdf_fast
+        self._pool = pool
+
+    @property
+    def version(self) -> str:
+        """Versión del texto producido (cambia con las estrategias y el modo PDF)."""
+        return f"{EXTRACTOR_VERSION}-{'fast' if self._pdf_fast else 'full'}"
+
     def extract(self, file_path: str) -> str:
         """Extrae texto del archivo usando la estrategia apropiada."""
-        processor = FileProcessor.create_for_file(file_path)
+        if self._pool is not None:
+            return self._pool.extract(file_path, pdf_fast=self._pdf_fast)
+        processor = FileProcessor.create_for_file(file_path, pdf_fast=self._pdf_fast)
         return processor.extract_text(file_path)
 
     def supports(self, file_path: str) -> bool:
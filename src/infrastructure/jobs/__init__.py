@@ -0,0 +1,3 @@
+# Infrastructure jobs package
+from .thread_pool_job_queue import ThreadPoolJobQueue
+from .worker_identity import current_worker_id, is_worker_alive
@@ -0,0 +1,52 @@
+"""
+Adaptador de infraestructura: ThreadPoolJobQueue
+Implementa JobQueuePort con un pool de hilos propio del proceso.
+"""
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Set
+
+from src.domain.ports.job_queue_port import JobQueuePort
+
+
+class ThreadPoolJobQueue(JobQueuePort):
+    """
+    Ejecuta los trabajos en ``max_workers`` hilos separados de los que
+    atienden solicitudes HTTP: la petición que encola retorna de inmediato y
+    los trabajos en exceso esperan su turno en la cola del pool.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix='job')
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., None], *args) -> None:
+        future = self._executor.submit(self._run, fn, *args)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+
+    @staticmethod
+    def _run(fn: Callable[..., None], *args) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"[ERROR] Trabajo en segundo plano falló: {e}")
+            traceback.print_exc()
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que terminen los trabajos encolados. Retorna False si se agotó el plazo."""
+        with self._lock:
+            pendientes = set(self._pending)
+        _, no_terminados = wait(pendientes, timeout=timeout)
+        return not no_terminados
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,66 @@
+"""
+Identidad del proceso que tiene un trabajo en su cola.
+
+La cola de trabajos vive en la memoria de cada worker de gunicorn: si el
+proceso muere, sus trabajos quedan 'en cola' o 'en curso' para siempre. Cada
+trabajo guarda el id del proceso que lo encoló (``host:pid:inicio``); al
+arrancar, otro proceso puede saber si ese dueño sigue vivo y, si no, retomarlo.
+
+``inicio`` es el instante en que arrancó el proceso (en Linux, el de
+/proc/<pid>/stat), así un pid reutilizado tras reiniciar el contenedor no se
+confunde con el dueño original.
+"""
+import os
+import socket
+from typing import Optional
+
+
+def _start_ticks(pid: int) -> Optional[str]:
+    """Instante de inicio del proceso (ticks desde el arranque del sistema), o None."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # El nombre del proceso va entre paréntesis y puede contener espacios
+            campos = f.read().rsplit(')', 1)[1].split()
+        return campos[19]
+    except (OSError, IndexError):
+        return None
+
+
+_HOST = socket.gethostname()
+_WORKER_ID = f"{_HOST}:{os.getpid()}:{_start_ticks(os.getpid()) or ''}"
+
+
+def current_worker_id() -> str:
+    """Id de este proceso para la columna ``worker`` de los trabajos."""
+    return _WORKER_ID
+
+
+def is_worker_alive(worker_id: Optional[str]) -> bool:
+    """
+    True si el proceso ``worker_id`` sigue vivo o no se puede saber.
+
+    Los procesos de otro host se consideran vivos: cada host retoma solo los
+    trabajos de sus propios procesos.
+    """
+    if not worker_id:
+        return False
+    if worker_id == _WORKER_ID:
+        return True
+    try:
+        host, pid, inicio = worker_id.rsplit(':', 2)
+        pid = int(pid)
+    except ValueError:
+        return False
+    if host != _HOST:
+        return True
+    if inicio:
+        return _start_ticks(pid) == inicio
+    if os.name == 'nt':
+        return True  # os.kill terminaría el proceso en Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
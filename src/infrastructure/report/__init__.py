@@ -1,2 +1,3 @@
 # Infrastructure report package
 from .csv_report_adapter import CsvReportAdapter
+from .report_artifact_store import ReportArtifactStore
@@ -1,48 +1,92 @@
 """
 Adaptador de infraestructura: CsvReportAdapter
-Implementa ReportPort generando reportes en formato CSV con pandas.
+Implementa ReportPort escribiendo el reporte CSV en streaming (módulo csv).
 """
+import csv
 import os
+import tempfile
 from datetime import datetime
-from typing import List, Dict
-
-import pandas as pd
+from typing import Dict, Iterable, Optional
 
+from src.domain.entities.report_row import REPORT_SCOPE_FULL
 from src.domain.ports.report_port import ReportPort
+from src.infrastructure.report.report_artifact_store import ReportArtifactStore
+from src.services.report_files import write_gzip_variant
 
 
 class CsvReportAdapter(ReportPort):
     """
     Genera reportes en formato CSV e implementa ReportPort.
-    Encapsula toda la lógica de pandas y filesystem.
+
+    Las filas se escriben a medida que llegan (memoria constante) en un archivo
+    temporal del mismo directorio, que reemplaza al destino solo al terminar:
+    un reporte a medio escribir nunca queda con el nombre final. Junto al CSV
+    se deja su variante gzip, que la aplicación web entrega sin recomprimir.
+
+    Con ``store``, cada generación es una versión nueva del alcance en el
+    directorio de reportes (y se aplica su retención); sin él, se escribe
+    ``reporte_bibliografia.csv`` en el directorio de trabajo.
     """
 
     DEFAULT_FILENAME = 'reporte_bibliografia.csv'
 
-    def generate(self, data: List[Dict]) -> str:
+    def __init__(self, store: Optional[ReportArtifactStore] = None):
+        self._store = store
+
+    def generate(self, data: Iterable[Dict], scope: str = REPORT_SCOPE_FULL) -> str:
         """
         Genera el CSV y retorna la ruta del archivo generado.
 
         Args:
-            data: Lista de diccionarios con las filas del reporte
+            data: Filas del reporte (diccionarios con las mismas columnas);
+                  puede ser un generador
+            scope: Alcance del reporte (solo con ``store``)
 
         Returns:
             Ruta al archivo CSV generado
         """
-        df = pd.DataFrame(data)
-        nombre_archivo = self.DEFAULT_FILENAME
+        nombre_archivo = self._store.new_path(scope) if self._store else self.DEFAULT_FILENAME
+        directorio = os.path.dirname(os.path.abspath(nombre_archivo))
+        fd, temporal = tempfile.mkstemp(prefix='.reporte_', suffix='.csv', dir=directorio)
 
         try:
-            if os.path.exists(nombre_archivo):
-                try:
-                    os.remove(nombre_archivo)
-                except PermissionError:
+            with os.fdopen(fd, 'w', encoding='utf-8-sig', newline='') as f:
+                filas = self._write_rows(f, data)
+            try:
+                os.replace(temporal, nombre_archivo)
+            except PermissionError:
+                # El archivo destino está abierto (p.ej. en Excel): otro nombre
+                # dentro del directorio de reportes o, sin él, del de trabajo
+                if self._store:
+                    nombre_archivo = self._store.new_path(scope)
+                else:
                     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                     nombre_archivo = f'reporte_bibliografia_{timestamp}.csv'
-
-            df.to_csv(nombre_archivo, index=False, sep=';', encoding='utf-8-sig')
-            print(f"[OK] Reporte generado exitosamente: {nombre_archivo}")
+                os.replace(temporal, nombre_archivo)
+            try:
+                write_gzip_variant(nombre_archivo)
+            except OSError as e:
+                print(f"[WARN] No se pudo escribir la variante gzip del reporte: {e}")
+            print(f"[OK] Reporte generado exitosamente: {nombre_archivo} ({filas} filas)")
+            if self._store:
+                self._store.cleanup()
             return nombre_archivo
         except Exception as e:
+            if os.path.exists(temporal):
+                os.remove(temporal)
             print(f"[ERROR] Error generando reporte: {e}")
             raise
+
+    @staticmethod
+    def _write_rows(f, data: Iterable[Dict]) -> int:
+        """Escribe encabezado y filas separados por ';'. Retorna el número de filas."""
+        writer = None
+        filas = 0
+        for fila in data:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(fila.keys()), delimiter=';',
+                                        lineterminator=os.linesep)
+                writer.writeheader()
+            writer.writerow(fila)
+            filas += 1
+        return filas
@@ -0,0 +1,163 @@
+"""
+Adaptador de infraestructura: ReportArtifactStore
+Guarda cada generación de un reporte como un archivo versionado e inmutable.
+
+Estructura: ``<directorio>/<alcance>/<AAAAMMDDTHHMMSS_ffffff>-<azar>.csv`` (y su
+variante ``.gz``). Cada generación escribe un archivo nuevo con nombre único,
+así que dos procesos que generan a la vez nunca se pisan ni se borran el
+archivo entre sí, y una descarga en curso no ve un archivo a medio reemplazar.
+Los nombres ordenan cronológicamente: la versión vigente de un alcance es la
+de mayor nombre.
+"""
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from src.domain.entities.report_row import REPORT_SCOPE_FULL, JOB_REPORT_SCOPE_PREFIX
+from src.services.report_files import GZIP_SUFFIX, forget_etag
+
+# Temporales huérfanos (generación interrumpida) se eliminan pasada una hora
+_STALE_TEMP_SECONDS = 3600
+
+
+class ReportArtifactStore:
+    """
+    Directorio de reportes generados, con retención.
+
+    Retención: en cada alcance se conservan las ``keep_per_scope`` versiones
+    más recientes que tengan menos de ``retention_days`` días. El reporte
+    completo más reciente se conserva siempre.
+    """
+
+    def __init__(self, directory: str, retention_days: float = 30,
+                 keep_per_scope: int = 3, suffix: str = '.csv'):
+        self._directory = os.path.abspath(directory)
+        self._retention_seconds = retention_days * 24 * 3600
+        self._keep_per_scope = max(1, keep_per_scope)
+        self._suffix = suffix
+        self._cleanup_lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def new_path(self, scope: str) -> str:
+        """Ruta (aún inexistente) para una nueva versión del alcance."""
+        carpeta = self._scope_dir(scope)
+        os.makedirs(carpeta, exist_ok=True)
+        marca = datetime.now().strftime('%Y%m%dT%H%M%S_%f')
+        return os.path.join(carpeta, f"{marca}-{secrets.token_hex(3)}{self._suffix}")
+
+    def latest(self, scope: str) -> Optional[str]:
+        """Versión más reciente del alcance, o None si no hay ninguna."""
+        versiones = self._versions(scope)
+        return versiones[0] if versiones else None
+
+    def latest_full(self) -> Optional[str]:
+        """
+        Reporte completo más reciente: el general o el de un trabajo, que
+        también cubre todas las carreras.
+        """
+        candidatos = [self.latest(scope) for scope in self._full_scopes()]
+        candidatos = [c for c in candidatos if c]
+        return max(candidatos, key=os.path.basename) if candidatos else None
+
+    def is_current(self, path: str) -> bool:
+        """
+        True si la versión es posterior al último reporte completo: los datos
+        solo cambian al procesar archivos, y cada procesamiento termina con
+        un reporte completo.
+        """
+        completo = self.latest_full()
+        return completo is None or os.path.basename(path) >= os.path.basename(completo)
+
+    def contains(self, path: str) -> bool:
+        """True si la ruta es un reporte de este directorio (y existe)."""
+        ruta = os.path.abspath(path)
+        return ruta.startswith(self._directory + os.sep) and os.path.isfile(ruta)
+
+    def cleanup(self) -> int:
+        """Aplica la retención a todos los alcances. Retorna los archivos eliminados."""
+        if not os.path.isdir(self._directory):
+            return 0
+        with self._cleanup_lock:
+            eliminados = 0
+            limite = time.time() - self._retention_seconds
+            completo = self.latest_full()
+            for scope in os.listdir(self._directory):
+                carpeta = self._scope_dir(scope)
+                if not os.path.isdir(carpeta):
+                    continue
+                eliminados += self._remove_stale_temps(carpeta)
+                for i, ruta in enumerate(self._versions(scope)):
+                    if ruta == completo:
+                        continue
+                    if i >= self._keep_per_scope or self._mtime(ruta) < limite:
+                        eliminados += self._remove(ruta)
+                try:
+                    os.rmdir(carpeta)  # solo si quedó vacía
+                except OSError:
+                    pass
+            if eliminados:
+                print(f"[INFO] Retención de reportes: {eliminados} archivo(s) eliminado(s)")
+            return eliminados
+
+    def _scope_dir(self, scope: str) -> str:
+        if not scope or os.sep in scope or (os.altsep and os.altsep in scope) or scope in ('.', '..'):
+            raise ValueError(f"Alcance de reporte inválido: {scope!r}")
+        return os.path.join(self._directory, scope)
+
+    def _full_scopes(self) -> List[str]:
+        if not os.path.isdir(self._directory):
+            return []
+        return [s for s in os.listdir(self._directory)
+                if s == REPORT_SCOPE_FULL or s.startswith(JOB_REPORT_SCOPE_PREFIX)]
+
+    def _versions(self, scope: str) -> List[str]:
+        """Versiones del alcance, de la más reciente a la más antigua."""
+        carpeta = self._scope_dir(scope)
+        try:
+            nombres = os.listdir(carpeta)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(carpeta, n)
+                for n in sorted(nombres, reverse=True)
+                if n.endswith(self._suffix) and not n.startswith('.')]
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        forget_etag(path)
+        eliminados = 0
+        for ruta in (path, path + GZIP_SUFFIX):
+            try:
+                os.remove(ruta)
+                eliminados += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # p.ej. abierto por una descarga en Windows; se reintenta en la próxima limpieza
+                print(f"[WARN] No se pudo eliminar el reporte {ruta}: {e}")
+        return eliminados
+
+    def _remove_stale_temps(self, carpeta: str) -> int:
+        eliminados = 0
+        limite = time.time() - _STALE_TEMP_SECONDS
+        for nombre in os.listdir(carpeta):
+            ruta = os.path.join(carpeta, nombre)
+            if nombre.startswith('.') and self._mtime(ruta) < limite:
+                try:
+                    os.remove(ruta)
+                    eliminados += 1
+                except OSError:
+                    pass
+        return eliminados
@@ -32,12 +32,13 @@ Versión: 2.1 (con soporte multi-proveedor)
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-import openai
-from google import genai
-from google.genai import types as genai_types
-from src.config import OpenAIConfig
-import random
+from typing import Dict, Any, List, Optional
+# Los SDK (openai, google.genai) se importan al crear cada estrategia:
+# google.genai tarda más de medio segundo en importarse
+from src.config import OpenAIConfig, env_int
+from src.services.provider_health import ProviderHealthTracker
+import asyncio
+import threading
 
 
 class AIProviderStrategy(ABC):
@@ -71,6 +72,37 @@ class AIProviderStrategy(ABC):
         """Retorna el nombre del proveedor."""
         pass
 
+    async def generate_completion_async(self, prompt: str, max_tokens: int = 2000,
+                                        temperature: float = 0.7) -> str:
+        """
+        Versión asíncrona de generate_completion.
+
+        Por defecto ejecuta la versión síncrona en un hilo; las estrategias
+        cuyo SDK tiene cliente asíncrono nativo la sobrescriben.
+        """
+        return await asyncio.to_thread(self.generate_completion, prompt, max_tokens, temperature)
+
+    def close(self) -> None:
+        """Libera las conexiones HTTP del cliente (por defecto no hace nada)."""
+
+
+def _openai_session_factory(pool_size: int):
+    """Crea las sesiones HTTP por hilo de openai con el pool y reintentos indicados."""
+    def crear_sesion():
+        import openai
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        sesion = requests.Session()
+        if openai.proxy:
+            proxy = openai.proxy if isinstance(openai.proxy, dict) else {
+                'http': openai.proxy, 'https': openai.proxy}
+            sesion.proxies = proxy
+        sesion.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                             max_retries=2))
+        return sesion
+    return crear_sesion
+
 
 class OpenAIStrategy(AIProviderStrategy):
     """
@@ -78,6 +110,11 @@ class OpenAIStrategy(AIProviderStrategy):
     
     PATRÓN: Strategy (Estrategia Concreta)
     PRINCIPIO: Single Responsibility (Responsabilidad Única)
+    
+    openai 0.28 mantiene una sesión HTTP con keep-alive por hilo (un
+    requests.Session no es seguro entre hilos). La estrategia solo ajusta cómo
+    se crean esas sesiones: pool de AI_HTTP_POOL_SIZE conexiones y reintentos
+    de conexión.
     """
     
     def __init__(self, api_key: Optional[str] = None):
@@ -94,7 +131,17 @@ class OpenAIStrategy(AIProviderStrategy):
             self.api_key = config.get_api_key()
             self.model_name = config.get_model()
         
+        import openai
+
         openai.api_key = self.api_key
+        self._openai = openai
+        self._session_factory = None
+        # Una función (no una Session): openai la llama una vez por hilo y
+        # guarda la sesión en el contexto del hilo
+        if openai.requestssession is None:
+            self._session_factory = _openai_session_factory(
+                env_int('AI_HTTP_POOL_SIZE', 10))
+            openai.requestssession = self._session_factory
     
     def generate_completion(self, prompt: str, max_tokens: int = 2000,
                           temperature: float = 0.7) -> str:
@@ -110,7 +157,21 @@ class OpenAIStrategy(AIProviderStrategy):
             str: Respuesta de OpenAI
         """
         try:
-            response = openai.ChatCompletion.create(
+            response = self._openai.ChatCompletion.create(
+                model=self.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            return response['choices'][0]['message']['content']
+        except Exception as e:
+            raise Exception(f"Error en OpenAI: {str(e)}")
+
+    async def generate_completion_async(self, prompt: str, max_tokens: int = 2000,
+                                        temperature: float = 0.7) -> str:
+        """Genera respuesta usando el cliente asíncrono de OpenAI (acreate)."""
+        try:
+            response = await self._openai.ChatCompletion.acreate(
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
@@ -123,6 +184,12 @@ class OpenAIStrategy(AIProviderStrategy):
     def get_provider_name(self) -> str:
         return f"OpenAI ({self.model_name})"
 
+    def close(self) -> None:
+        if self._session_factory is not None:
+            if self._openai.requestssession is self._session_factory:
+                self._openai.requestssession = None
+            self._session_factory = None
+
 
 class GeminiStrategy(AIProviderStrategy):
     """
@@ -137,6 +204,8 @@ class GeminiStrategy(AIProviderStrategy):
     """
 
     DEFAULT_MODEL_NAME = 'gemini-2.5-flash'
+    MAX_RETRIES = 3
+    BASE_DELAY = 2
     
     def __init__(self, api_key: Optional[str] = None, json_mode: bool = True):
         """
@@ -151,20 +220,15 @@ class GeminiStrategy(AIProviderStrategy):
 
         self.model_name = os.getenv('GEMINI_MODEL', self.DEFAULT_MODEL_NAME)
         self._json_mode = json_mode
+        from google import genai
+        from google.genai import types as genai_types
+
+        self._genai_types = genai_types
         # Nuevo SDK: cliente estático por api_key
         self._client = genai.Client(api_key=self.api_key)
-    
-    def generate_completion(self, prompt: str, max_tokens: int = 2000,
-                            temperature: float = 0.7) -> str:
-        """
-        Genera respuesta usando Gemini con reintentos para rate limits.
-        Con json_mode=True fuerza response_mime_type='application/json'.
-        """
-        import time
-
-        max_retries = 3
-        base_delay = 2
 
+    def _build_config(self, max_tokens: int, temperature: float):
+        """Arma la configuración de generación (JSON forzado si json_mode)."""
         config_kwargs = dict(
             temperature=temperature,
             max_output_tokens=max_tokens,
@@ -172,37 +236,84 @@ class GeminiStrategy(AIProviderStrategy):
         if self._json_mode:
             config_kwargs['response_mime_type'] = 'application/json'
 
-        config = genai_types.GenerateContentConfig(**config_kwargs)
+        return self._genai_types.GenerateContentConfig(**config_kwargs)
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """Retorna el texto de la respuesta o lanza si está bloqueada o vacía."""
+        if not response.text:
+            feedback = getattr(response, 'prompt_feedback', 'N/A')
+            raise Exception(f"Respuesta bloqueada o vacía. Feedback: {feedback}")
+        return response.text
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[int]:
+        """Segundos a esperar antes de reintentar, o None si el error no es de rate limit."""
+        error_str = str(error)
+        if "429" in error_str or "TooManyRequests" in error_str or "quota" in error_str.lower():
+            if attempt < self.MAX_RETRIES - 1:
+                delay = self.BASE_DELAY * (2 ** attempt)
+                print(f"[WARN] Rate limit en Gemini. Reintentando en {delay}s... (Intento {attempt+1}/{self.MAX_RETRIES})")
+                return delay
+        return None
+
+    def generate_completion(self, prompt: str, max_tokens: int = 2000,
+                            temperature: float = 0.7) -> str:
+        """
+        Genera respuesta usando Gemini con reintentos para rate limits.
+        Con json_mode=True fuerza response_mime_type='application/json'.
+        """
+        import time
+
+        config = self._build_config(max_tokens, temperature)
 
-        for attempt in range(max_retries):
+        for attempt in range(self.MAX_RETRIES):
             try:
                 response = self._client.models.generate_content(
                     model=self.model_name,
                     contents=prompt,
                     config=config,
                 )
+                return self._response_text(response)
+
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
 
-                # Verificar si la respuesta está bloqueada o vacía
-                if not response.text:
-                    feedback = getattr(response, 'prompt_feedback', 'N/A')
-                    raise Exception(f"Respuesta bloqueada o vacía. Feedback: {feedback}")
+                raise Exception(f"Error en Gemini: {str(e)}")
 
-                return response.text
+    async def generate_completion_async(self, prompt: str, max_tokens: int = 2000,
+                                        temperature: float = 0.7) -> str:
+        """Igual que generate_completion, usando el cliente asíncrono (client.aio)."""
+        config = self._build_config(max_tokens, temperature)
+
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                response = await self._client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config,
+                )
+                return self._response_text(response)
 
             except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "TooManyRequests" in error_str or "quota" in error_str.lower():
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
-                        print(f"[WARN] Rate limit en Gemini. Reintentando en {delay}s... (Intento {attempt+1}/{max_retries})")
-                        time.sleep(delay)
-                        continue
+                delay = self._retry_delay(e, attempt)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
 
                 raise Exception(f"Error en Gemini: {str(e)}")
 
     def get_provider_name(self) -> str:
         return "Gemini"
 
+    def close(self) -> None:
+        try:
+            self._client.close()
+        except Exception:
+            pass
+
 
 class AIProviderFactory:
     """
@@ -213,16 +324,23 @@ class AIProviderFactory:
     
     Características:
     - Balanceo de carga entre proveedores
-    - Fallback automático si un proveedor falla
+    - Fallback automático si un proveedor falla, en orden de salud
+      (latencia y errores recientes, ver ProviderHealthTracker)
+    - Circuit breaker: un proveedor que falla seguido sale de la rotación
     - Configuración flexible
+    
+    Es seguro entre hilos: el contenedor comparte una sola instancia por
+    proceso, de modo que los clientes de cada proveedor (y sus conexiones
+    abiertas) se reutilizan entre solicitudes y trabajos.
     """
     
     def __init__(self, providers: Optional[Dict[str, AIProviderStrategy]] = None,
-                 load_balance: bool = True):
+                 load_balance: bool = True, health: Optional[ProviderHealthTracker] = None):
         """
         Args:
             providers: Diccionario de proveedores disponibles
             load_balance: Si True, alterna entre proveedores
+            health: Métricas y circuit breaker por proveedor (por defecto uno nuevo)
         """
         if providers is None:
             # Inicializar proveedores por defecto
@@ -250,6 +368,8 @@ class AIProviderFactory:
         self.load_balance = load_balance
         self.current_provider_index = 0
         self.provider_keys = list(self.providers.keys())
+        self.health = health or ProviderHealthTracker()
+        self._lock = threading.Lock()
     
     def get_provider(self, provider_name: Optional[str] = None) -> AIProviderStrategy:
         """
@@ -267,16 +387,66 @@ class AIProviderFactory:
                 raise ValueError(f"Proveedor '{provider_name}' no disponible")
             return self.providers[provider_name]
         
-        # Balanceo de carga round-robin
+        # Balanceo de carga round-robin (salteando los proveedores fuera de rotación)
         if self.load_balance and len(self.providers) > 1:
-            provider_key = self.provider_keys[self.current_provider_index]
-            self.current_provider_index = (self.current_provider_index + 1) % len(self.provider_keys)
+            with self._lock:
+                for _ in range(len(self.provider_keys)):
+                    provider_key = self.provider_keys[self.current_provider_index]
+                    self.current_provider_index = (self.current_provider_index + 1) % len(self.provider_keys)
+                    if not self.health.is_ejected(provider_key):
+                        break
             print(f"[INFO] Usando proveedor: {provider_key}")
             return self.providers[provider_key]
         
         # Usar el primer proveedor disponible
         return list(self.providers.values())[0]
     
+    def fallback_order(self, preferred_provider: Optional[str] = None) -> List[str]:
+        """
+        Determina el orden en que se intentan los proveedores en el fallback.
+
+        Los proveedores sanos van primero, del menos al más costoso según su
+        latencia (p95) y tasa de errores recientes; los de costo similar se
+        mezclan si load_balance. Los que están fuera de la rotación quedan al
+        final, como último recurso.
+
+        Args:
+            preferred_provider: Proveedor a intentar primero (opcional, salvo
+                                que esté fuera de la rotación)
+
+        Returns:
+            list: Nombres de proveedores en orden de intento
+        """
+        if (preferred_provider and preferred_provider in self.providers
+                and not self.health.is_ejected(preferred_provider)):
+            return [preferred_provider] + self.health.rank(
+                [k for k in self.provider_keys if k != preferred_provider],
+                shuffle_equivalent=self.load_balance,
+            )
+        return self.health.rank(self.provider_keys, shuffle_equivalent=self.load_balance)
+
+    def complete(self, provider_name: Optional[str], prompt: str, max_tokens: int = 2000,
+                 temperature: float = 0.7) -> str:
+        """
+        Genera con un proveedor (o el balanceado si provider_name es None)
+        registrando su latencia y resultado en las métricas de salud.
+        """
+        provider = self.get_provider(provider_name)
+        with self.health.measure(provider_name or self.provider_key(provider)):
+            return provider.generate_completion(prompt, max_tokens, temperature)
+
+    def close(self) -> None:
+        """Cierra los clientes de todos los proveedores."""
+        for provider in self.providers.values():
+            provider.close()
+
+    def provider_key(self, provider: AIProviderStrategy) -> str:
+        """Retorna la clave ('openai', 'gemini') de una estrategia registrada."""
+        for key, registered in self.providers.items():
+            if registered is provider:
+                return key
+        raise ValueError(f"Proveedor no registrado: {provider.get_provider_name()}")
+
     def generate_with_fallback(self, prompt: str, max_tokens: int = 2000,
                                temperature: float = 0.7,
                                preferred_provider: Optional[str] = None) -> tuple[str, str]:
@@ -294,16 +464,7 @@ class AIProviderFactory:
         Returns:
             tuple: (respuesta, nombre_proveedor_usado)
         """
-        # Determinar orden de proveedores a intentar
-        if preferred_provider and preferred_provider in self.providers:
-            providers_to_try = [preferred_provider] + [
-                k for k in self.provider_keys if k != preferred_provider
-            ]
-        else:
-            providers_to_try = self.provider_keys.copy()
-            if self.load_balance:
-                random.shuffle(providers_to_try)
-        
+        providers_to_try = self.fallback_order(preferred_provider)
         last_error = None
         
         # Intentar con cada proveedor
@@ -311,7 +472,8 @@ class AIProviderFactory:
             try:
                 provider = self.providers[provider_name]
                 print(f"[INFO] Intentando con {provider.get_provider_name()}...")
-                response = provider.generate_completion(prompt, max_tokens, temperature)
+                with self.health.measure(provider_name):
+                    response = provider.generate_completion(prompt, max_tokens, temperature)
                 print(f"[OK] Respuesta exitosa de {provider.get_provider_name()}")
                 return response, provider_name
             except Exception as e:
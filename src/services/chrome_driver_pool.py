@@ -0,0 +1,128 @@
+"""
+Pool de navegadores Chrome headless reutilizables para el scraper de Primo.
+
+Iniciar Chrome domina el costo de cada búsqueda; el pool mantiene hasta
+``size`` navegadores vivos, presta uno por búsqueda, verifica que siga
+respondiendo antes de prestarlo y lo recicla tras ``max_uses`` búsquedas o
+si falla.
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class _PooledDriver:
+    """Navegador del pool con su contador de usos."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class ChromeDriverPool:
+    """Pool acotado de WebDrivers, seguro entre hilos."""
+
+    def __init__(self, size: int = 2, max_uses: int = 50,
+                 driver_factory: Optional[Callable[[], object]] = None,
+                 lease_timeout: Optional[float] = None):
+        """
+        Args:
+            size: Máximo de navegadores vivos simultáneamente
+            max_uses: Búsquedas tras las cuales un navegador se reinicia
+                      (libera la memoria que Chrome acumula)
+            driver_factory: Función que crea un navegador (por defecto crear_driver)
+            lease_timeout: Segundos máximos de espera por un navegador libre
+        """
+        if driver_factory is None:
+            from src.services.scraper_primo import crear_driver
+            driver_factory = crear_driver
+        self._factory = driver_factory
+        self._size = max(1, size)
+        self._max_uses = max(1, max_uses)
+        self._lease_timeout = lease_timeout
+        self._idle: 'queue.LifoQueue[_PooledDriver]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self._size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+
+    @contextmanager
+    def lease(self) -> Iterator[object]:
+        """
+        Presta un navegador durante el bloque ``with``.
+
+        Si el bloque lanza una excepción el navegador se descarta, ya que
+        puede haber quedado en un estado inconsistente.
+        """
+        if not self._slots.acquire(timeout=self._lease_timeout):
+            raise TimeoutError("No hay navegadores libres en el pool")
+        pooled = None
+        try:
+            pooled = self._checkout()
+            yield pooled.driver
+        except BaseException:
+            if pooled is not None:
+                self._discard(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                self._checkin(pooled)
+            self._slots.release()
+
+    def close(self) -> None:
+        """Cierra todos los navegadores (los prestados se cierran al devolverse)."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    @property
+    def alive(self) -> int:
+        """Número de navegadores vivos (ociosos o prestados)."""
+        with self._lock:
+            return len(self._all)
+
+    def _checkout(self) -> _PooledDriver:
+        if self._closed:
+            raise RuntimeError("El pool de navegadores está cerrado")
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                pooled = _PooledDriver(self._factory())
+                with self._lock:
+                    self._all.add(pooled)
+                return pooled
+            if self._healthy(pooled):
+                return pooled
+            print("[WARN] Navegador del pool no responde; se reinicia")
+            self._discard(pooled)
+
+    def _checkin(self, pooled: _PooledDriver) -> None:
+        pooled.uses += 1
+        if self._closed or pooled.uses >= self._max_uses:
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._all.discard(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(pooled: _PooledDriver) -> bool:
+        """Verifica que la sesión de WebDriver siga viva."""
+        try:
+            pooled.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
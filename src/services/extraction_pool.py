@@ -0,0 +1,247 @@
+"""
+Pool de procesos para la extracción de texto de PDF/Word.
+
+La conversión a Markdown (pymupdf4llm, mammoth) usa CPU y retiene el GIL:
+varios hilos extrayendo a la vez no ganan nada. El pool mantiene hasta
+``size`` procesos vivos con esas librerías ya importadas, presta uno por
+archivo y lo reemplaza si:
+
+- la extracción supera ``timeout`` segundos (el proceso se mata),
+- su memoria supera ``max_memory_mb`` (durante la extracción en Linux, y
+  al terminar según el pico informado por el propio proceso),
+- ya procesó ``max_tasks`` archivos (libera la memoria que acumulan).
+
+Los procesos nacen de un servidor ``forkserver`` que ya importó las
+librerías (o con ``spawn`` donde no existe forkserver), así que no heredan
+hilos, sesiones de BD ni sockets del proceso principal.
+"""
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Optional
+
+# Estrategias de extracción y las librerías pesadas que importan al extraer
+_PRELOAD_MODULES = ['src.services.file_extractor_strategies', 'pymupdf', 'pymupdf4llm', 'mammoth']
+# Cada cuánto se revisa la memoria del proceso mientras extrae
+_POLL_SECONDS = 0.25
+
+
+def _peak_rss_bytes() -> int:
+    """Pico de memoria residente del proceso actual (0 si no se puede medir)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+def _rss_bytes(pid: int) -> int:
+    """Memoria residente actual de otro proceso (solo Linux; 0 si no se puede medir)."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _worker_main(conn) -> None:
+    """
+    Bucle del proceso extractor: recibe ``(ruta, pdf_fast)`` y responde
+    ``('ok', texto, pico_memoria)`` o ``('error', excepción, pico_memoria)``.
+    ``None`` termina el proceso.
+    """
+    import importlib
+    for modulo in _PRELOAD_MODULES:  # ya cargados si el proceso viene del forkserver
+        importlib.import_module(modulo)
+    from src.services.file_extractor_strategies import FileProcessor
+
+    while True:
+        try:
+            tarea = conn.recv()
+        except (EOFError, OSError):
+            break
+        if tarea is None:
+            break
+        file_path, pdf_fast = tarea
+        try:
+            texto = FileProcessor.create_for_file(file_path, pdf_fast=pdf_fast).extract_text(file_path)
+            respuesta = ('ok', texto, _peak_rss_bytes())
+        except Exception as e:
+            respuesta = ('error', e, _peak_rss_bytes())
+        try:
+            conn.send(respuesta)
+        except Exception:
+            # La excepción original no se puede serializar
+            conn.send(('error', RuntimeError(f"{type(respuesta[1]).__name__}: {respuesta[1]}"),
+                       respuesta[2]))
+    conn.close()
+
+
+def _context():
+    """forkserver con las librerías precargadas donde existe; spawn en otro caso."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        # Sin '__main__': el servidor no re-ejecuta el script que inició la aplicación
+        ctx.set_forkserver_preload(_PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+
+class _Worker:
+    """Proceso extractor del pool con su canal y contador de archivos."""
+
+    def __init__(self, ctx):
+        self.conn, hijo = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(hijo,), daemon=True,
+                                   name='extractor')
+        self.process.start()
+        hijo.close()
+        self.tasks = 0
+
+    def stop(self, kill: bool = False) -> None:
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, BrokenPipeError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=2)
+        self.conn.close()
+
+
+class ExtractionProcessPool:
+    """Pool acotado de procesos extractores, seguro entre hilos."""
+
+    def __init__(self, size: Optional[int] = None, timeout: Optional[float] = 120,
+                 max_memory_mb: Optional[int] = 1024, max_tasks: int = 50):
+        """
+        Args:
+            size: Máximo de procesos vivos (por defecto, un proceso por núcleo)
+            timeout: Segundos máximos por archivo (None = sin límite)
+            max_memory_mb: Memoria residente máxima de un proceso (None = sin límite)
+            max_tasks: Archivos tras los cuales un proceso se reinicia
+        """
+        self._size = max(1, size or os.cpu_count() or 1)
+        self._timeout = timeout if timeout and timeout > 0 else None
+        self._max_memory = max_memory_mb * 1024 * 1024 if max_memory_mb and max_memory_mb > 0 else None
+        self._max_tasks = max(1, max_tasks)
+        self._ctx = _context()
+        self._idle: 'queue.LifoQueue[_Worker]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self._size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def alive(self) -> int:
+        """Número de procesos vivos (ociosos u ocupados)."""
+        with self._lock:
+            return len(self._all)
+
+    def warm(self) -> None:
+        """Inicia todos los procesos de antemano (la primera extracción no espera)."""
+        with self._lock:
+            faltan = self._size - len(self._all)
+        for _ in range(faltan):
+            self._idle.put(self._spawn())
+
+    def extract(self, file_path: str, pdf_fast: bool = False) -> str:
+        """
+        Extrae el texto de ``file_path`` en un proceso del pool.
+
+        Raises:
+            TimeoutError: Si la extracción supera el tiempo máximo
+            MemoryError: Si el proceso supera la memoria máxima
+            Exception: La excepción lanzada por la estrategia de extracción
+        """
+        self._slots.acquire()
+        try:
+            worker = self._checkout()
+            try:
+                worker.conn.send((os.path.abspath(file_path), pdf_fast))
+                estado, valor, pico = self._wait(worker, file_path)
+            except BaseException:
+                # Proceso colgado, excedido o muerto: se mata y se reemplaza
+                self._discard(worker, kill=True)
+                raise
+            worker.tasks += 1
+            if self._max_memory and pico > self._max_memory:
+                print(f"[WARN] Un proceso extractor llegó a {pico // (1024 * 1024)} MB; se reinicia")
+                self._discard(worker)
+            else:
+                self._checkin(worker)
+        finally:
+            self._slots.release()
+        if estado == 'error':
+            raise valor
+        return valor
+
+    def close(self) -> None:
+        """Detiene los procesos ociosos (los ocupados se detienen al terminar)."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _wait(self, worker: _Worker, file_path: str):
+        """Espera la respuesta del proceso vigilando tiempo y memoria."""
+        limite = time.monotonic() + self._timeout if self._timeout else None
+        nombre = os.path.basename(file_path)
+        while True:
+            espera = _POLL_SECONDS if limite is None else min(_POLL_SECONDS, limite - time.monotonic())
+            if espera > 0 and worker.conn.poll(espera):
+                return worker.conn.recv()
+            if limite is not None and time.monotonic() >= limite:
+                raise TimeoutError(f"La extracción de {nombre} superó {self._timeout:g} s")
+            if not worker.process.is_alive():
+                raise EOFError(f"El proceso extractor terminó inesperadamente con {nombre} "
+                               f"(código {worker.process.exitcode})")
+            if self._max_memory and _rss_bytes(worker.process.pid) > self._max_memory:
+                raise MemoryError(f"La extracción de {nombre} superó "
+                                  f"{self._max_memory // (1024 * 1024)} MB")
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _checkout(self) -> _Worker:
+        if self._closed:
+            raise RuntimeError("El pool de extracción está cerrado")
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if worker.process.is_alive():
+                return worker
+            self._discard(worker)
+
+    def _checkin(self, worker: _Worker) -> None:
+        if self._closed or worker.tasks >= self._max_tasks:
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: _Worker, kill: bool = False) -> None:
+        with self._lock:
+            self._all.discard(worker)
+        try:
+            worker.stop(kill=kill)
+        except Exception:
+            pass
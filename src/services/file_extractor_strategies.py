@@ -68,9 +68,15 @@ Versión: 2.0 (con conversión a Markdown)
 
 from abc import ABC, abstractmethod
 import os
-from typing import List
-import pymupdf4llm  # Para convertir PDF a Markdown
-import mammoth  # Para convertir Word a Markdown
+import re
+from typing import List, Optional
+# pymupdf/pymupdf4llm (PDF a Markdown) y mammoth (Word a Markdown) se importan
+# al extraer el primer archivo: importarlos toma casi un segundo y la aplicación
+# web los necesita solo al procesar subidas
+
+# Versión del texto que producen las estrategias: cambiarla al modificar la
+# conversión o _optimize_markdown invalida la caché de textos extraídos
+EXTRACTOR_VERSION = '2'
 
 
 # ============================================================================
@@ -162,12 +168,37 @@ class PDFExtractorStrategy(FileExtractorStrategy):
         - Preserva estructura del documento
         - Mejora precisión de extracción con IA
     
+    Modo rápido (``fast=True``):
+        La conversión a Markdown con análisis de diseño es la parte cara.
+        El caso de uso solo lee el encabezado (asignatura, plan, semestre) y la
+        sección de bibliografía, así que primero se lee el texto plano de cada
+        página (barato) para ubicar las páginas de encabezado y las páginas
+        desde el título "Bibliografía"/"Referencias" hasta el final, y solo
+        esas se convierten a Markdown. Si no se encuentra la bibliografía, o
+        las páginas elegidas son todas, se convierte el documento completo.
+    
     Ejemplo de uso:
         >>> strategy = PDFExtractorStrategy()
         >>> markdown = strategy.extract_text("programa_asignatura.pdf")
         >>> # El texto incluye formato Markdown: # Título, ## Subtítulo, etc.
     """
     
+    # Título de la sección de bibliografía al inicio de una línea
+    _BIBLIOGRAPHY_HEADING = re.compile(r'^\W*(bibliograf[ií]a|referencias)\b',
+                                       re.IGNORECASE | re.MULTILINE)
+    
+    def __init__(self, fast: bool = False, header_chars: int = 3000, max_header_pages: int = 2):
+        """
+        Args:
+            fast (bool): Convierte solo las páginas de encabezado y bibliografía
+            header_chars (int): Texto de encabezado que necesita el caso de uso
+                (el prompt de asignatura usa los primeros 3000 caracteres)
+            max_header_pages (int): Máximo de páginas iniciales tomadas como encabezado
+        """
+        self._fast = fast
+        self._header_chars = header_chars
+        self._max_header_pages = max_header_pages
+    
     def extract_text(self, file_path: str) -> str:
         """
         Extrae el texto de un archivo PDF y lo convierte a Markdown.
@@ -200,7 +231,12 @@ class PDFExtractorStrategy(FileExtractorStrategy):
         try:
             # Convertir PDF a Markdown usando pymupdf4llm
             # Esta librería preserva la estructura del documento
-            markdown_text = pymupdf4llm.to_markdown(file_path)
+            import pymupdf4llm
+
+            if self._fast:
+                markdown_text = self._to_markdown_relevant_pages(file_path)
+            else:
+                markdown_text = pymupdf4llm.to_markdown(file_path)
             
             # Limpiar y optimizar el markdown
             markdown_text = self._optimize_markdown(markdown_text)
@@ -210,6 +246,53 @@ class PDFExtractorStrategy(FileExtractorStrategy):
         except Exception as e:
             raise Exception(f"Error al convertir PDF a Markdown: {str(e)}")
     
+    def _to_markdown_relevant_pages(self, file_path: str) -> str:
+        """
+        Modo rápido: convierte a Markdown solo las páginas de encabezado y de
+        bibliografía (ver docstring de la clase).
+        """
+        import pymupdf
+        import pymupdf4llm
+
+        with pymupdf.open(file_path) as doc:
+            paginas = self._select_pages([page.get_text('text') for page in doc])
+            if paginas is None:
+                return pymupdf4llm.to_markdown(doc)
+            print(f"  -> PDF: convirtiendo {len(paginas)} de {doc.page_count} páginas "
+                  f"(encabezado y bibliografía)")
+            return pymupdf4llm.to_markdown(doc, pages=paginas)
+    
+    def _select_pages(self, textos: List[str]) -> Optional[List[int]]:
+        """
+        Elige las páginas a convertir a partir del texto plano de cada una.
+        
+        Args:
+            textos (List[str]): Texto plano de cada página, en orden
+            
+        Returns:
+            Optional[List[int]]: Índices (base 0) de las páginas a convertir, o
+            None si conviene convertir el documento completo
+        """
+        # Encabezado: páginas iniciales hasta reunir el texto que lee el prompt
+        encabezado, acumulado = [], 0
+        for i, texto in enumerate(textos[:self._max_header_pages]):
+            encabezado.append(i)
+            acumulado += len(texto.strip())
+            if acumulado >= self._header_chars:
+                break
+        
+        # Bibliografía: desde la primera página con el título de la sección
+        # (o que al menos la menciona) hasta el final del documento
+        inicio = next((i for i, t in enumerate(textos) if self._BIBLIOGRAPHY_HEADING.search(t)),
+                      None)
+        if inicio is None:
+            inicio = next((i for i, t in enumerate(textos) if 'bibliograf' in t.lower()), None)
+        if inicio is None:
+            return None
+        
+        paginas = sorted(set(encabezado) | set(range(inicio, len(textos))))
+        return paginas if len(paginas) < len(textos) else None
+    
     def _optimize_markdown(self, text: str) -> str:
         """
         Optimiza el texto Markdown para mejor procesamiento con IA.
@@ -308,6 +391,8 @@ class WordExtractorStrategy(FileExtractorStrategy):
             raise FileNotFoundError(f"El archivo no existe: {file_path}")
         
         try:
+            import mammoth
+
             # Convertir Word a Markdown usando mammoth
             with open(file_path, "rb") as docx_file:
                 result = mammoth.convert_to_markdown(docx_file)
@@ -457,7 +542,7 @@ class FileProcessor:
         return self._strategy.extract_text(file_path)
     
     @staticmethod
-    def create_for_file(file_path: str) -> 'FileProcessor':
+    def create_for_file(file_path: str, pdf_fast: bool = False) -> 'FileProcessor':
         """
         Factory method que crea un FileProcessor con la estrategia apropiada.
         
@@ -468,6 +553,7 @@ class FileProcessor:
         
         Args:
             file_path (str): Ruta al archivo a procesar
+            pdf_fast (bool): Usa el modo rápido de PDFExtractorStrategy
             
         Returns:
             FileProcessor: Procesador configurado con la estrategia apropiada
@@ -494,7 +580,7 @@ class FileProcessor:
         # Mapeo de extensiones a estrategias
         # PRINCIPIO: Open/Closed - Fácil agregar nuevas estrategias aquí
         estrategias = {
-            '.pdf': PDFExtractorStrategy(),
+            '.pdf': PDFExtractorStrategy(fast=pdf_fast),
             '.docx': WordExtractorStrategy()
             # Agregar nuevas estrategias aquí:
             # '.xlsx': ExcelExtractorStrategy(),
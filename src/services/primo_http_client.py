@@ -0,0 +1,217 @@
+"""
+Cliente HTTP del catálogo Primo VE (sin Selenium).
+
+Usa los mismos endpoints JSON que consume la interfaz Angular de Primo:
+  - /primaws/rest/pub/institution/{inst}/guestJwt  → token de invitado
+  - /primaws/rest/pub/pnxs                          → búsqueda (registros PNX)
+
+y traduce el primer registro al mismo diccionario que retorna
+scraper_primo.buscar_libro_detalles().
+
+Diferencia con el scraper: la respuesta de búsqueda trae el estado de cada
+ubicación (disponible, biblioteca, signatura) pero no el conteo de copias que
+la ficha completa muestra como "(N copias, M disponible, ...)". Por eso
+``disponibilidad_fisica`` no incluye "N copias" y el reporte muestra el total
+de ejemplares impresos como "sin dato" en lugar de 0.
+"""
+import re
+import threading
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = 'https://uahurtado.primo.exlibrisgroup.com'
+DEFAULT_VID = '56UAH_INST:56UAH_INST'
+
+# Estados de existencias de Alma → texto mostrado
+_ESTADOS_EXISTENCIAS = {
+    'available': 'Disponible',
+    'unavailable': 'No disponible',
+    'check_holdings': 'Verificar existencias',
+}
+
+# Categorías de entrega que indican acceso en línea
+_CATEGORIAS_ONLINE = ('alma-e', 'alma-d', 'remote search resource')
+
+
+class PrimoHttpClient:
+    """Cliente de búsqueda en Primo sobre una sesión HTTP con conexiones reutilizables."""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, vid: str = DEFAULT_VID,
+                 scope: str = 'MyInst_and_CI', tab: str = 'Everything', lang: str = 'es',
+                 timeout: float = 15, pool_size: int = 10,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            base_url: URL base de Primo (sin barra final)
+            vid: Vista de Primo, "INSTITUCION:VISTA"
+            scope: Alcance de búsqueda
+            tab: Pestaña de búsqueda
+            lang: Idioma de las etiquetas
+            timeout: Segundos por solicitud
+            pool_size: Conexiones HTTP mantenidas abiertas
+            session: Sesión a reutilizar (por defecto una nueva con reintentos)
+        """
+        self._base_url = base_url.rstrip('/')
+        self._vid = vid
+        self._institution = vid.split(':')[0]
+        self._scope = scope
+        self._tab = tab
+        self._lang = lang
+        self._timeout = timeout
+        self._session = session or self._build_session(pool_size)
+        self._token: Optional[str] = None
+        self._token_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        reintentos = Retry(total=2, backoff_factor=0.5,
+                           status_forcelist=(429, 500, 502, 503, 504),
+                           allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=reintentos)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Accept': 'application/json'})
+        return session
+
+    def buscar_libro_detalles(self, termino_busqueda: str) -> Optional[Dict]:
+        """
+        Busca un libro y retorna los detalles del primer resultado.
+
+        Returns:
+            dict con las claves de scraper_primo.buscar_libro_detalles() o None
+            si no hay resultados
+
+        Raises:
+            requests.RequestException: si Primo no responde
+        """
+        docs = self.buscar(termino_busqueda, limit=1)
+        return pnx_a_detalles(docs[0]) if docs else None
+
+    def buscar(self, termino_busqueda: str, limit: int = 10) -> List[dict]:
+        """Retorna los documentos (PNX + entrega) de la búsqueda."""
+        params = {
+            'q': f'any,contains,{termino_busqueda}',
+            'scope': self._scope,
+            'tab': self._tab,
+            'vid': self._vid,
+            'inst': self._institution,
+            'lang': self._lang,
+            'offset': 0,
+            'limit': limit,
+            'sort': 'rank',
+            'skipDelivery': 'N',
+            'getMore': 0,
+            'pcAvailability': 'false',
+            'rtaLinks': 'true',
+            'disableCache': 'false',
+        }
+        respuesta = self._get('/primaws/rest/pub/pnxs', params)
+        return respuesta.json().get('docs') or []
+
+    def _get(self, path: str, params: dict) -> requests.Response:
+        """GET autenticado; renueva el token de invitado una vez si expiró."""
+        for intento in range(2):
+            respuesta = self._session.get(
+                self._base_url + path, params=params, timeout=self._timeout,
+                headers={'Authorization': f'Bearer {self._guest_token(renovar=intento > 0)}'},
+            )
+            if respuesta.status_code != 401:
+                break
+        respuesta.raise_for_status()
+        return respuesta
+
+    def _guest_token(self, renovar: bool = False) -> str:
+        with self._token_lock:
+            if self._token is None or renovar:
+                respuesta = self._session.get(
+                    f'{self._base_url}/primaws/rest/pub/institution/{self._institution}/guestJwt',
+                    params={'isGuest': 'true', 'lang': self._lang, 'viewId': self._vid},
+                    timeout=self._timeout,
+                )
+                respuesta.raise_for_status()
+                # El endpoint retorna el JWT como string JSON ("eyJ...")
+                self._token = respuesta.text.strip().strip('"')
+            return self._token
+
+    def close(self) -> None:
+        self._session.close()
+
+
+# ---------------------------------------------------------------------------
+# Traducción PNX → diccionario de detalles
+# ---------------------------------------------------------------------------
+
+def _primero(valores) -> Optional[str]:
+    """Primer valor de un campo PNX, sin subcampos "$$X"."""
+    if isinstance(valores, str):
+        valores = [valores]
+    for valor in valores or []:
+        limpio = _sin_subcampos(valor)
+        if limpio:
+            return limpio
+    return None
+
+
+def _sin_subcampos(valor: str) -> str:
+    # "Geertz, Clifford$$QGeertz, Clifford" → "Geertz, Clifford"
+    valor = re.sub(r'^\$\$[A-Z]', '', valor or '')
+    return valor.split('$$')[0].strip()
+
+
+def _disponibilidad_fisica(delivery: dict) -> Optional[str]:
+    """Resume las existencias físicas (estado, biblioteca y signatura)."""
+    existencias = delivery.get('holding') or []
+    if not existencias and delivery.get('bestlocation'):
+        existencias = [delivery['bestlocation']]
+    partes = []
+    for h in existencias:
+        estado = _ESTADOS_EXISTENCIAS.get(h.get('availabilityStatus'), h.get('availabilityStatus'))
+        ubicacion = ' '.join(
+            v for v in (h.get('mainLocation') or h.get('libraryCode'), h.get('subLocation'),
+                        h.get('callNumber')) if v
+        )
+        if estado or ubicacion:
+            partes.append(f"{estado or ''} ({ubicacion})".strip() if ubicacion else estado)
+    return '; '.join(partes) or None
+
+
+def _disponibilidad_online(delivery: dict) -> Optional[str]:
+    categorias = [c.lower() for c in delivery.get('deliveryCategory') or []]
+    disponibilidad = [a.lower() for a in delivery.get('availability') or []]
+    if (any(c in _CATEGORIAS_ONLINE for c in categorias)
+            or any('fulltext' in a or 'not_restricted' in a for a in disponibilidad)):
+        return "Disponible en línea"
+    return None
+
+
+def pnx_a_detalles(doc: dict) -> Dict:
+    """Traduce un documento de /pnxs al diccionario de buscar_libro_detalles()."""
+    pnx = doc.get('pnx') or {}
+    display = pnx.get('display') or {}
+    addata = pnx.get('addata') or {}
+    delivery = doc.get('delivery') or {}
+
+    publicacion = _primero(display.get('publisher'))  # "Barcelona : Gedisa"
+    lugar, editor = None, None
+    if publicacion and ':' in publicacion:
+        lugar, editor = (p.strip() for p in publicacion.split(':', 1))
+    else:
+        editor = publicacion
+
+    return {
+        'titulo': _primero(display.get('title')),
+        'autor': _primero(display.get('creator')) or _primero(display.get('contributor'))
+                 or _primero(addata.get('au')),
+        'editor': _primero(addata.get('pub')) or editor,
+        'fecha_creacion': _primero(display.get('creationdate')) or _primero(addata.get('date')),
+        'edicion': _primero(display.get('edition')),
+        'formato': _primero(display.get('format')) or _primero(display.get('type')),
+        'lugar': _primero(addata.get('cop')) or lugar,
+        'disponibilidad_fisica': _disponibilidad_fisica(delivery),
+        'disponibilidad_online': _disponibilidad_online(delivery),
+    }
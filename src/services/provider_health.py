@@ -0,0 +1,200 @@
+"""
+Salud de los proveedores de IA: latencia y errores recientes, con circuit breaker.
+
+Por cada proveedor se guardan las últimas ``window`` llamadas (duración y si
+fallaron). Con ellas:
+
+- ``rank()`` ordena los proveedores por costo esperado: el p95 de latencia
+  penalizado por la tasa de errores. Un proveedor lento o que responde 429/5xx
+  pasa al final en lugar de probarse primero la mitad de las veces.
+- El circuit breaker saca de la rotación a un proveedor tras
+  ``failure_threshold`` fallos seguidos (o una tasa de errores mayor a
+  ``error_rate_threshold``) durante ``cooldown`` segundos. Pasado ese tiempo
+  una sola llamada lo prueba: si responde vuelve a la rotación; si falla, la
+  espera se duplica (hasta ``max_cooldown``).
+"""
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Una llamada fallida cuesta su duración más el reintento en otro proveedor
+_ERROR_PENALTY = 3.0
+
+
+def _percentile(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)."""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, max(0, math.ceil(p / 100 * len(valores)) - 1))]
+
+
+class _ProviderHealth:
+    """Ventana de llamadas recientes y estado del circuito de un proveedor."""
+
+    def __init__(self, window: int, cooldown: float):
+        self.samples = deque(maxlen=window)  # (segundos, ok)
+        self.consecutive_failures = 0
+        self.open_until: Optional[float] = None
+        self.cooldown = cooldown
+        self.probe_started: Optional[float] = None
+
+    def latencies(self) -> List[float]:
+        return sorted(segundos for segundos, _ in self.samples)
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+
+class ProviderHealthTracker:
+    """Métricas por proveedor y circuit breaker, seguro entre hilos."""
+
+    def __init__(self, window: int = 50, failure_threshold: int = 3,
+                 error_rate_threshold: float = 0.5, min_samples: int = 10,
+                 cooldown: float = 30, max_cooldown: float = 300,
+                 tolerance: float = 1.5, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            window: Llamadas recientes consideradas por proveedor
+            failure_threshold: Fallos seguidos que abren el circuito
+            error_rate_threshold: Tasa de errores de la ventana que abre el circuito
+            min_samples: Llamadas mínimas en la ventana para usar la tasa de errores
+            cooldown: Segundos fuera de la rotación antes de la primera prueba
+            max_cooldown: Espera máxima tras pruebas fallidas sucesivas
+            tolerance: Proveedores cuyo costo está a menos de este factor del
+                       mejor se consideran equivalentes (se reparte la carga)
+            clock: Reloj monotónico (inyectable en tests)
+        """
+        self._window = max(1, window)
+        self._failure_threshold = max(1, failure_threshold)
+        self._error_rate_threshold = error_rate_threshold
+        self._min_samples = max(1, min_samples)
+        self._cooldown = cooldown
+        self._max_cooldown = max(cooldown, max_cooldown)
+        self._tolerance = max(1.0, tolerance)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._providers: Dict[str, _ProviderHealth] = {}
+
+    @contextmanager
+    def measure(self, provider_name: str) -> Iterator[None]:
+        """Registra la duración del bloque ``with`` y si terminó con una excepción."""
+        inicio = self._clock()
+        try:
+            yield
+        except Exception:
+            self.record(provider_name, self._clock() - inicio, ok=False)
+            raise
+        self.record(provider_name, self._clock() - inicio, ok=True)
+
+    def record(self, provider_name: str, seconds: float, ok: bool) -> None:
+        """Registra una llamada y actualiza el estado del circuito."""
+        with self._lock:
+            salud = self._health(provider_name)
+            salud.samples.append((seconds, ok))
+            salud.probe_started = None
+            if ok:
+                salud.consecutive_failures = 0
+                if salud.open_until is not None:
+                    # La prueba respondió: vuelve a la rotación con la ventana limpia
+                    salud.open_until = None
+                    salud.cooldown = self._cooldown
+                    salud.samples.clear()
+                    salud.samples.append((seconds, ok))
+                    print(f"[OK] Proveedor de IA {provider_name} vuelve a la rotación")
+                return
+            salud.consecutive_failures += 1
+            if salud.open_until is not None:
+                # Las llamadas que ya estaban en curso al abrirse no alargan la espera
+                if self._clock() >= salud.open_until:
+                    salud.cooldown = min(salud.cooldown * 2, self._max_cooldown)
+                    self._open(provider_name, salud, 'falló la prueba')
+            else:
+                if salud.consecutive_failures >= self._failure_threshold:
+                    self._open(provider_name, salud, f'{salud.consecutive_failures} fallos seguidos')
+                elif (len(salud.samples) >= self._min_samples
+                      and salud.error_rate() >= self._error_rate_threshold):
+                    self._open(provider_name, salud, f'{salud.error_rate():.0%} de errores')
+
+    def is_ejected(self, provider_name: str) -> bool:
+        """True si el proveedor está fuera de la rotación (circuito abierto, sin prueba pendiente)."""
+        with self._lock:
+            salud = self._providers.get(provider_name)
+            return (salud is not None and salud.open_until is not None
+                    and not self._can_probe(salud))
+
+    def rank(self, provider_names: Iterable[str], shuffle_equivalent: bool = True) -> List[str]:
+        """
+        Orden en que conviene probar los proveedores.
+
+        Primero un proveedor a prueba (si su espera terminó), luego los sanos
+        del menor al mayor costo (mezclando los equivalentes si
+        ``shuffle_equivalent``) y al final los que están fuera de la rotación,
+        como último recurso.
+        """
+        with self._lock:
+            ahora = self._clock()
+            prueba, sanos, expulsados = [], [], []
+            for nombre in provider_names:
+                salud = self._health(nombre)
+                if salud.open_until is None:
+                    sanos.append((self._cost(salud), nombre))
+                elif not prueba and self._can_probe(salud):
+                    salud.probe_started = ahora
+                    prueba.append(nombre)
+                else:
+                    expulsados.append((salud.open_until, nombre))
+        sanos.sort()
+        if shuffle_equivalent and sanos:
+            limite = sanos[0][0] * self._tolerance
+            equivalentes = [nombre for costo, nombre in sanos if costo <= limite]
+            random.shuffle(equivalentes)
+            sanos = [(0, nombre) for nombre in equivalentes] + [
+                (costo, nombre) for costo, nombre in sanos if costo > limite]
+        return prueba + [nombre for _, nombre in sanos] + [nombre for _, nombre in sorted(expulsados)]
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Métricas actuales por proveedor (para logs y diagnóstico)."""
+        with self._lock:
+            resultado = {}
+            for nombre, salud in self._providers.items():
+                latencias = salud.latencies()
+                resultado[nombre] = {
+                    'state': 'open' if salud.open_until is not None else 'closed',
+                    'samples': len(salud.samples),
+                    'p50': _percentile(latencias, 50),
+                    'p95': _percentile(latencias, 95),
+                    'error_rate': salud.error_rate(),
+                    'consecutive_failures': salud.consecutive_failures,
+                }
+            return resultado
+
+    def _health(self, provider_name: str) -> _ProviderHealth:
+        salud = self._providers.get(provider_name)
+        if salud is None:
+            salud = self._providers[provider_name] = _ProviderHealth(self._window, self._cooldown)
+        return salud
+
+    def _cost(self, salud: _ProviderHealth) -> float:
+        """p95 de latencia penalizado por errores; 0 sin datos (se prueba pronto)."""
+        return _percentile(salud.latencies(), 95) * (1 + _ERROR_PENALTY * salud.error_rate())
+
+    def _can_probe(self, salud: _ProviderHealth) -> bool:
+        """El circuito está abierto, su espera terminó y no hay otra prueba en curso."""
+        if salud.open_until is None:
+            return False
+        ahora = self._clock()
+        if ahora < salud.open_until:
+            return False
+        # Una prueba que nunca registró resultado (el llamador usó otro proveedor) caduca
+        return salud.probe_started is None or ahora - salud.probe_started >= salud.cooldown
+
+    def _open(self, provider_name: str, salud: _ProviderHealth, motivo: str) -> None:
+        salud.open_until = self._clock() + salud.cooldown
+        print(f"[WARN] Proveedor de IA {provider_name} fuera de la rotación por "
+              f"{salud.cooldown:g} s ({motivo})")
@@ -0,0 +1,65 @@
+"""
+Limitador de tasa tipo token bucket, seguro entre hilos.
+
+El balde se rellena a ``rate`` tokens por segundo hasta ``capacity``; cada
+solicitud consume un token y solo espera cuando el balde está vacío, es decir,
+cuando realmente se supera la tasa acordada.
+"""
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Token bucket compartible por todos los workers de un proceso."""
+
+    def __init__(self, rate: float, capacity: float = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Tokens repuestos por segundo (> 0)
+            capacity: Máximo de tokens acumulables (ráfaga permitida)
+            clock: Reloj monotónico (inyectable en tests)
+            sleep: Función de espera (inyectable en tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate debe ser mayor que 0")
+        self._rate = rate
+        self._capacity = max(1.0, float(capacity))
+        self._tokens = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Consume ``tokens`` (pudiendo quedar en deuda) y retorna la espera necesaria."""
+        with self._lock:
+            ahora = self._clock()
+            self._tokens = min(self._capacity,
+                               self._tokens + (ahora - self._updated) * self._rate)
+            self._updated = ahora
+            self._tokens -= tokens
+            # Con saldo negativo la solicitud espera a que se repongan sus tokens;
+            # las siguientes quedan detrás, en orden de llegada.
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Bloquea hasta disponer de ``tokens``. Retorna los segundos esperados."""
+        espera = self._reserve(tokens)
+        if espera > 0:
+            self._sleep(espera)
+        return espera
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Consume ``tokens`` solo si están disponibles, sin esperar."""
+        with self._lock:
+            ahora = self._clock()
+            self._tokens = min(self._capacity,
+                               self._tokens + (ahora - self._updated) * self._rate)
+            self._updated = ahora
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
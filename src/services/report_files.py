@@ -0,0 +1,89 @@
+"""
+Versiones y variantes comprimidas de los archivos de reporte.
+
+La versión de un archivo es el SHA-256 de su contenido: se usa como ETag y
+solo cambia cuando el reporte cambia de verdad (regenerar el mismo reporte
+no invalida la caché del navegador). El hash se calcula una vez por archivo
+y se recuerda mientras no cambien su tamaño ni su fecha de modificación (solo
+los ``_ETAG_CACHE_SIZE`` archivos usados más recientemente; los reportes
+eliminados por la retención se olvidan con ``forget_etag``).
+
+La variante gzip (``<archivo>.gz``) se escribe al generar el reporte, de modo
+que las descargas comprimidas no gastan CPU por solicitud.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+GZIP_SUFFIX = '.gz'
+_CHUNK = 1024 * 1024
+_ETAG_CACHE_SIZE = 256
+
+_etags: 'OrderedDict[str, Tuple[Tuple[int, int], str]]' = OrderedDict()
+_etags_lock = threading.Lock()
+
+
+def content_etag(path: str) -> str:
+    """ETag (SHA-256 del contenido, abreviado) del archivo."""
+    ruta = os.path.abspath(path)
+    st = os.stat(ruta)
+    firma = (st.st_mtime_ns, st.st_size)
+    with _etags_lock:
+        guardado = _etags.get(ruta)
+        if guardado:
+            _etags.move_to_end(ruta)
+    if guardado and guardado[0] == firma:
+        return guardado[1]
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(_CHUNK), b''):
+            digest.update(bloque)
+    etag = digest.hexdigest()[:32]
+    with _etags_lock:
+        _etags[ruta] = (firma, etag)
+        _etags.move_to_end(ruta)
+        while len(_etags) > _ETAG_CACHE_SIZE:
+            _etags.popitem(last=False)
+    return etag
+
+
+def forget_etag(path: str) -> None:
+    """Descarta el ETag recordado de un archivo (p.ej. al eliminarlo)."""
+    with _etags_lock:
+        _etags.pop(os.path.abspath(path), None)
+
+
+def write_gzip_variant(path: str) -> str:
+    """
+    Escribe ``<path>.gz`` (reemplazo atómico) y retorna su ruta.
+    La cabecera gzip no lleva fecha, así que el mismo contenido da los mismos bytes.
+    """
+    destino = path + GZIP_SUFFIX
+    fd, temporal = tempfile.mkstemp(prefix='.gz_', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with open(path, 'rb') as origen, os.fdopen(fd, 'wb') as salida:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=salida, compresslevel=9,
+                               mtime=0) as comprimido:
+                shutil.copyfileobj(origen, comprimido, _CHUNK)
+        os.replace(temporal, destino)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return destino
+
+
+def gzip_variant(path: str) -> Optional[str]:
+    """Ruta de la variante gzip si existe y no es anterior al archivo original."""
+    destino = path + GZIP_SUFFIX
+    try:
+        if os.stat(destino).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return destino
+    except OSError:
+        pass
+    return None
@@ -5,20 +5,48 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import threading
 import urllib.parse
-import time
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def ruta_chromedriver():
+    """Descarga/ubica el chromedriver una sola vez por proceso."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def crear_driver():
+    """Inicia un Chrome headless listo para buscar en Primo."""
+    # Configura el navegador en modo headless (sin interfaz gráfica)
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(service=Service(ruta_chromedriver()), options=chrome_options)
+
 
 # Función para buscar y extraer información de libros en Primo
-def buscar_libro_detalles(termino_busqueda, verbose=False):
+def buscar_libro_detalles(termino_busqueda, verbose=False, driver=None):
     """
     Busca un libro en el catálogo Primo de la UAH y extrae sus detalles.
     
     Args:
         termino_busqueda (str): Término de búsqueda (título o autor)
         verbose (bool): Si es True, imprime mensajes de depuración
+        driver: Navegador a reutilizar (p.ej. de ChromeDriverPool). Si es None
+                se inicia uno nuevo y se cierra al terminar.
     
     Returns:
-        dict: Diccionario con los detalles del libro o None si hay error
+        dict: Diccionario con los detalles del libro o None si Primo no tiene
+              resultados para el término
               {
                   'titulo': str,
                   'autor': str,
@@ -29,44 +57,56 @@ def buscar_libro_detalles(termino_busqueda, verbose=False):
                   'disponibilidad_fisica': str,
                   'disponibilidad_online': str
               }
-    """
-    # Codifica el término de búsqueda para la URL
-    termino_codificado = urllib.parse.quote(termino_busqueda)
 
-    # Configura el navegador en modo headless (sin interfaz gráfica)
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
+    Raises:
+        Exception: Si el navegador no inicia, la página no carga a tiempo o no
+                   se puede leer la ficha del libro (no equivale a "no encontrado")
+    """
+    if driver is not None:
+        return _buscar_con_driver(driver, termino_busqueda, verbose)
 
     # Inicializa el navegador con las opciones
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        driver = crear_driver()
     except Exception as e:
         if verbose:
             print(f"Error al inicializar el navegador: {e}")
-        return None
+        raise
+
+    # Cerrar el navegador siempre, también en los caminos de error
+    try:
+        return _buscar_con_driver(driver, termino_busqueda, verbose)
+    finally:
+        driver.quit()
+
+
+def _buscar_con_driver(driver, termino_busqueda, verbose=False):
+    """Realiza la búsqueda con un navegador ya iniciado (no lo cierra)."""
+    # Codifica el término de búsqueda para la URL
+    termino_codificado = urllib.parse.quote(termino_busqueda)
 
     # Construye la URL de búsqueda con el término codificado
     url = f'https://uahurtado.primo.exlibrisgroup.com/discovery/search?query=any,contains,{termino_codificado}&tab=Everything&search_scope=MyInst_and_CI&vid=56UAH_INST:56UAH_INST&offset=0'
     
     try:
         driver.get(url)
-        
-        # Pequeña pausa para que la página cargue
-        time.sleep(2)
-        
-        # Espera hasta que los resultados de búsqueda estén visibles
-        WebDriverWait(driver, 20).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, '.list-item-wrapper'))
-        )
+
+        # Espera hasta que aparezcan los resultados o el aviso de búsqueda sin
+        # resultados (lo que ocurra primero, sin pausas fijas)
+        WebDriverWait(driver, 20).until(EC.any_of(
+            EC.visibility_of_element_located((By.CSS_SELECTOR, '.list-item-wrapper')),
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'prm-no-search-result')),
+        ))
     except Exception as e:
-        # No se encontraron resultados
+        # Tiempo agotado o navegador caído: es un error, no un "no encontrado"
+        if verbose:
+            print(f"[ERROR] La búsqueda de {termino_busqueda} no cargó: {e}")
+        raise
+
+    if not driver.find_elements(By.CSS_SELECTOR, '.list-item-wrapper'):
+        # Primo mostró el aviso de búsqueda sin resultados
         if verbose:
             print(f"No se encontraron resultados de búsqueda para: {termino_busqueda}")
-        driver.quit()
         return None
 
     # Encuentra el primer resultado de búsqueda
@@ -137,8 +177,7 @@ def buscar_libro_detalles(termino_busqueda, verbose=False):
         except Exception as e2:
             if verbose:
                 print(f"[ERROR] Error en estrategia alternativa: {e2}")
-            driver.quit()
-            return None
+            raise
 
     # Espera hasta que la página del libro esté completamente cargada
     # Intenta varios selectores para el título
@@ -166,8 +205,7 @@ def buscar_libro_detalles(termino_busqueda, verbose=False):
     if not title_element:
         if verbose:
             print("[ERROR] No se pudo encontrar el título del libro")
-        driver.quit()
-        return None
+        raise LookupError(f"No se pudo cargar la ficha del libro para: {termino_busqueda}")
 
     # Intentar extraer los detalles del libro
     try:
@@ -354,9 +392,6 @@ def buscar_libro_detalles(termino_busqueda, verbose=False):
         if verbose:
             print(f"{'='*60}\n")
         
-        # Cerrar el navegador
-        driver.quit()
-        
         return detalles
     
     except Exception as e:
@@ -364,10 +399,7 @@ def buscar_libro_detalles(termino_busqueda, verbose=False):
             print(f"[ERROR] Error al extraer los detalles del libro: {e}")
             import traceback
             traceback.print_exc()
-        
-        # Cerrar el navegador en caso de error
-        driver.quit()
-        return None
+        raise
 
 # Ejemplo de uso
 if __name__ == '__main__':
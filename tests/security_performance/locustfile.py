@@ -3,7 +3,7 @@ locustfile.py — Pruebas de carga adaptadas a Flask + sesión de formulario
 =========================================================================
 Simula usuarios reales que:
   1. Hacen login con username/password (POST /login) para obtener cookie de sesión
-  2. Navegan por las rutas protegidas: /, /reporte, /api/csv, /download_csv
+  2. Navegan por las rutas protegidas: /, /reporte, /api/report, /api/csv, /download_csv
 
 Uso:
   pip install locust
@@ -94,8 +94,34 @@ class FlaskSessionUser(HttpUser):
                 resp.failure(f"HTTP {resp.status_code}")
 
     @task(3)
+    def api_report_page(self):
+        """GET /api/report — página del reporte desde la BD (la que usa /reporte)."""
+        params = {
+            "page": random.randint(1, 5),
+            "page_size": random.choice([25, 50, 100]),
+            "sort": random.choice(["", "carrera", "asignatura", "titulo", "conteo_global"]),
+            "order": random.choice(["asc", "desc"]),
+        }
+        with self.client.get("/api/report", params=params, name="GET /api/report",
+                             catch_response=True) as resp:
+            if resp.status_code == 302:
+                resp.failure("Sesión expirada en GET /api/report")
+                self._do_login()
+            elif resp.status_code == 200:
+                try:
+                    data = resp.json()
+                    if "total" in data and "rows" in data:
+                        resp.success()
+                    else:
+                        resp.failure("JSON sin campos 'total'/'rows'")
+                except Exception as e:
+                    resp.failure(f"JSON inválido: {e}")
+            else:
+                resp.failure(f"HTTP {resp.status_code}")
+
+    @task(1)
     def api_csv_json(self):
-        """GET /api/csv — endpoint JSON con datos del reporte (más frecuente, simula AJAX)."""
+        """GET /api/csv — endpoint JSON heredado que lee el CSV generado."""
         with self.client.get("/api/csv", name="GET /api/csv", catch_response=True) as resp:
             if resp.status_code == 302:
                 resp.failure("Sesión expirada en GET /api/csv")
@@ -158,7 +184,7 @@ class AnonymousUser(HttpUser):
 
     @task
     def probe_protected_routes(self):
-        routes = ["/", "/reporte", "/api/csv", "/download_csv"]
+        routes = ["/", "/reporte", "/api/report", "/api/csv", "/download_csv"]
         route = random.choice(routes)
         with self.client.get(
             route, name=f"GET {route} [anon]",
@@ -177,7 +203,7 @@ class AnonymousUser(HttpUser):
 def on_test_start(environment, **kwargs):
     print(f"\n[locust] Iniciando prueba de carga contra: {environment.host}")
     print(f"[locust] APP_USER={APP_USER} | APP_PASSWORD={'*' * len(APP_PASSWORD)}")
-    print(f"[locust] Rutas objetivo: /login, /, /reporte, /api/csv, /download_csv\n")
+    print(f"[locust] Rutas objetivo: /login, /, /reporte, /api/report, /api/csv, /download_csv\n")
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
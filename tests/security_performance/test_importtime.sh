@@ -0,0 +1,61 @@
+#!/usr/bin/env bash
+# =============================================================================
+# test_importtime.sh
+# Tiempo de arranque: cuánto tarda en importarse app.py (lo que paga cada
+# worker de gunicorn) y el contenedor (lo que paga cada ejecución por consola),
+# medido con python -X importtime, y qué dependencias pesadas quedan cargadas.
+#
+# Requisitos: python con las dependencias del proyecto
+# Uso: ./test_importtime.sh [REPETICIONES] [TOP]
+# =============================================================================
+
+RUNS="${1:-5}"
+TOP="${2:-15}"
+PYTHON="${PYTHON:-python}"
+ROOT="$(cd "$(dirname "$0")/../.." && pwd)"
+HEAVY="pymupdf pymupdf4llm mammoth selenium webdriver_manager openai google.genai pandas"
+
+CYAN='\033[0;36m'; BOLD='\033[1m'; GREEN='\033[0;32m'; RED='\033[0;31m'; NC='\033[0m'
+
+header() { echo -e "\n${CYAN}${BOLD}══════════════════════════════════════════${NC}"; echo -e "${CYAN}${BOLD}  $1${NC}"; echo -e "${CYAN}${BOLD}══════════════════════════════════════════${NC}"; }
+
+# Importar app ejecuta init_db(): crea la base de datos si no existe
+export APP_USER="${APP_USER:-bench}" APP_PASSWORD="${APP_PASSWORD:-bench}"
+cd "$ROOT" || exit 1
+
+ms() { awk -v us="$1" -v n="${2:-1}" 'BEGIN { printf "%8.1f", us / n / 1000 }'; }
+
+# Tiempo acumulado (µs) del módulo de primer nivel en la salida de -X importtime
+importtime() {
+    "$PYTHON" -X importtime -c "import $1" 2>&1 >/dev/null \
+        | awk -F'|' -v mod="$1" '$3 ~ "^ "mod"$" {gsub(/ /, "", $2); print $2}' | tail -1
+}
+
+for MOD in src.container app; do
+    header "Importar ${MOD} (${RUNS} repeticiones, -X importtime)"
+    TOTAL=0; MIN=""
+    for i in $(seq 1 "$RUNS"); do
+        US=$(importtime "$MOD")
+        [ -z "$US" ] && { echo -e "${RED}No se pudo medir ${MOD}${NC}"; continue 2; }
+        TOTAL=$((TOTAL + US))
+        { [ -z "$MIN" ] || [ "$US" -lt "$MIN" ]; } && MIN=$US
+        echo "  corrida $(printf '%-2s' "$i") $(ms "$US") ms"
+    done
+    echo -e "  ${BOLD}promedio   $(ms "$TOTAL" "$RUNS") ms   mínimo $(ms "$MIN") ms${NC}"
+done
+
+header "Módulos más costosos al importar app (top ${TOP}, acumulado)"
+"$PYTHON" -X importtime -c "import app" 2>&1 >/dev/null \
+    | grep '^import time:' | sort -t'|' -k2 -n | tail -n "$TOP" \
+    | awk -F'|' '{gsub(/ /, "", $2); printf "  %8.1f ms  %s\n", $2 / 1000, $3}'
+
+header "Dependencias pesadas cargadas tras importar app"
+CARGADAS=$("$PYTHON" -c "
+import sys, app
+print(' '.join(m for m in '$HEAVY'.split() if m in sys.modules))" 2>/dev/null | tail -1)
+if [ -z "$CARGADAS" ]; then
+    echo -e "  ${GREEN}Ninguna: se importan al procesar archivos o buscar en el catálogo${NC}"
+else
+    echo -e "  ${RED}Cargadas al arrancar: ${CARGADAS}${NC}"
+    exit 1
+fi
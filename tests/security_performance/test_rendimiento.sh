@@ -31,7 +31,7 @@ curl -sc "$COOKIEJAR" -X POST "$BASE/login" \
 
 FORMAT="\n  DNS:        %{time_namelookup}s\n  Conectar:   %{time_connect}s\n  TTFB:       %{time_starttransfer}s\n  Total:      %{time_total}s\n  HTTP:       %{http_code}\n"
 
-for ENDPOINT in "/" "/reporte" "/api/csv" "/login"; do
+for ENDPOINT in "/" "/reporte" "/api/report" "/api/csv" "/login"; do
     echo -e "\n  ${BOLD}→ $BASE$ENDPOINT${NC}"
     if [[ "$ENDPOINT" == "/login" ]]; then
         curl -so /dev/null -w "$FORMAT" "$BASE$ENDPOINT" 2>/dev/null
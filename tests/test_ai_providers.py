@@ -0,0 +1,158 @@
+"""
+Tests de AIProviderFactory compartido entre hilos, de la sesión HTTP
+reutilizable de OpenAIStrategy y del enrutamiento por salud de los
+proveedores (ProviderHealthTracker).
+"""
+import threading
+from collections import Counter
+
+import pytest
+import requests
+
+from src.services.ai_providers import AIProviderFactory, AIProviderStrategy, OpenAIStrategy
+from src.services.provider_health import ProviderHealthTracker
+
+
+class FakeStrategy(AIProviderStrategy):
+    def __init__(self, nombre, falla=False):
+        self.nombre = nombre
+        self.falla = falla
+        self.llamadas = 0
+        self.closed = False
+
+    def generate_completion(self, prompt, max_tokens=2000, temperature=0.7):
+        self.llamadas += 1
+        if self.falla:
+            raise Exception('503 Service Unavailable')
+        return self.nombre
+
+    def get_provider_name(self):
+        return self.nombre
+
+    def close(self):
+        self.closed = True
+
+
+def test_round_robin_is_even_across_threads():
+    factory = AIProviderFactory({'a': FakeStrategy('a'), 'b': FakeStrategy('b')})
+    elegidos = Counter()
+    lock = threading.Lock()
+
+    def pedir():
+        for _ in range(200):
+            nombre = factory.get_provider().nombre
+            with lock:
+                elegidos[nombre] += 1
+
+    hilos = [threading.Thread(target=pedir) for _ in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert elegidos == {'a': 800, 'b': 800}
+
+
+def test_close_closes_every_provider():
+    proveedores = {'a': FakeStrategy('a'), 'b': FakeStrategy('b')}
+    AIProviderFactory(proveedores).close()
+    assert all(p.closed for p in proveedores.values())
+
+
+def test_openai_strategy_builds_one_tuned_session_per_thread(monkeypatch):
+    import openai
+    from openai import api_requestor
+    monkeypatch.setattr(openai, 'requestssession', None)
+    monkeypatch.setenv('AI_HTTP_POOL_SIZE', '4')
+    estrategia = OpenAIStrategy(api_key='sk-test')
+    fabrica = openai.requestssession
+    # Nunca una Session global: openai la compartiría entre hilos
+    assert callable(fabrica) and not isinstance(fabrica, requests.Session)
+
+    sesiones = []
+    hilos = [threading.Thread(target=lambda: sesiones.append(api_requestor._make_session()))
+             for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+        hilo.join()
+    assert sesiones[0] is not sesiones[1]
+    assert all(s.get_adapter('https://api.openai.com')._pool_maxsize == 4 for s in sesiones)
+
+    # Otra instancia no reemplaza la configuración instalada
+    OpenAIStrategy(api_key='sk-test')
+    assert openai.requestssession is fabrica
+    estrategia.close()
+    assert openai.requestssession is None
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_slow_or_failing_provider_is_tried_last():
+    reloj = Reloj()
+    health = ProviderHealthTracker(clock=reloj)
+    for _ in range(10):
+        health.record('rapido', 1.0, ok=True)
+        health.record('lento', 8.0, ok=True)
+        health.record('con_errores', 1.0, ok=_ % 3 != 0)
+    assert health.rank(['lento', 'con_errores', 'rapido']) == ['rapido', 'con_errores', 'lento']
+    snapshot = health.snapshot()
+    assert snapshot['lento']['p95'] == 8.0
+    assert snapshot['con_errores']['error_rate'] == 0.4
+
+
+def test_equivalent_providers_still_share_the_load():
+    health = ProviderHealthTracker()
+    for _ in range(5):
+        health.record('a', 1.0, ok=True)
+        health.record('b', 1.2, ok=True)
+    primeros = Counter(health.rank(['a', 'b'])[0] for _ in range(200))
+    assert primeros['a'] > 0 and primeros['b'] > 0
+    assert health.rank(['a', 'b'], shuffle_equivalent=False) == ['a', 'b']
+
+
+def test_circuit_opens_after_consecutive_failures_and_probes_back():
+    reloj = Reloj()
+    caido, sano = FakeStrategy('caido', falla=True), FakeStrategy('sano')
+    health = ProviderHealthTracker(failure_threshold=2, cooldown=30, clock=reloj)
+    factory = AIProviderFactory({'caido': caido, 'sano': sano}, health=health)
+
+    for _ in range(2):
+        assert factory.generate_with_fallback('p', preferred_provider='caido') == ('sano', 'sano')
+    assert health.is_ejected('caido')
+    # Fuera de la rotación: ni el preferido ni el balanceo lo usan
+    assert factory.fallback_order('caido') == ['sano', 'caido']
+    assert [factory.get_provider().nombre for _ in range(3)] == ['sano'] * 3
+    factory.generate_with_fallback('p')
+    assert caido.llamadas == 2
+
+    # Pasado el cooldown una sola llamada lo prueba
+    reloj.ahora += 31
+    assert factory.fallback_order() == ['caido', 'sano']
+    assert factory.fallback_order() == ['sano', 'caido']
+    # Una prueba que no llegó a hacerse caduca; si la prueba falla, la espera se duplica
+    reloj.ahora += 30
+    factory.generate_with_fallback('p')
+    assert caido.llamadas == 3 and health.is_ejected('caido')
+    reloj.ahora += 31
+    assert health.is_ejected('caido')
+    reloj.ahora += 30
+
+    caido.falla = False
+    assert factory.generate_with_fallback('p') == ('caido', 'caido')
+    assert not health.is_ejected('caido')
+    assert health.snapshot()['caido']['state'] == 'closed'
+
+
+def test_all_providers_ejected_are_still_tried_as_last_resort():
+    health = ProviderHealthTracker(failure_threshold=1, cooldown=60, clock=Reloj())
+    factory = AIProviderFactory({'a': FakeStrategy('a', falla=True),
+                                 'b': FakeStrategy('b', falla=True)}, health=health)
+    with pytest.raises(Exception):
+        factory.generate_with_fallback('p')
+    factory.providers['b'].falla = False
+    assert factory.generate_with_fallback('p')[1] == 'b'
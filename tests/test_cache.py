@@ -0,0 +1,280 @@
+"""
+Tests de la caché persistente (SQLiteCacheStore) y de los adaptadores de IA,
+catálogo y extracción de texto con caché.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.cache import sqlite_cache_store
+from src.infrastructure.cache.sqlite_cache_store import SQLiteCacheStore
+from src.infrastructure.catalog.cached_catalog_adapter import CachedCatalogAdapter
+from src.infrastructure.file_extractor import CachedFileExtractorAdapter, FileExtractorAdapter
+from src.infrastructure.ai.cached_ai_provider_adapter import (
+    CachedAIProviderAdapter,
+    CachedAsyncAIProviderAdapter,
+)
+from tests.test_process_files_use_case import FakeAI, FakeAsyncAI
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCacheStore(str(tmp_path / 'cache.db'), max_bytes=10_000, default_ttl=60)
+    yield store
+    store.close()
+
+
+def test_get_set_and_stats(store):
+    assert store.get('ai', 'k') is None
+    store.set('ai', 'k', 'respuesta ñ')
+    assert store.get('ai', 'k') == 'respuesta ñ'
+    stats = store.stats('ai')
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_entries_expire_after_ttl(store, monkeypatch):
+    reloj = [1000.0]
+    monkeypatch.setattr(sqlite_cache_store.time, 'time', lambda: reloj[0])
+    store.set('catalog', 'a', 'x', ttl=10)
+    store.set('catalog', 'b', 'y', ttl=None)
+    reloj[0] += 11
+    assert store.get('catalog', 'a') is None
+    assert store.get('catalog', 'b') == 'y'
+
+
+def test_least_recently_used_entries_are_evicted(store, monkeypatch):
+    reloj = [1000.0]
+    monkeypatch.setattr(sqlite_cache_store.time, 'time', lambda: reloj[0])
+
+    def valor():
+        # Hexadecimal aleatorio: ~2.8 KB comprimido
+        return os.urandom(2500).hex()
+
+    for i in range(3):
+        reloj[0] += 1
+        store.set('ai', f'k{i}', valor())
+    reloj[0] += 1
+    store.get('ai', 'k0')  # k0 pasa a ser la más reciente
+    reloj[0] += 1
+    store.set('ai', 'k3', valor())
+
+    assert store.stats()['bytes'] <= 10_000
+    assert store.get('ai', 'k1') is None
+    assert all(store.get('ai', k) is not None for k in ('k0', 'k2', 'k3'))
+
+
+def test_processes_sharing_the_file_respect_max_bytes_together(tmp_path):
+    # Dos workers de gunicorn: cada uno escribe por debajo del límite por sí solo
+    path = str(tmp_path / 'cache.db')
+    a = SQLiteCacheStore(path, max_bytes=10_000)
+    b = SQLiteCacheStore(path, max_bytes=10_000)
+    try:
+        for i in range(6):
+            (a if i % 2 else b).set('ai', f'k{i}', os.urandom(2500).hex())
+            assert a.stats()['bytes'] <= 10_000
+        a.set('ai', 'k0', 'reemplazo')
+        b.delete('ai', 'k5')
+        assert a.stats()['bytes'] == b._total_size()
+    finally:
+        a.close()
+        b.close()
+
+
+def test_values_survive_reopening(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    store = SQLiteCacheStore(path)
+    store.set('ai', 'k', 'v')
+    store.close()
+    assert SQLiteCacheStore(path).get('ai', 'k') == 'v'
+
+
+def test_cached_adapter_reuses_responses(store):
+    inner = FakeAI()
+    ai = CachedAIProviderAdapter(inner, store, {'gemini': 'g-1', 'openai': 'o-1'})
+    prompt = 'Asignatura: Antropología\nTEXTO DE BIBLIOGRAFÍA'
+
+    primera = ai.generate_with_provider('gemini', prompt, max_tokens=100, temperature=0.1)
+    assert ai.generate_with_provider('gemini', prompt, max_tokens=100, temperature=0.1) == primera
+    assert inner.calls == 1
+
+    # Otro proveedor, temperatura o max_tokens son otra clave
+    ai.generate_with_provider('openai', prompt, max_tokens=100, temperature=0.1)
+    ai.generate_with_provider('gemini', prompt, max_tokens=100, temperature=0.2)
+    ai.generate_with_provider('gemini', prompt, max_tokens=200, temperature=0.1)
+    assert inner.calls == 4
+
+    assert ai.generate_with_fallback(prompt) == ai.generate_with_fallback(prompt)
+    assert inner.calls == 5
+    assert ai.stats()['hits'] == 2
+
+    # Cambiar el modelo configurado invalida las respuestas anteriores
+    otro = CachedAIProviderAdapter(inner, store, {'gemini': 'g-2', 'openai': 'o-1'})
+    otro.generate_with_provider('gemini', prompt, max_tokens=100, temperature=0.1)
+    assert inner.calls == 6
+
+
+def test_cached_async_adapter_shares_entries_with_sync_adapter(store):
+    prompt = 'Asignatura: Sociología'
+    CachedAIProviderAdapter(FakeAI(), store, {'gemini': 'g-1'}).generate_with_fallback(prompt)
+
+    inner = FakeAsyncAI()
+    ai = CachedAsyncAIProviderAdapter(inner, store, {'gemini': 'g-1'})
+    respuesta, _ = asyncio.run(ai.generate_with_fallback(prompt))
+    assert '"subject"' in respuesta
+    assert inner.max_in_flight == 0
+
+
+class CountingCatalog:
+    def __init__(self, resultados):
+        self.resultados = resultados
+        self.calls = []
+
+    def search(self, term):
+        self.calls.append(term)
+        return self.resultados.get(term)
+
+
+def test_catalog_cache_uses_normalized_term_and_caches_not_found(store):
+    inner = CountingCatalog({'La Miseria del Mundo Pierre Bourdieu': {'titulo': 'La miseria del mundo'}})
+    catalog = CachedCatalogAdapter(inner, store, ttl=60, negative_ttl=60)
+
+    assert catalog.search('La Miseria del Mundo Pierre Bourdieu') == {'titulo': 'La miseria del mundo'}
+    assert catalog.search('la miseria del  mundo, Pierre Bourdieu.') == {'titulo': 'La miseria del mundo'}
+    assert catalog.search('Libro inexistente') is None
+    assert catalog.search('LIBRO INEXISTENTE') is None
+
+    assert inner.calls == ['La Miseria del Mundo Pierre Bourdieu', 'Libro inexistente']
+    stats = catalog.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 2, 2)
+
+
+def test_catalog_cache_not_found_expires_before_found(store, monkeypatch):
+    inner = CountingCatalog({'Geertz': {'titulo': 'La interpretación de las culturas'}})
+    catalog = CachedCatalogAdapter(inner, store, ttl=3600, negative_ttl=10)
+    catalog.search('Geertz')
+    catalog.search('Nada')
+
+    ahora = sqlite_cache_store.time.time()
+    monkeypatch.setattr(sqlite_cache_store.time, 'time', lambda: ahora + 60)
+    catalog.search('Geertz')
+    catalog.search('Nada')
+    assert inner.calls == ['Geertz', 'Nada', 'Nada']
+
+
+def test_catalog_cache_does_not_store_errors(store):
+    class FailingCatalog:
+        def __init__(self):
+            self.calls = 0
+
+        def search(self, term):
+            self.calls += 1
+            raise RuntimeError('timeout')
+
+    inner = FailingCatalog()
+    catalog = CachedCatalogAdapter(inner, store)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            catalog.search('Giddens')
+    assert inner.calls == 2
+
+
+def test_catalog_cache_keeps_single_flight_while_threads_wait(store):
+    class GatedCatalog:
+        """La primera búsqueda falla y la segunda tarda; registra las búsquedas simultáneas."""
+
+        def __init__(self):
+            self.calls = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.entered = [threading.Event(), threading.Event()]
+            self.release = [threading.Event(), threading.Event()]
+            self._lock = threading.Lock()
+
+        def search(self, term):
+            with self._lock:
+                n = self.calls
+                self.calls += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.entered[n].set()
+            self.release[n].wait(5)
+            with self._lock:
+                self.in_flight -= 1
+            if n == 0:
+                raise RuntimeError('timeout')
+            return {'titulo': term}
+
+    inner = GatedCatalog()
+    catalog = CachedCatalogAdapter(inner, store)
+    resultados = []
+
+    def buscar():
+        try:
+            resultados.append(catalog.search('Giddens'))
+        except RuntimeError:
+            resultados.append('error')
+
+    hilos = [threading.Thread(target=buscar) for _ in range(3)]
+    hilos[0].start()
+    assert inner.entered[0].wait(5)
+    hilos[1].start()
+    time.sleep(0.05)  # el segundo hilo espera el candado del término
+    inner.release[0].set()
+    assert inner.entered[1].wait(5)
+    # Llega un tercero mientras el segundo consulta: debe esperar, no buscar en paralelo
+    hilos[2].start()
+    time.sleep(0.05)
+    inner.release[1].set()
+    for hilo in hilos:
+        hilo.join(5)
+
+    assert inner.calls == 2
+    assert inner.max_in_flight == 1
+    assert resultados.count('error') == 1
+    assert resultados.count({'titulo': 'Giddens'}) == 2
+
+
+class CountingExtractor(FileExtractorAdapter):
+    def __init__(self, pdf_fast=False):
+        super().__init__(pdf_fast=pdf_fast)
+        self.calls = 0
+
+    def extract(self, file_path):
+        self.calls += 1
+        with open(file_path, encoding='utf-8') as f:
+            return f'# {f.read()}'
+
+
+def test_extracted_text_is_cached_by_content_and_extractor_version(store, tmp_path):
+    inner = CountingExtractor()
+    extractor = CachedFileExtractorAdapter(inner, store)
+    ruta = tmp_path / 'programa.pdf'
+    ruta.write_text('Sociología', encoding='utf-8')
+    copia = tmp_path / 'copia.pdf'
+    copia.write_text('Sociología', encoding='utf-8')
+
+    assert extractor.extract(str(ruta)) == '# Sociología'
+    # Mismo contenido con otro nombre: desde caché
+    assert extractor.extract(str(copia)) == '# Sociología'
+    assert inner.calls == 1
+    ruta.write_text('Sociología II', encoding='utf-8')
+    assert extractor.extract(str(ruta)) == '# Sociología II'
+    assert inner.calls == 2
+    # Otro modo de extracción de PDF no reutiliza los textos
+    rapido = CountingExtractor(pdf_fast=True)
+    CachedFileExtractorAdapter(rapido, store).extract(str(copia))
+    assert rapido.calls == 1
+    assert extractor.stats()['hits'] == 1
+
+
+def test_extraction_errors_are_not_cached(store, tmp_path):
+    extractor = CachedFileExtractorAdapter(FileExtractorAdapter(), store)
+    with pytest.raises(Exception):
+        extractor.extract(str(tmp_path / 'no_existe.pdf'))
+    with pytest.raises(ValueError):
+        extractor.extract(str(tmp_path / 'planilla.xlsx'))
+    assert store.stats('extract')['entries'] == 0
@@ -0,0 +1,153 @@
+"""
+Tests del pool de navegadores (ChromeDriverPool) con navegadores falsos.
+"""
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.catalog.primo_catalog_adapter import PrimoCatalogAdapter
+from src.infrastructure.catalog import primo_catalog_adapter
+from src.services.chrome_driver_pool import ChromeDriverPool
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.quit_called = False
+        self.crashed = False
+
+    def execute_script(self, script):
+        if self.crashed:
+            raise RuntimeError('invalid session id')
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.created = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            driver = FakeDriver(len(self.created))
+            self.created.append(driver)
+            return driver
+
+
+def test_drivers_are_reused_and_recycled_after_max_uses():
+    factory = Factory()
+    pool = ChromeDriverPool(size=2, max_uses=3, driver_factory=factory)
+    for _ in range(3):
+        with pool.lease() as driver:
+            assert driver is factory.created[0]
+    assert factory.created[0].quit_called
+
+    with pool.lease() as driver:
+        assert driver is factory.created[1]
+    assert len(factory.created) == 2
+    assert pool.alive == 1
+
+
+def test_crashed_or_failing_drivers_are_replaced():
+    factory = Factory()
+    pool = ChromeDriverPool(size=1, driver_factory=factory)
+    with pool.lease() as driver:
+        driver.crashed = True
+    with pool.lease() as driver:
+        assert driver.n == 1
+    assert factory.created[0].quit_called
+
+    with pytest.raises(ValueError):
+        with pool.lease():
+            raise ValueError('falló la búsqueda')
+    assert factory.created[1].quit_called
+    assert pool.alive == 0
+
+
+def test_pool_bounds_concurrent_browsers():
+    factory = Factory()
+    pool = ChromeDriverPool(size=2, driver_factory=factory)
+    en_uso, maximo = [0], [0]
+    lock = threading.Lock()
+
+    def buscar():
+        with pool.lease():
+            with lock:
+                en_uso[0] += 1
+                maximo[0] = max(maximo[0], en_uso[0])
+            time.sleep(0.02)
+            with lock:
+                en_uso[0] -= 1
+
+    hilos = [threading.Thread(target=buscar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert maximo[0] == 2
+    assert len(factory.created) == 2
+    pool.close()
+    assert all(d.quit_called for d in factory.created)
+
+
+def test_adapter_passes_leased_driver_to_scraper(monkeypatch):
+    factory = Factory()
+    recibidos = []
+
+    def fake_buscar(termino, verbose=False, driver=None):
+        recibidos.append(driver)
+        return {'titulo': termino}
+
+    monkeypatch.setattr(primo_catalog_adapter, 'buscar_libro_detalles', fake_buscar)
+    adapter = PrimoCatalogAdapter(ChromeDriverPool(size=1, driver_factory=factory))
+    assert adapter.search('Geertz') == {'titulo': 'Geertz'}
+    adapter.search('Bourdieu')
+    assert recibidos == [factory.created[0]] * 2
+
+
+class SearchPageDriver(FakeDriver):
+    """Página de resultados de Primo que solo muestra el aviso "sin resultados"."""
+
+    def __init__(self):
+        super().__init__(0)
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+        if selector == 'prm-no-search-result':
+            return object()
+        raise NoSuchElementException(selector)
+
+    def find_elements(self, by, selector):
+        return []
+
+
+def test_scraper_returns_none_only_when_primo_shows_no_results(monkeypatch):
+    from selenium.common.exceptions import TimeoutException
+    from src.services import scraper_primo
+
+    assert scraper_primo.buscar_libro_detalles('Libro inexistente', driver=SearchPageDriver()) is None
+
+    class SlowWait:
+        def __init__(self, driver, timeout):
+            pass
+
+        def until(self, condition):
+            raise TimeoutException('Primo no respondió')
+
+    monkeypatch.setattr(scraper_primo, 'WebDriverWait', SlowWait)
+    with pytest.raises(TimeoutException):
+        scraper_primo.buscar_libro_detalles('Geertz', driver=SearchPageDriver())
+
+    # El adaptador propaga el error y el pool descarta el navegador
+    pool = ChromeDriverPool(size=1, driver_factory=SearchPageDriver)
+    with pytest.raises(TimeoutException):
+        PrimoCatalogAdapter(pool).search('Geertz')
+    assert pool.alive == 0
@@ -0,0 +1,102 @@
+"""
+Tests del pool de procesos extractores (ExtractionProcessPool): extrae en
+otros procesos, propaga errores y reemplaza los procesos que exceden
+tiempo o memoria.
+"""
+import pymupdf
+import pytest
+
+from src.infrastructure.file_extractor import FileExtractorAdapter
+from src.services.extraction_pool import ExtractionProcessPool
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    ruta = tmp_path / 'programa.pdf'
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), 'Sociologia General\nBibliografia\nWeber, Max')
+    doc.save(str(ruta))
+    doc.close()
+    return str(ruta)
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionProcessPool(size=2, timeout=60, max_memory_mb=None, max_tasks=2)
+    yield pool
+    pool.close()
+
+
+def test_extracts_in_worker_processes_and_recycles_them(pool, pdf):
+    adapter = FileExtractorAdapter(pool=pool)
+    esperado = FileExtractorAdapter().extract(pdf)
+    assert 'Weber' in esperado
+    assert [adapter.extract(pdf) for _ in range(3)] == [esperado] * 3
+    # Un proceso se reinició tras max_tasks archivos; el otro quedó ocioso
+    assert pool.alive == 1
+
+
+def test_extraction_errors_are_raised_and_keep_the_worker(tmp_path):
+    pool = ExtractionProcessPool(size=2, timeout=60, max_memory_mb=None)
+    try:
+        with pytest.raises(ValueError):
+            pool.extract(str(tmp_path / 'planilla.xlsx'))
+        with pytest.raises(Exception):
+            pool.extract(str(tmp_path / 'no_existe.pdf'))
+        assert pool.alive == 1
+    finally:
+        pool.close()
+
+
+def test_timeout_kills_the_worker(pdf):
+    pool = ExtractionProcessPool(size=1, timeout=0.001, max_memory_mb=None)
+    try:
+        with pytest.raises(TimeoutError):
+            pool.extract(pdf)
+        assert pool.alive == 0
+    finally:
+        pool.close()
+
+
+def test_worker_over_memory_ceiling_is_replaced(pdf):
+    pool = ExtractionProcessPool(size=1, timeout=60, max_memory_mb=1)
+    try:
+        try:
+            pool.extract(pdf)
+        except MemoryError:
+            pass  # excedió el límite antes de terminar
+        assert pool.alive == 0
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize('valor, esperado', [('auto', -1), ('3', 3), ('0', 0), ('', 0),
+                                             ('dos', 0), ('-2', 0)])
+def test_extraction_processes_setting_falls_back_to_no_pool(monkeypatch, valor, esperado):
+    from src import container
+    monkeypatch.setenv('EXTRACTION_PROCESSES', valor)
+    assert container._extraction_processes() == esperado
+    if esperado == 0:
+        assert container._shared_extraction_pool() is None
+
+
+def test_numeric_settings_fall_back_to_default_with_a_warning(monkeypatch, capsys):
+    from src.config import env_float, env_int
+    monkeypatch.setenv('EXTRACTION_MAX_TASKS', '50 tareas')
+    monkeypatch.setenv('EXTRACTION_TIMEOUT_SECONDS', '2,5')
+    assert env_int('EXTRACTION_MAX_TASKS', 50) == 50
+    assert env_float('EXTRACTION_TIMEOUT_SECONDS', 120) == 120
+    assert capsys.readouterr().out.count('[WARN]') == 2
+
+    monkeypatch.setenv('EXTRACTION_TIMEOUT_SECONDS', '2.5')
+    assert env_float('EXTRACTION_TIMEOUT_SECONDS', 120) == 2.5
+    assert capsys.readouterr().out == ''
+
+
+def test_container_starts_with_misspelled_numeric_settings(monkeypatch):
+    from src import container
+    monkeypatch.setenv('PROCESS_MAX_WORKERS', 'cuatro')
+    monkeypatch.setenv('PROCESS_MODE', 'pipeline')
+    monkeypatch.setenv('PIPELINE_QUEUE_SIZE', '8k')
+    assert container._process_max_workers() == 1
+    assert container._pipeline_options()['queue_size'] == 8
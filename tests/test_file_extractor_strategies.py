@@ -0,0 +1,54 @@
+"""
+Tests del modo rápido de PDFExtractorStrategy: solo se convierten a Markdown
+las páginas de encabezado y de bibliografía.
+"""
+import pymupdf
+
+from src.services.file_extractor_strategies import PDFExtractorStrategy
+
+
+def _pdf(path, paginas):
+    doc = pymupdf.open()
+    for texto in paginas:
+        doc.new_page().insert_text((72, 72), texto)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_fast_mode_converts_only_header_and_bibliography(tmp_path):
+    ruta = _pdf(tmp_path / 'programa.pdf', [
+        'PROGRAMA DE ASIGNATURA\nSociologia General',
+        'Unidad 1\nContenidos de la unidad uno',
+        'Unidad 2\nContenidos de la unidad dos',
+        'Unidad 3\nContenidos de la unidad tres',
+        'Bibliografia\nWeber, Max. Economia y sociedad',
+        'Durkheim, Emile. Las reglas del metodo',
+    ])
+    completo = PDFExtractorStrategy().extract_text(ruta)
+    rapido = PDFExtractorStrategy(fast=True).extract_text(ruta)
+
+    for texto in ('Sociologia General', 'Unidad 2', 'Weber', 'Durkheim'):
+        assert texto in completo
+    for texto in ('PROGRAMA DE ASIGNATURA', 'Sociologia General', 'Weber', 'Durkheim'):
+        assert texto in rapido
+    # El encabezado es corto: se toman las dos primeras páginas
+    assert 'Unidad 1' in rapido
+    assert 'Unidad 2' not in rapido and 'Unidad 3' not in rapido
+
+
+def test_fast_mode_without_bibliography_converts_everything(tmp_path):
+    ruta = _pdf(tmp_path / 'sin_bibliografia.pdf',
+                ['Programa', 'Unidad 1', 'Unidad 2', 'Unidad 3'])
+    rapido = PDFExtractorStrategy(fast=True).extract_text(ruta)
+    assert all(f'Unidad {i}' in rapido for i in (1, 2, 3))
+
+
+def test_select_pages():
+    strategy = PDFExtractorStrategy(fast=True, header_chars=10)
+    textos = ['x' * 20, 'a', 'b', '  REFERENCIAS\nAutor', 'c']
+    assert strategy._select_pages(textos) == [0, 3, 4]
+    # Sin título, basta con que la página mencione la bibliografía
+    assert strategy._select_pages(['x' * 20, 'a', 'ver bibliografía', 'c']) == [0, 2, 3]
+    # Si se eligen todas las páginas, se convierte el documento completo
+    assert strategy._select_pages(['x' * 20, 'Bibliografía']) is None
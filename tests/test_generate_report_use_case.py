@@ -0,0 +1,220 @@
+"""
+Tests del reporte consolidado: consulta SQL única y escritura CSV en streaming.
+"""
+import gzip
+import os
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.acquisition import Acquisition
+from src.domain.entities.report_row import ReportQuery, ReportRow
+from src.domain.entities.title import Title
+from src.domain.use_cases.generate_report_use_case import COPIAS_SIN_DATO, GenerateReportUseCase
+from src.domain.use_cases.query_report_use_case import QueryReportUseCase
+from src.infrastructure.database.db import Base
+from src.infrastructure.report.csv_report_adapter import CsvReportAdapter
+from src.services.report_files import content_etag, gzip_variant
+from src.infrastructure.database.sqlalchemy_repositories import (
+    SQLAlchemyAdquisicionRepository,
+    SQLAlchemyAsignaturaRepository,
+    SQLAlchemyCarreraRepository,
+    SQLAlchemyReportRepository,
+    SQLAlchemyTituloRepository,
+)
+
+
+class CapturingReport:
+    def __init__(self):
+        self.data = None
+
+    def generate(self, data, scope='general'):
+        self.data = list(data)
+        self.scope = scope
+        return 'reporte.csv'
+
+
+def _poblar(session):
+    carreras = SQLAlchemyCarreraRepository(session)
+    asignaturas = SQLAlchemyAsignaturaRepository(session)
+    titulos = SQLAlchemyTituloRepository(session)
+    adquisiciones = SQLAlchemyAdquisicionRepository(session)
+
+    ts = carreras.get_or_create('Trabajo Social')
+    soc = carreras.get_or_create('Sociología')
+    teoria = asignaturas.get_or_create('Teoría social', ts)
+    metodos = asignaturas.get_or_create('Métodos', ts)
+    clasica = asignaturas.get_or_create('Sociología clásica', soc)
+
+    geertz = titulos.save(Title(normalized_author='Geertz, Clifford',
+                                normalized_title='La interpretación de las culturas',
+                                physical_availability='(3 copias, 3 disponible, 0 solicitudes)',
+                                type_bib='basic'))
+    bourdieu = titulos.save(Title(normalized_author='Bourdieu, Pierre',
+                                  normalized_title='La miseria del mundo', type_bib='complementary'))
+    adquisiciones.save(Acquisition(title_id=geertz.id, status='disponible',
+                                   available_printed=True))
+    for asignatura in (teoria, metodos, clasica):
+        titulos.link_to_subject(geertz, asignatura)
+    titulos.link_to_subject(bourdieu, metodos)
+
+
+def test_report_rows_come_from_one_query_with_window_counts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _poblar(session)
+    session.expire_all()
+
+    consultas = []
+    event.listen(engine, 'before_cursor_execute', lambda *a: consultas.append(a[2]))
+    reporte = CapturingReport()
+    GenerateReportUseCase(SQLAlchemyReportRepository(session), reporte).execute()
+
+    assert len(consultas) == 1
+    filas = [(f['Carrera '], f['Asignatura '], f['Autor (Apellido, Nombre) '],
+              f['Título asociado a carrera'], f['Título asociado a asignatura '],
+              f['Total de ejemplares en catalogo impresos'], f['Títulos en Biblioteca'])
+             for f in reporte.data]
+    assert filas == [
+        ('Trabajo Social', 'Teoría social', 'Geertz, Clifford', 2, 3, 3, 1),
+        ('Trabajo Social', 'Métodos', 'Geertz, Clifford', 2, 3, 3, 1),
+        ('Trabajo Social', 'Métodos', 'Bourdieu, Pierre', 1, 1, 0, 0),
+        ('Sociología', 'Sociología clásica', 'Geertz, Clifford', 1, 3, 3, 1),
+    ]
+    bourdieu = reporte.data[2]
+    assert (bourdieu['Basica '], bourdieu['Complementaria '], bourdieu['Idioma']) == (0, 1, 'Español')
+    assert reporte.scope == 'general'
+
+    query = ReportQuery(carrera='Sociología')
+    GenerateReportUseCase(SQLAlchemyReportRepository(session), reporte).execute(query)
+    assert [f['Asignatura '] for f in reporte.data] == ['Sociología clásica']
+    assert reporte.scope == query.scope()
+
+
+@pytest.fixture
+def query_use_case(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _poblar(session)
+    session.expire_all()
+    return QueryReportUseCase(SQLAlchemyReportRepository(session))
+
+
+def _resumen(pagina):
+    return [(f['Asignatura '], f['Autor (Apellido, Nombre) ']) for f in pagina['rows']]
+
+
+@pytest.mark.parametrize('disponibilidad, copias, formato', [
+    ('(3 copias, 3 disponible, 0 solicitudes)', 3, 'Impreso'),
+    # Cliente HTTP de Primo: hay existencias pero no el conteo de copias
+    ('Disponible (Biblioteca Central Colección general 306 G298i)', COPIAS_SIN_DATO, 'Impreso'),
+    (None, 0, ''),
+])
+def test_report_distinguishes_unknown_copy_count_from_none(disponibilidad, copias, formato):
+    fila = GenerateReportUseCase.row_to_dict(ReportRow(
+        'Ciencias Sociales', 'Trabajo Social', 'Teoría social', '2024', 'I',
+        Title('Geertz, Clifford', 'La interpretación de las culturas',
+              physical_availability=disponibilidad)))
+    assert fila['Total de ejemplares en catalogo impresos'] == copias
+    assert fila['Tipo de Formato'] == formato
+
+
+def test_report_api_pages_in_csv_order_with_total(query_use_case):
+    primera = query_use_case.execute(ReportQuery(page=1, page_size=3))
+    segunda = query_use_case.execute(ReportQuery(page=2, page_size=3))
+
+    assert (primera['total'], primera['pages'], segunda['total']) == (4, 2, 4)
+    assert _resumen(primera) + _resumen(segunda) == [
+        ('Teoría social', 'Geertz, Clifford'),
+        ('Métodos', 'Geertz, Clifford'),
+        ('Métodos', 'Bourdieu, Pierre'),
+        ('Sociología clásica', 'Geertz, Clifford'),
+    ]
+    assert primera['headers'] == list(primera['rows'][0])
+    # Los conteos de uso son globales aunque la fila caiga en otra página
+    assert segunda['rows'][0]['Título asociado a asignatura '] == 3
+
+
+def test_report_api_filters_and_sorts_in_the_database(query_use_case):
+    pagina = query_use_case.execute(ReportQuery(carrera='Trabajo Social', sort='autor'))
+    assert _resumen(pagina) == [('Métodos', 'Bourdieu, Pierre'),
+                                ('Teoría social', 'Geertz, Clifford'),
+                                ('Métodos', 'Geertz, Clifford')]
+
+    pagina = query_use_case.execute(ReportQuery(sort='asignatura', descending=True,
+                                                disponibilidad='impreso'))
+    assert [a for a, _ in _resumen(pagina)] == ['Teoría social', 'Sociología clásica', 'Métodos']
+
+    assert _resumen(query_use_case.execute(ReportQuery(disponibilidad='no_disponible'))) == [
+        ('Métodos', 'Bourdieu, Pierre')]
+    assert query_use_case.execute(ReportQuery(asignatura='clásica'))['total'] == 1
+    assert query_use_case.execute(ReportQuery(texto='miseria'))['total'] == 1
+    assert query_use_case.execute(ReportQuery(texto='100%'))['total'] == 0
+    assert query_use_case.list_careers() == {'Ciencias Sociales': ['Sociología', 'Trabajo Social']}
+
+
+@pytest.mark.parametrize('query', [
+    ReportQuery(page=0), ReportQuery(page_size=501), ReportQuery(sort='id; DROP TABLE'),
+    ReportQuery(disponibilidad='quizás'),
+])
+def test_report_api_rejects_invalid_queries(query_use_case, query):
+    with pytest.raises(ValueError):
+        query_use_case.execute(query)
+
+
+def test_csv_adapter_streams_rows_with_bom_and_semicolons(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    consumidas = []
+
+    def filas():
+        for i in range(3):
+            consumidas.append(i)
+            yield {'Autor': f'Autor; {i}', 'Año': 2000 + i, 'Notas': None}
+
+    ruta = CsvReportAdapter().generate(filas())
+
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    assert contenido.startswith(b'\xef\xbb\xbf')
+    lineas = contenido.decode('utf-8-sig').split(os.linesep)
+    assert lineas[:4] == ['Autor;Año;Notas', '"Autor; 0";2000;', '"Autor; 1";2001;',
+                          '"Autor; 2";2002;']
+    assert consumidas == [0, 1, 2]
+
+
+def test_csv_adapter_keeps_previous_report_when_writing_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / CsvReportAdapter.DEFAULT_FILENAME).write_text('anterior', encoding='utf-8')
+
+    def filas():
+        yield {'Autor': 'Geertz'}
+        raise RuntimeError('conexión perdida')
+
+    with pytest.raises(RuntimeError):
+        CsvReportAdapter().generate(filas())
+
+    assert (tmp_path / CsvReportAdapter.DEFAULT_FILENAME).read_text(encoding='utf-8') == 'anterior'
+    assert os.listdir(tmp_path) == [CsvReportAdapter.DEFAULT_FILENAME]
+
+
+def test_generated_report_has_content_etag_and_fresh_gzip_variant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ruta = CsvReportAdapter().generate({'Autor': f'Autor {i}'} for i in range(100))
+    etag = content_etag(ruta)
+
+    with open(gzip_variant(ruta), 'rb') as f:
+        with open(ruta, 'rb') as original:
+            assert gzip.decompress(f.read()) == original.read()
+
+    # Regenerar el mismo contenido no cambia la versión; otro contenido sí
+    CsvReportAdapter().generate({'Autor': f'Autor {i}'} for i in range(100))
+    assert content_etag(ruta) == etag
+    CsvReportAdapter().generate({'Autor': f'Autor {i}'} for i in range(101))
+    assert content_etag(ruta) != etag
+
+    # Una variante gzip anterior al CSV no se entrega
+    os.utime(ruta + '.gz', ns=(0, 0))
+    assert gzip_variant(ruta) is None
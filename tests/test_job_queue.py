@@ -0,0 +1,168 @@
+"""
+Tests de la cola de trabajos en segundo plano (SubmitProcessingJobUseCase +
+ThreadPoolJobQueue) con la bitácora real en SQLite.
+"""
+import subprocess
+import sys
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.job import (
+    Job, JobFile, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED, EVENT_JOB_FINISHED,
+)
+from src.domain.use_cases.submit_processing_job_use_case import SubmitProcessingJobUseCase
+from src.infrastructure.database.db import Base
+from src.infrastructure.database.sqlalchemy_repositories import (
+    SQLAlchemyJobRepository,
+    SQLAlchemyJobEventRepository,
+)
+from src.infrastructure.jobs import ThreadPoolJobQueue, current_worker_id, is_worker_alive
+
+
+class BlockingProcess:
+    """Simula ProcessFilesUseCase: espera una señal y cierra el trabajo."""
+
+    def __init__(self, repo_factory, release, fail=False):
+        self._repo_factory = repo_factory
+        self._release = release
+        self._fail = fail
+
+    def execute(self, directory, facultad, carrera_default, job_id):
+        repo = self._repo_factory()
+        repo.update_status(job_id, JOB_RUNNING)
+        repo.save_file(JobFile(job_id=job_id, file_name='a.pdf', status='ok', stage='stored'))
+        self._release.wait(5)
+        if self._fail:
+            raise RuntimeError('API sin cuota')
+        repo.update_status(job_id, JOB_DONE)
+        return {'a.pdf': object()}
+
+
+class FakeReport:
+    """Escribe un reporte vacío con el nombre del alcance pedido."""
+
+    def __init__(self, directory):
+        self._directory = directory
+
+    def execute(self, scope=None):
+        ruta = self._directory / f'{scope}.csv'
+        ruta.write_text('Autor\n', encoding='utf-8')
+        return str(ruta)
+
+
+def _build(tmp_path, fail=False, **options):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={'timeout': 30})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    repo_factory = lambda: SQLAlchemyJobRepository(factory())
+    release = threading.Event()
+    queue = ThreadPoolJobQueue(max_workers=1)
+    use_case = SubmitProcessingJobUseCase(
+        job_repo_factory=repo_factory,
+        job_queue=queue,
+        process_factory=lambda: BlockingProcess(repo_factory, release, fail),
+        report_factory=lambda: FakeReport(tmp_path),
+        event_repo=SQLAlchemyJobEventRepository(factory),
+        **options,
+    )
+    return use_case, queue, release
+
+
+def test_submit_returns_immediately_and_status_tracks_the_job(tmp_path):
+    (tmp_path / 'a.pdf').write_bytes(b'%PDF')
+    (tmp_path / 'b.docx').write_bytes(b'PK')
+    use_case, queue, release = _build(tmp_path)
+
+    job = use_case.execute(str(tmp_path), 'Ciencias Sociales', 'Trabajo Social')
+    assert job.status == JOB_QUEUED
+    assert not use_case.get_status(job.id)['finished']
+
+    release.set()
+    assert queue.wait(5)
+    estado = use_case.get_status(job.id)
+    assert (estado['status'], estado['finished'], estado['report_ready']) == (JOB_DONE, True, True)
+    assert (estado['total_files'], estado['finished_files'], estado['failed_files']) == (2, 1, 0)
+    assert use_case.get_status(job.id + 1) is None
+    assert use_case.get_report_path(job.id) == str(tmp_path / f'trabajo-{job.id}.csv')
+    [fin] = use_case.get_events(job.id)
+    assert (fin.kind, fin.data['status'], fin.data['report_ready']) == (
+        EVENT_JOB_FINISHED, JOB_DONE, True)
+    assert use_case.get_events(job.id, after_id=fin.id) == []
+    queue.shutdown()
+
+
+def test_failed_job_records_the_error(tmp_path):
+    use_case, queue, release = _build(tmp_path, fail=True)
+    job = use_case.execute(str(tmp_path), 'Ciencias Sociales', 'Trabajo Social')
+    release.set()
+    assert queue.wait(5)
+
+    estado = use_case.get_status(job.id)
+    assert (estado['status'], estado['error'], estado['report_ready']) == (
+        JOB_FAILED, 'API sin cuota', False)
+    [fin] = use_case.get_events(job.id)
+    assert (fin.data['status'], fin.data['error']) == (JOB_FAILED, 'API sin cuota')
+    queue.shutdown()
+
+
+def test_upload_directory_is_removed_when_the_job_finishes(tmp_path):
+    subida = tmp_path / 'subida'
+    subida.mkdir()
+    (subida / 'a.pdf').write_bytes(b'%PDF')
+    use_case, queue, release = _build(tmp_path, remove_directory=True)
+
+    job = use_case.execute(str(subida), 'Ciencias Sociales', 'Trabajo Social')
+    release.set()
+    assert queue.wait(5)
+    assert not subida.exists()
+    estado = use_case.get_status(job.id)
+    assert (estado['status'], estado['total_files'], estado['finished_files']) == (JOB_DONE, 1, 1)
+    queue.shutdown()
+
+
+def test_jobs_of_a_dead_worker_are_recovered_once(tmp_path):
+    subida = tmp_path / 'subida'
+    subida.mkdir()
+    use_case, queue, release = _build(tmp_path, worker_id='nuevo',
+                                      worker_alive=lambda w: w in ('nuevo', 'vivo'))
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    repo = SQLAlchemyJobRepository(sessionmaker(bind=engine)())
+
+    def crear(status, worker, directory=subida):
+        return repo.create(Job(str(directory), 'Ciencias Sociales', 'Trabajo Social',
+                               status=status, worker=worker)).id
+
+    en_curso = crear(JOB_RUNNING, 'muerto')
+    en_cola = crear(JOB_QUEUED, 'muerto')
+    sin_archivos = crear(JOB_QUEUED, 'muerto', tmp_path / 'borrado')
+    de_otro = crear(JOB_RUNNING, 'vivo')
+    de_cli = crear(JOB_RUNNING, None)
+
+    release.set()
+    assert use_case.recover_orphaned_jobs() == [en_curso, en_cola]
+    assert queue.wait(5)
+    # Otro proceso que arranca después no los toma de nuevo
+    otro, otra_cola, otro_release = _build(tmp_path, worker_id='otro',
+                                           worker_alive=lambda w: w == 'otro')
+    otro_release.set()
+    assert otro.recover_orphaned_jobs() == [de_otro]
+    assert otra_cola.wait(5)
+
+    assert use_case.get_status(en_curso)['status'] == JOB_DONE
+    assert use_case.get_status(en_cola)['status'] == JOB_DONE
+    estado = use_case.get_status(sin_archivos)
+    assert (estado['status'], estado['finished']) == (JOB_FAILED, True)
+    assert use_case.get_status(de_cli)['status'] == JOB_RUNNING
+    queue.shutdown()
+    otra_cola.shutdown()
+
+
+def test_worker_identity_detects_finished_processes():
+    assert is_worker_alive(current_worker_id())
+    assert not is_worker_alive(None)
+    codigo = 'from src.infrastructure.jobs import current_worker_id; print(current_worker_id())'
+    hijo = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                          check=True)
+    assert not is_worker_alive(hijo.stdout.strip())
@@ -0,0 +1,37 @@
+"""
+Las dependencias pesadas (conversión de PDF/Word, Selenium, SDK de IA) se
+importan al usarse por primera vez, no al importar el contenedor: cada worker
+de gunicorn y cada ejecución por consola arranca sin pagarlas.
+"""
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('pymupdf', 'pymupdf4llm', 'mammoth', 'selenium', 'webdriver_manager',
+                 'openai', 'google.genai')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_container_import_does_not_load_heavy_dependencies():
+    codigo = (
+        "import sys\n"
+        "import src.container, src.infrastructure.ai, src.infrastructure.catalog\n"
+        "import src.infrastructure.file_extractor\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True,
+                            text=True, check=True)
+    assert salida.stdout.strip() == ''
+
+
+def test_extraction_loads_its_dependencies_on_first_use(tmp_path):
+    import pymupdf
+    from src.services.file_extractor_strategies import PDFExtractorStrategy
+
+    ruta = tmp_path / 'programa.pdf'
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), 'Bibliografia')
+    doc.save(str(ruta))
+    doc.close()
+    assert 'Bibliografia' in PDFExtractorStrategy().extract_text(str(ruta))
@@ -0,0 +1,148 @@
+"""
+Tests del cliente HTTP de Primo contra un servidor local que imita los
+endpoints JSON de Primo VE (guestJwt y pnxs).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from src.infrastructure.catalog import PrimoHttpCatalogAdapter
+from src.services.primo_http_client import PrimoHttpClient, pnx_a_detalles
+
+DOC_LIBRO = {
+    'pnx': {
+        'display': {
+            'title': ['La interpretación de las culturas'],
+            'creator': ['Geertz, Clifford$$QGeertz, Clifford'],
+            'publisher': ['Barcelona : Gedisa'],
+            'creationdate': ['2003'],
+            'edition': ['12a reimp.'],
+            'format': ['387 p. ; 23 cm.'],
+            'type': ['book'],
+        },
+        'addata': {'cop': ['Barcelona'], 'pub': ['Gedisa']},
+    },
+    'delivery': {
+        'deliveryCategory': ['Alma-P'],
+        'availability': ['available_in_maininstitution'],
+        'holding': [{
+            'availabilityStatus': 'available',
+            'mainLocation': 'Biblioteca Central',
+            'subLocation': 'Colección general',
+            'callNumber': '306 G298i',
+        }],
+    },
+}
+
+DOC_EBOOK = {
+    'pnx': {
+        'display': {
+            'title': ['La miseria del mundo'],
+            'contributor': ['Bourdieu, Pierre'],
+            'publisher': ['Fondo de Cultura Económica'],
+            'type': ['book'],
+        },
+        'addata': {},
+    },
+    'delivery': {'deliveryCategory': ['Alma-E'], 'availability': ['not_restricted']},
+}
+
+
+class PrimoStub:
+    """Servidor HTTP local con las respuestas de Primo usadas por el cliente."""
+
+    def __init__(self, docs_por_termino):
+        self.docs_por_termino = docs_por_termino
+        self.tokens_emitidos = 0
+        self.token_valido = None
+        self.busquedas = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, cuerpo):
+                datos = json.dumps(cuerpo).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.endswith('/guestJwt'):
+                    stub.tokens_emitidos += 1
+                    stub.token_valido = f'token-{stub.tokens_emitidos}'
+                    return self._json(200, stub.token_valido)
+                if url.path == '/primaws/rest/pub/pnxs':
+                    if self.headers.get('Authorization') != f'Bearer {stub.token_valido}':
+                        return self._json(401, {'error': 'token'})
+                    termino = parse_qs(url.query)['q'][0].split(',', 2)[2]
+                    stub.busquedas.append(termino)
+                    docs = stub.docs_por_termino.get(termino, [])
+                    return self._json(200, {'info': {'total': len(docs)}, 'docs': docs})
+                self._json(404, {})
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    with PrimoStub({'Geertz cultura': [DOC_LIBRO], 'Bourdieu miseria': [DOC_EBOOK]}) as s:
+        yield s
+
+
+def test_search_maps_pnx_to_scraper_fields(stub):
+    client = PrimoHttpClient(base_url=stub.base_url)
+    detalles = PrimoHttpCatalogAdapter(client).search('Geertz cultura')
+
+    assert detalles == {
+        'titulo': 'La interpretación de las culturas',
+        'autor': 'Geertz, Clifford',
+        'editor': 'Gedisa',
+        'fecha_creacion': '2003',
+        'edicion': '12a reimp.',
+        'formato': '387 p. ; 23 cm.',
+        'lugar': 'Barcelona',
+        'disponibilidad_fisica': 'Disponible (Biblioteca Central Colección general 306 G298i)',
+        'disponibilidad_online': None,
+    }
+    assert PrimoHttpCatalogAdapter(client).search('sin resultados') is None
+
+
+def test_guest_token_is_reused_and_renewed_on_401(stub):
+    client = PrimoHttpClient(base_url=stub.base_url)
+    client.buscar_libro_detalles('Geertz cultura')
+    client.buscar_libro_detalles('Bourdieu miseria')
+    assert stub.tokens_emitidos == 1
+
+    stub.token_valido = 'expirado'
+    assert client.buscar_libro_detalles('Geertz cultura')['titulo']
+    assert stub.tokens_emitidos == 2
+    assert stub.busquedas == ['Geertz cultura', 'Bourdieu miseria', 'Geertz cultura']
+
+
+def test_online_resources_are_reported_as_digital():
+    detalles = pnx_a_detalles(DOC_EBOOK)
+    assert detalles['autor'] == 'Bourdieu, Pierre'
+    assert detalles['editor'] == 'Fondo de Cultura Económica'
+    assert detalles['lugar'] is None
+    assert detalles['disponibilidad_online'] == 'Disponible en línea'
+    assert detalles['disponibilidad_fisica'] is None
@@ -0,0 +1,496 @@
+"""
+Tests del caso de uso ProcessFilesUseCase con adaptadores falsos
+(sin llamadas reales a IA, Primo ni conversión de PDF).
+"""
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.ports.ai_port import AIProviderPort, AsyncAIProviderPort
+from src.domain.ports.catalog_port import CatalogSearchPort
+from src.domain.ports.file_extractor_port import FileExtractorPort
+from src.domain.use_cases.process_files_use_case import (
+    ProcessFilesUseCase, STATUS_OK, STATUS_SKIPPED, STATUS_ERROR, STATUS_UNCHANGED,
+)
+from src.infrastructure.catalog.async_catalog_adapter import AsyncCatalogAdapter
+from src.infrastructure.database.db import Base
+from src.infrastructure.database import orm_models  # noqa: F401 - registrar modelos
+from src.infrastructure.database.orm_models import TituloORM, AdquisicionORM, TrabajoORM
+from src.infrastructure.database.sqlalchemy_repositories import (
+    SQLAlchemyCarreraRepository,
+    SQLAlchemyAsignaturaRepository,
+    SQLAlchemyTituloRepository,
+    SQLAlchemyAdquisicionRepository,
+    SQLAlchemyProcessedFileRepository,
+    SQLAlchemyJobRepository,
+    SQLAlchemyJobEventRepository,
+)
+from src.domain.entities.job import (
+    JOB_DONE, JOB_RUNNING, JOURNAL_BIBLIOGRAPHY,
+    EVENT_FILE_STARTED, EVENT_SUBJECT, EVENT_ENTRIES, EVENT_CATALOG, EVENT_STORED,
+    EVENT_FILE_FINISHED,
+)
+
+
+class FakeExtractor(FileExtractorPort):
+    """Lee el archivo como texto plano."""
+
+    def extract(self, file_path: str) -> str:
+        if 'roto' in os.path.basename(file_path):
+            raise ValueError('archivo corrupto')
+        with open(file_path, encoding='utf-8') as f:
+            return f.read()
+
+    def supports(self, file_path: str) -> bool:
+        return True
+
+
+class FakeAI(AIProviderPort):
+    """Responde según el contenido del prompt (asignatura o bibliografía)."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if 'TEXTO DE BIBLIOGRAFÍA' in prompt:
+            return json.dumps({
+                'basic': [
+                    {'author': 'Geertz, C.', 'normalized_author': 'Clifford Geertz',
+                     'title': 'La interpretación de las culturas',
+                     'normalized_title': 'La Interpretación de las Culturas', 'type': 'book'},
+                ],
+                'complementary': [
+                    {'author': 'Bourdieu, P.', 'normalized_author': 'Pierre Bourdieu',
+                     'title': 'La miseria del mundo', 'normalized_title': 'La Miseria del Mundo',
+                     'type': 'book'},
+                ],
+            })
+        asignatura = 'Sin Nombre'
+        for linea in prompt.splitlines():
+            if linea.startswith('Asignatura:'):
+                asignatura = linea.split(':', 1)[1].strip()
+        if asignatura == 'Sin Nombre':
+            return json.dumps({'subject': None})
+        return json.dumps({'subject': asignatura, 'plan': '2024', 'semester': 'I'})
+
+    def generate(self, prompt, max_tokens=2000, temperature=0.7):
+        return self._answer(prompt)
+
+    def generate_with_fallback(self, prompt, max_tokens=2000, temperature=0.7):
+        return self._answer(prompt), 'fake'
+
+    def generate_with_provider(self, provider_name, prompt, max_tokens=2000, temperature=0.7):
+        return self._answer(prompt)
+
+
+class FakeAsyncAI(AsyncAIProviderPort):
+    """Versión asíncrona de FakeAI que registra cuántas llamadas estuvieron en vuelo."""
+
+    def __init__(self):
+        self._sync = FakeAI()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _answer(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self._sync._answer(prompt)
+
+    async def generate(self, prompt, max_tokens=2000, temperature=0.7):
+        return await self._answer(prompt)
+
+    async def generate_with_fallback(self, prompt, max_tokens=2000, temperature=0.7):
+        return await self._answer(prompt), 'fake'
+
+    async def generate_with_provider(self, provider_name, prompt, max_tokens=2000, temperature=0.7):
+        return await self._answer(prompt)
+
+
+class FakeCatalog(CatalogSearchPort):
+    """Catálogo que solo conoce a Geertz."""
+
+    def __init__(self):
+        self.searches = []
+
+    def search(self, search_term):
+        self.searches.append(search_term)
+        if 'Geertz' in search_term:
+            return {
+                'titulo': 'La interpretación de las culturas',
+                'autor': 'Clifford Geertz',
+                'editor': 'Gedisa',
+                'fecha_creacion': '2003',
+                'formato': 'Libro impreso',
+                'disponibilidad_fisica': '(3 copias, 3 disponible, 0 solicitudes)',
+            }
+        return None
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={'timeout': 30})
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def syllabus_dir(tmp_path):
+    directory = tmp_path / 'archivos'
+    directory.mkdir()
+    for i in range(4):
+        (directory / f'programa_{i}.pdf').write_text(
+            f'Asignatura: Antropología {i}\nBibliografía\nGeertz...', encoding='utf-8')
+    (directory / 'programa_roto.pdf').write_text('x', encoding='utf-8')
+    (directory / 'sin_asignatura.docx').write_text('nada', encoding='utf-8')
+    (directory / 'notas.txt').write_text('ignorado', encoding='utf-8')
+    return directory
+
+
+def build_use_case(session_factory, ai=None, catalog=None, **options):
+    session = session_factory()
+    return ProcessFilesUseCase(
+        file_extractor=FakeExtractor(),
+        ai_provider=ai or FakeAI(),
+        catalog=catalog or FakeCatalog(),
+        carrera_repo=SQLAlchemyCarreraRepository(session),
+        asignatura_repo=SQLAlchemyAsignaturaRepository(session),
+        titulo_repo=SQLAlchemyTituloRepository(session),
+        adquisicion_repo=SQLAlchemyAdquisicionRepository(session),
+        **options,
+    )
+
+
+def _assert_expected_results(resultados):
+    assert set(resultados) == {
+        'programa_0.pdf', 'programa_1.pdf', 'programa_2.pdf', 'programa_3.pdf',
+        'programa_roto.pdf', 'sin_asignatura.docx',
+    }
+    assert all(resultados[f'programa_{i}.pdf'].status == STATUS_OK for i in range(4))
+    assert resultados['programa_roto.pdf'].status == STATUS_ERROR
+    assert 'corrupto' in resultados['programa_roto.pdf'].detail
+    assert resultados['sin_asignatura.docx'].status == STATUS_SKIPPED
+
+
+def test_sequential_execution_reports_per_file_results(session_factory, syllabus_dir):
+    use_case = build_use_case(session_factory)
+    resultados = use_case.execute(str(syllabus_dir), carrera_default='Antropología')
+
+    _assert_expected_results(resultados)
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+    assert session.query(AdquisicionORM).count() == 2
+
+
+def test_concurrent_execution_gives_each_worker_its_own_use_case(session_factory, syllabus_dir):
+    ai = FakeAI()
+    catalog = FakeCatalog()
+    created = []
+
+    def factory():
+        worker = build_use_case(session_factory, ai=ai, catalog=catalog)
+        created.append(worker)
+        return worker
+
+    use_case = build_use_case(session_factory, ai=ai, catalog=catalog,
+                              worker_factory=factory, max_workers=3)
+    resultados = use_case.execute(str(syllabus_dir), carrera_default='Antropología')
+
+    _assert_expected_results(resultados)
+    assert list(resultados) == sorted(resultados)
+    assert 1 <= len(created) <= 3
+    assert len({id(w._titulo_repo._session) for w in created}) == len(created)
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+    asignaturas = {a.name for t in session.query(TituloORM).all() for a in t.asignaturas}
+    assert asignaturas == {f'Antropología {i}' for i in range(4)}
+
+
+def test_pipeline_mode_runs_stages_with_their_own_workers(session_factory, syllabus_dir):
+    ai = FakeAI()
+    catalog = FakeCatalog()
+    use_case = build_use_case(
+        session_factory, ai=ai, catalog=catalog,
+        worker_factory=lambda: build_use_case(session_factory, ai=ai, catalog=catalog),
+        stage_workers={'extract': 2, 'ai': 3, 'catalog': 2, 'store': 1},
+        queue_size=1,
+    )
+    resultados = use_case.execute(str(syllabus_dir), carrera_default='Antropología')
+
+    _assert_expected_results(resultados)
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+    assert session.query(AdquisicionORM).count() == 2
+
+
+def test_async_mode_keeps_several_files_in_flight(session_factory, syllabus_dir):
+    ai = FakeAsyncAI()
+    use_case = build_use_case(
+        session_factory,
+        async_ai_provider=ai,
+        async_catalog=AsyncCatalogAdapter(FakeCatalog()),
+    )
+    resultados = use_case.execute(str(syllabus_dir), carrera_default='Antropología')
+
+    _assert_expected_results(resultados)
+    assert ai.max_in_flight > 1
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+    assert session.query(AdquisicionORM).count() == 2
+
+
+def test_rerun_skips_unchanged_files_without_calling_ai(session_factory, syllabus_dir):
+    def run(ai, **options):
+        use_case = build_use_case(
+            session_factory, ai=ai,
+            processed_repo=SQLAlchemyProcessedFileRepository(session_factory()), **options,
+        )
+        return use_case.execute(str(syllabus_dir), carrera_default='Antropología')
+
+    _assert_expected_results(run(FakeAI()))
+
+    ai = FakeAI()
+    resultados = run(ai)
+    # Solo los archivos con error u omitidos se vuelven a intentar
+    assert ai.calls == 1  # asignatura de sin_asignatura.docx
+    assert resultados['programa_roto.pdf'].status == STATUS_ERROR
+    assert resultados['sin_asignatura.docx'].status == STATUS_SKIPPED
+    assert all(resultados[f'programa_{i}.pdf'].status == STATUS_UNCHANGED for i in range(4))
+
+    (syllabus_dir / 'programa_1.pdf').write_text(
+        'Asignatura: Antropología 1\nBibliografía\nGeertz (2da ed.)', encoding='utf-8')
+    ai = FakeAI()
+    resultados = run(ai)
+    assert resultados['programa_1.pdf'].status == STATUS_OK
+    assert resultados['programa_0.pdf'].status == STATUS_UNCHANGED
+    assert ai.calls == 3
+
+    ai = FakeAI()
+    _assert_expected_results(run(ai, force=True))
+    assert ai.calls > 0
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+
+
+class FailingAI(FakeAI):
+    """Falla en las llamadas cuyo prompt contiene ``marker`` (caída o 429 del proveedor)."""
+
+    def __init__(self, marker):
+        super().__init__()
+        self._marker = marker
+
+    def _answer(self, prompt):
+        if self._marker in prompt:
+            raise RuntimeError('429 Too Many Requests')
+        return super()._answer(prompt)
+
+
+@pytest.mark.parametrize('marker', ['Asignatura:', 'TEXTO DE BIBLIOGRAFÍA'])
+def test_ai_failure_marks_file_as_error_and_reprocesses_it_later(session_factory, tmp_path, marker):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    (directory / 'programa.pdf').write_text(
+        'Asignatura: Antropología 0\nBibliografía\nGeertz...', encoding='utf-8')
+
+    def run(ai):
+        use_case = build_use_case(
+            session_factory, ai=ai,
+            processed_repo=SQLAlchemyProcessedFileRepository(session_factory()),
+        )
+        return use_case.execute(str(directory), carrera_default='Antropología')
+
+    resultados = run(FailingAI(marker))
+    assert resultados['programa.pdf'].status == STATUS_ERROR
+    assert session_factory().query(AdquisicionORM).count() == 0
+
+    # El proveedor se recupera: el archivo no quedó registrado como procesado
+    ai = FakeAI()
+    resultados = run(ai)
+    assert resultados['programa.pdf'].status == STATUS_OK
+    assert ai.calls == 2
+    assert session_factory().query(AdquisicionORM).count() == 2
+
+
+def test_catalog_details_are_persisted_including_place_of_publication(session_factory, tmp_path):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    (directory / 'programa.pdf').write_text(
+        'Asignatura: Antropología 0\nBibliografía\nGeertz...', encoding='utf-8')
+
+    class CatalogWithPlace(FakeCatalog):
+        def search(self, search_term):
+            detalles = super().search(search_term)
+            return dict(detalles, lugar='Barcelona') if detalles else None
+
+    build_use_case(session_factory, catalog=CatalogWithPlace()).execute(
+        str(directory), carrera_default='Antropología')
+
+    geertz = session_factory().query(TituloORM).filter_by(publisher='Gedisa').one()
+    assert (geertz.place, geertz.year) == ('Barcelona', '2003')
+
+
+class DownCatalog(FakeCatalog):
+    """Primo no responde (tiempo agotado) en las búsquedas de Bourdieu."""
+
+    def search(self, search_term):
+        if 'Bourdieu' in search_term:
+            raise TimeoutError('Primo no respondió')
+        return super().search(search_term)
+
+
+@pytest.mark.parametrize('mode', ['files', 'async'])
+def test_catalog_failure_marks_file_as_error_and_reprocesses_it_later(session_factory, tmp_path,
+                                                                      mode):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    (directory / 'programa.pdf').write_text(
+        'Asignatura: Antropología 0\nBibliografía\nGeertz...', encoding='utf-8')
+
+    def run(catalog):
+        options = {}
+        if mode == 'async':
+            options = {'async_ai_provider': FakeAsyncAI(),
+                       'async_catalog': AsyncCatalogAdapter(catalog)}
+        use_case = build_use_case(
+            session_factory, catalog=catalog,
+            processed_repo=SQLAlchemyProcessedFileRepository(session_factory()), **options,
+        )
+        return use_case.execute(str(directory), carrera_default='Antropología')
+
+    resultados = run(DownCatalog())
+    assert resultados['programa.pdf'].status == STATUS_ERROR
+    assert 'Primo' in resultados['programa.pdf'].detail
+    assert session_factory().query(TituloORM).count() == 0
+
+    catalog = FakeCatalog()
+    assert run(catalog)['programa.pdf'].status == STATUS_OK
+    assert len(catalog.searches) == 2
+    assert session_factory().query(TituloORM).count() == 2
+
+
+class Crash(BaseException):
+    """Simula la caída del proceso (no la captura el manejo de errores por archivo)."""
+
+
+class CrashingCatalog(FakeCatalog):
+    """Se cae en la primera búsqueda de Bourdieu."""
+
+    def __init__(self):
+        super().__init__()
+        self.crashed = False
+
+    def search(self, search_term):
+        if 'Bourdieu' in search_term and not self.crashed:
+            self.crashed = True
+            raise Crash()
+        return super().search(search_term)
+
+
+def test_interrupted_job_resumes_without_repeating_ai_or_catalog_calls(session_factory, tmp_path):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    for i in range(2):
+        (directory / f'programa_{i}.pdf').write_text(
+            f'Asignatura: Antropología {i}\nBibliografía\nGeertz...', encoding='utf-8')
+
+    def build(ai, catalog):
+        return build_use_case(session_factory, ai=ai, catalog=catalog,
+                              job_repo=SQLAlchemyJobRepository(session_factory()))
+
+    with pytest.raises(Crash):
+        build(FakeAI(), CrashingCatalog()).execute(str(directory), carrera_default='Antropología')
+
+    jobs = SQLAlchemyJobRepository(session_factory())
+    job = jobs.find_unfinished(str(directory), 'Ciencias Sociales', 'Antropología')
+    assert job.status == JOB_RUNNING
+    [registro] = jobs.get_files(job.id)
+    assert registro.file_name == 'programa_0.pdf'
+    assert registro.stage == JOURNAL_BIBLIOGRAPHY
+    assert registro.payload['prepared'][0]['encontrado_en_primo'] is True
+
+    ai, catalog = FakeAI(), FakeCatalog()
+    resultados = build(ai, catalog).resume(job.id)
+
+    assert all(r.status == STATUS_OK for r in resultados.values())
+    # programa_0 retoma desde el catálogo; solo programa_1 llama a la IA
+    assert ai.calls == 2
+    assert catalog.searches == ['La Miseria del Mundo Pierre Bourdieu']
+    assert jobs.get(job.id).status == JOB_DONE
+    session = session_factory()
+    assert session.query(TituloORM).count() == 2
+    assert session.query(AdquisicionORM).count() == 2
+
+
+def test_missing_directory_returns_empty_summary(session_factory, tmp_path):
+    use_case = build_use_case(session_factory)
+    assert use_case.execute(str(tmp_path / 'no_existe')) == {}
+
+
+@pytest.mark.parametrize('mode', ['files', 'async'])
+def test_job_run_publishes_progress_events(session_factory, tmp_path, mode):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    for i in range(2):
+        (directory / f'programa_{i}.pdf').write_text(
+            f'Asignatura: Antropología {i}\nBibliografía\nGeertz...', encoding='utf-8')
+    options = {}
+    if mode == 'async':
+        options = {'async_ai_provider': FakeAsyncAI(),
+                   'async_catalog': AsyncCatalogAdapter(FakeCatalog())}
+    events = SQLAlchemyJobEventRepository(session_factory)
+    use_case = build_use_case(session_factory, job_repo=SQLAlchemyJobRepository(session_factory()),
+                              event_repo=events, **options)
+    use_case.execute(str(directory), carrera_default='Antropología')
+
+    [job_id] = [j.id for j in session_factory().query(TrabajoORM)]
+    eventos = events.list_after(job_id)
+    assert [e.id for e in eventos] == sorted(e.id for e in eventos)
+    del_0 = [e for e in eventos if e.file_name == 'programa_0.pdf']
+    assert [e.kind for e in del_0] == [
+        EVENT_FILE_STARTED, EVENT_SUBJECT, EVENT_ENTRIES,
+        EVENT_CATALOG, EVENT_CATALOG, EVENT_STORED, EVENT_FILE_FINISHED,
+    ]
+    assert del_0[1].data['asignatura'] == 'Antropología 0'
+    assert del_0[2].data == {'total': 2}
+    assert del_0[-1].data == {'status': STATUS_OK, 'error': None}
+    assert events.list_after(job_id, after_id=eventos[-1].id) == []
+
+
+def test_async_mode_writes_journal_and_events_only_from_the_db_thread(session_factory, tmp_path):
+    directory = tmp_path / 'lote'
+    directory.mkdir()
+    for i in range(3):
+        (directory / f'programa_{i}.pdf').write_text(
+            f'Asignatura: Antropología {i}\nBibliografía\nGeertz...', encoding='utf-8')
+    hilos = []
+
+    class ThreadRecordingJobRepository(SQLAlchemyJobRepository):
+        def save_file(self, job_file):
+            hilos.append(threading.current_thread().name)
+            return super().save_file(job_file)
+
+    class ThreadRecordingEventRepository(SQLAlchemyJobEventRepository):
+        def add(self, event):
+            hilos.append(threading.current_thread().name)
+            return super().add(event)
+
+    use_case = build_use_case(
+        session_factory,
+        job_repo=ThreadRecordingJobRepository(session_factory()),
+        event_repo=ThreadRecordingEventRepository(session_factory),
+        async_ai_provider=FakeAsyncAI(),
+        async_catalog=AsyncCatalogAdapter(FakeCatalog()),
+    )
+    resultados = use_case.execute(str(directory), carrera_default='Antropología')
+
+    assert all(r.status == STATUS_OK for r in resultados.values())
+    assert hilos and all(nombre.startswith('syllabus-db') for nombre in hilos)
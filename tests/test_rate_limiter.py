@@ -0,0 +1,73 @@
+"""
+Tests del limitador de tasa (TokenBucket) con un reloj simulado.
+"""
+import threading
+
+from src.infrastructure.catalog import RateLimitedCatalogAdapter
+from src.services.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, segundos):
+        with self._lock:
+            self.sleeps.append(segundos)
+            self.now += segundos
+
+
+def test_burst_is_free_and_excess_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 0.5
+    assert clock.sleeps == [0.5]
+
+    # Tras una pausa larga el balde se rellena solo hasta su capacidad
+    clock.now += 60
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert not bucket.try_acquire()
+    clock.now += 0.5
+    assert bucket.try_acquire()
+
+
+def test_concurrent_callers_are_spaced_at_the_agreed_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=lambda s: None)
+
+    esperas = []
+    hilos = [threading.Thread(target=lambda: esperas.append(bucket.acquire()))
+             for _ in range(5)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    # Sin avanzar el reloj, cada solicitud extra espera un segundo más que la anterior
+    assert sorted(esperas) == [0, 1, 2, 3, 4]
+
+
+def test_rate_limited_catalog_acquires_before_each_search():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+
+    class Catalog:
+        def __init__(self):
+            self.calls = []
+
+        def search(self, term):
+            self.calls.append((term, clock.now))
+            return {'titulo': term}
+
+    inner = Catalog()
+    catalog = RateLimitedCatalogAdapter(inner, bucket)
+    assert catalog.search('a') == {'titulo': 'a'}
+    catalog.search('b')
+    assert inner.calls == [('a', 0.0), ('b', 1.0)]
@@ -0,0 +1,108 @@
+"""
+Tests del directorio de reportes versionados (ReportArtifactStore) usado por
+CsvReportAdapter: una versión por generación y alcance, con retención.
+"""
+import os
+import time
+
+import pytest
+
+from src.domain.entities.report_row import ReportQuery, job_report_scope
+from src.infrastructure.report import CsvReportAdapter, ReportArtifactStore
+from src.services import report_files
+
+
+def _generar(store, scope, autores=3):
+    return CsvReportAdapter(store=store).generate(
+        ({'Autor': f'Autor {i}'} for i in range(autores)), scope=scope)
+
+
+def test_each_generation_is_a_new_artifact_of_its_scope(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ReportArtifactStore(str(tmp_path / 'reportes'))
+
+    primero = _generar(store, 'general')
+    segundo = _generar(store, 'general')
+    del_trabajo = _generar(store, job_report_scope(7))
+    filtrado = _generar(store, ReportQuery(carrera='Trabajo Social').scope())
+
+    assert len({primero, segundo, del_trabajo}) == 3
+    assert os.path.dirname(del_trabajo).endswith('trabajo-7')
+    assert os.path.isfile(segundo + '.gz')
+    assert store.latest('general') == segundo
+    # El reporte de un trabajo también es un reporte completo
+    assert store.latest_full() == del_trabajo
+    assert store.is_current(filtrado)
+    assert not store.is_current(segundo)
+    assert store.contains(filtrado) and not store.contains(str(tmp_path / 'otro.csv'))
+    # Nada queda en el directorio de trabajo
+    assert os.listdir(tmp_path) == ['reportes']
+
+
+def test_retention_keeps_recent_versions_and_the_latest_full_report(tmp_path):
+    store = ReportArtifactStore(str(tmp_path), retention_days=1, keep_per_scope=2)
+    generales = [_generar(store, 'general') for _ in range(3)]
+    assert store.latest('general') == generales[-1]
+    assert not os.path.exists(generales[0]) and not os.path.exists(generales[0] + '.gz')
+    assert all(os.path.exists(r) for r in generales[1:])
+
+    viejo = _generar(store, 'carrera-sociologia-1234abcd')
+    hace_dos_dias = time.time() - 2 * 24 * 3600
+    for ruta in (viejo, *generales[1:]):
+        os.utime(ruta, (hace_dos_dias, hace_dos_dias))
+    assert store.cleanup() == 4  # los CSV vencidos y sus .gz
+    assert not os.path.exists(tmp_path / 'carrera-sociologia-1234abcd')
+    # El reporte completo más reciente se conserva aunque haya vencido
+    assert store.latest_full() == generales[-1]
+
+
+def test_locked_destination_is_retried_inside_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ReportArtifactStore(str(tmp_path / 'reportes'))
+    replace = os.replace
+    bloqueados = []
+
+    def replace_bloqueado(origen, destino):
+        if not bloqueados:
+            bloqueados.append(destino)
+            raise PermissionError('archivo abierto en Excel')
+        return replace(origen, destino)
+
+    monkeypatch.setattr(os, 'replace', replace_bloqueado)
+    ruta = _generar(store, 'general')
+
+    assert ruta != bloqueados[0]
+    assert store.contains(ruta) and store.latest('general') == ruta
+    assert os.listdir(tmp_path) == ['reportes']
+
+
+def test_etags_of_removed_reports_are_forgotten_and_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_files, '_etags', report_files.OrderedDict())
+    monkeypatch.setattr(report_files, '_ETAG_CACHE_SIZE', 3)
+    store = ReportArtifactStore(str(tmp_path), keep_per_scope=1)
+
+    primero = _generar(store, 'general')
+    report_files.content_etag(primero)
+    segundo = _generar(store, 'general')  # la retención elimina el primero
+    assert os.path.abspath(primero) not in report_files._etags
+
+    for i in range(5):
+        report_files.content_etag(_generar(store, f'carrera-{i}'))
+    assert len(report_files._etags) == 3
+    report_files.content_etag(segundo)
+    assert list(report_files._etags)[-1] == os.path.abspath(segundo)
+
+
+def test_report_query_scope_depends_only_on_filters():
+    base = ReportQuery(carrera='Trabajo Social', disponibilidad='impreso')
+    assert ReportQuery().scope() == 'general'
+    assert base.scope() == ReportQuery(carrera='Trabajo Social', disponibilidad='impreso',
+                                       page=3, sort='titulo').scope()
+    assert base.scope().startswith('carrera-trabajo_social__disponibilidad-impreso-')
+    assert base.scope() != ReportQuery(carrera='Trabajo  Social!').scope()
+    assert os.sep not in ReportQuery(asignatura='../etc/passwd').scope()
+
+
+def test_invalid_scope_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ReportArtifactStore(str(tmp_path)).new_path('../fuera')
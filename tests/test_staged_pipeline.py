@@ -0,0 +1,68 @@
+"""
+Tests del pipeline por etapas con colas acotadas.
+"""
+import threading
+import time
+
+from src.domain.use_cases.staged_pipeline import Stage, StagedPipeline
+
+
+def test_items_flow_through_all_stages():
+    salida = []
+    lock = threading.Lock()
+
+    def guardar(x):
+        with lock:
+            salida.append(x)
+
+    stages = [
+        Stage('doble', lambda x: x * 2, workers=3),
+        Stage('filtro', lambda x: x if x % 4 == 0 else None, workers=2),
+        Stage('guardar', guardar, workers=1),
+    ]
+    StagedPipeline(stages, queue_size=2).run(range(20))
+
+    assert sorted(salida) == [x * 2 for x in range(20) if (x * 2) % 4 == 0]
+
+
+def test_errors_are_reported_and_item_dropped():
+    errores = []
+    salida = []
+
+    def falla_impares(x):
+        if x % 2:
+            raise ValueError(f'impar {x}')
+        return x
+
+    StagedPipeline(
+        [Stage('valida', falla_impares, workers=2), Stage('fin', salida.append)],
+        on_error=lambda stage, item, e: errores.append((stage.name, item)),
+    ).run(range(6))
+
+    assert sorted(salida) == [0, 2, 4]
+    assert sorted(errores) == [('valida', 1), ('valida', 3), ('valida', 5)]
+
+
+def test_slow_stage_applies_backpressure():
+    en_vuelo = []
+    maximo = [0]
+    lock = threading.Lock()
+    producidos = [0]
+
+    def rapido(x):
+        with lock:
+            producidos[0] += 1
+            en_vuelo.append(x)
+            maximo[0] = max(maximo[0], len(en_vuelo))
+        return x
+
+    def lento(x):
+        time.sleep(0.01)
+        with lock:
+            en_vuelo.remove(x)
+
+    StagedPipeline([Stage('rapido', rapido), Stage('lento', lento)], queue_size=2).run(range(30))
+
+    # Como máximo: cola de la etapa lenta + el ítem que procesa + el que espera el put
+    assert producidos[0] == 30
+    assert maximo[0] <= 4
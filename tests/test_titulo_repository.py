@@ -0,0 +1,121 @@
+"""
+Tests del repositorio de títulos: deduplicación por clave normalizada
+(dedup_key) y persistencia en bloque de la bibliografía de una asignatura.
+"""
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.acquisition import Acquisition
+from src.domain.entities.title import Title
+from src.infrastructure.database.db import Base
+from src.infrastructure.database.orm_models import AdquisicionORM, TituloORM
+from src.infrastructure.database.migrate_db import migrate_db
+from src.infrastructure.database.sqlalchemy_repositories import (
+    SQLAlchemyAsignaturaRepository,
+    SQLAlchemyCarreraRepository,
+    SQLAlchemyTituloRepository,
+)
+
+
+def test_find_duplicate_folds_case_accents_and_whitespace(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    repo = SQLAlchemyTituloRepository(sessionmaker(bind=engine)())
+
+    guardado = repo.save(Title(normalized_author='Bourdieu, Pierre',
+                               normalized_title='La Miseria del Mundo'))
+    repo.save(Title(normalized_author='Bourdieu, Pierre', normalized_title='El oficio de sociólogo'))
+
+    duplicado = repo.find_duplicate('  bourdieu pierre ', 'LA MISERIA DEL  MUNDO')
+    assert duplicado is not None and duplicado.id == guardado.id
+    assert repo.find_duplicate('Bourdieu, Pierre', 'El oficio de sociologo') is not None
+    assert repo.find_duplicate('Bourdieu, Pierre', 'La distinción') is None
+    assert repo.find_duplicate('', 'La Miseria del Mundo') is None
+
+    plan = engine.connect().execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM titles WHERE dedup_key = 'x'")).fetchall()
+    assert 'ix_titles_dedup_key' in str(plan)
+
+
+def test_migration_backfills_dedup_key_on_legacy_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        # Esquema anterior: sin dedup_key
+        conn.execute(text("CREATE TABLE titles (id INTEGER PRIMARY KEY, normalized_author TEXT,"
+                          " normalized_title TEXT, original_author TEXT, original_title TEXT,"
+                          " year TEXT, publisher TEXT, type_bib TEXT)"))
+        conn.execute(text("INSERT INTO titles (normalized_author, normalized_title) VALUES "
+                          "('Geertz, Clifford', 'La interpretación de las culturas'), (NULL, 'Sin autor')"))
+
+    Base.metadata.create_all(engine)  # como init_db(): no altera tablas existentes
+    migrate_db(engine)
+    migrate_db(engine)  # idempotente
+
+    with engine.connect() as conn:
+        claves = conn.execute(text("SELECT dedup_key FROM titles ORDER BY id")).scalars().all()
+    assert claves == ['geertz clifford|la interpretacion de las culturas', None]
+
+    repo = SQLAlchemyTituloRepository(sessionmaker(bind=engine)())
+    assert repo.find_duplicate('GEERTZ, CLIFFORD', 'La interpretacion de las culturas').id == 1
+
+
+def _subject(session):
+    carrera = SQLAlchemyCarreraRepository(session).get_or_create('Trabajo Social')
+    return SQLAlchemyAsignaturaRepository(session).get_or_create('Teoría social', carrera)
+
+
+def test_save_bibliography_commits_once_and_links_every_title(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = SQLAlchemyTituloRepository(session)
+    asignatura = _subject(session)
+    existente = repo.save(Title(normalized_author='Geertz', normalized_title='Cultura'))
+    repo.link_to_subject(existente, asignatura)
+
+    commits = []
+    event.listen(session, 'after_commit', lambda s: commits.append(s))
+    nuevos = repo.save_bibliography(
+        asignatura,
+        [(Title(normalized_author=f'Autor {i}', normalized_title=f'Libro {i}'),
+          Acquisition(title_id=None, status='disponible', available_printed=True))
+         for i in range(3)],
+        [existente],
+    )
+
+    assert len(commits) == 1
+    assert all(t.id for t in nuevos)
+    with engine.connect() as conn:
+        vinculos = conn.execute(text("SELECT COUNT(*) FROM title_subject")).scalar()
+        adquisiciones = conn.execute(
+            text("SELECT COUNT(*) FROM acquisitions WHERE available_printed")).scalar()
+    assert (vinculos, adquisiciones) == (4, 3)
+
+
+def test_save_bibliography_rolls_back_on_failure(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = SQLAlchemyTituloRepository(session)
+    asignatura = _subject(session)
+
+    ejecutar = session.execute
+
+    def falla_al_vincular(stmt, *args, **kwargs):
+        if getattr(stmt, 'is_insert', False):
+            raise RuntimeError('disco lleno')
+        return ejecutar(stmt, *args, **kwargs)
+
+    monkeypatch.setattr(session, 'execute', falla_al_vincular)
+    with pytest.raises(RuntimeError):
+        repo.save_bibliography(
+            asignatura,
+            [(Title(normalized_author='Bourdieu', normalized_title='La distinción'),
+              Acquisition(title_id=None))],
+            [],
+        )
+    monkeypatch.undo()
+
+    assert session.query(TituloORM).count() == 0
+    assert session.query(AdquisicionORM).count() == 0